@@ -4,23 +4,36 @@
 TDDステップ4: Refactor - コードの改善
 """
 
+import copy
+import functools
 import os
-import re
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional, List
 
 import yaml
 
+from src.utils.patterns import ENV_VAR
 
-@dataclass
+
+# libyamlのCローダーを優先（未ビルド環境ではPure Python実装にフォールバック）
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# QdrantのURLとして許可するスキーム
+_URL_SCHEMES = ("http://", "https://")
+
+# 有効なログレベル（大文字）
+_VALID_LOG_LEVELS = frozenset({"DEBUG", "INFO", "WARN", "WARNING", "ERROR", "CRITICAL"})
+
+
+@dataclass(slots=True)
 class InputConfig:
     """入力設定"""
     source_dir: str
     ignore_file: str = ".ragignore"
 
 
-@dataclass
+@dataclass(slots=True)
 class QdrantConfig:
     """Qdrant設定"""
     url: str
@@ -28,7 +41,7 @@ class QdrantConfig:
     collection_name: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class EmbeddingConfig:
     """埋め込みモデル設定"""
     model_name: str
@@ -37,21 +50,21 @@ class EmbeddingConfig:
     batch_size: int = 8
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingConfig:
     """処理設定"""
     parallel_workers: Optional[int] = None
     languages: Optional[List[str]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class LoggingConfig:
     """ログ設定"""
     level: str = "INFO"
     file: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """全体設定"""
     input: InputConfig
@@ -74,35 +87,36 @@ def _expand_env_vars(value: str) -> str:
     if not isinstance(value, str):
         return value
 
-    # ${VAR_NAME} 形式の環境変数を展開
-    pattern = r'\$\{([^}]+)\}'
+    # 参照を含まない文字列は正規表現エンジンを通さない
+    if '${' not in value:
+        return value
 
     def replace_env(match):
         env_var = match.group(1)
         return os.environ.get(env_var, match.group(0))
 
-    return re.sub(pattern, replace_env, value)
+    return ENV_VAR.sub(replace_env, value)
 
 
-def _expand_env_vars_recursive(data: dict) -> dict:
+def _expand_env_vars_in_place(data: dict) -> None:
     """
-    辞書内の全ての文字列値に対して環境変数を展開する
+    設定内の全ての文字列値に対して環境変数をその場で展開する
 
-    Args:
-        data: 設定辞書
+    ネストした辞書・リストを作業スタックで反復的に走査し、
+    新しい辞書ツリーは構築しない
 
-    Returns:
-        環境変数が展開された辞書
+    Args:
+        data: 設定辞書（直接書き換えられる）
     """
-    result = {}
-    for key, value in data.items():
-        if isinstance(value, dict):
-            result[key] = _expand_env_vars_recursive(value)
-        elif isinstance(value, str):
-            result[key] = _expand_env_vars(value)
-        else:
-            result[key] = value
-    return result
+    stack = [data]
+    while stack:
+        container = stack.pop()
+        items = container.items() if isinstance(container, dict) else enumerate(container)
+        for key, value in items:
+            if isinstance(value, (dict, list)):
+                stack.append(value)
+            elif isinstance(value, str) and '${' in value:
+                container[key] = _expand_env_vars(value)
 
 
 def _validate_source_dir(source_dir: str) -> None:
@@ -113,14 +127,13 @@ def _validate_source_dir(source_dir: str) -> None:
 
 def _validate_url(url: str) -> None:
     """URLフォーマットを確認"""
-    if url and not (url.startswith("http://") or url.startswith("https://")):
+    if url and not url.startswith(_URL_SCHEMES):
         raise ValueError(f"Invalid URL format: {url}")
 
 
 def _validate_log_level(log_level: str) -> None:
     """ログレベルの妥当性を確認"""
-    valid_log_levels = ["DEBUG", "INFO", "WARN", "WARNING", "ERROR", "CRITICAL"]
-    if log_level.upper() not in valid_log_levels:
+    if log_level.upper() not in _VALID_LOG_LEVELS:
         raise ValueError(f"Invalid log level: {log_level}")
 
 
@@ -144,6 +157,27 @@ def _validate_config(config_dict: dict) -> None:
     _validate_log_level(log_level)
 
 
+@functools.lru_cache(maxsize=8)
+def _load_yaml_cached(resolved_path: str, mtime_ns: int, size: int) -> dict:
+    """
+    YAMLファイルをパースする（結果はキャッシュされる）
+
+    環境変数の展開とバリデーションは実行時の状態に依存するため、
+    キャッシュ対象はパース結果のみとする
+
+    Args:
+        resolved_path: 設定ファイルの絶対パス
+        mtime_ns: ファイルの更新時刻（キャッシュ無効化用）
+        size: ファイルサイズ（キャッシュ無効化用）
+
+    Returns:
+        パース結果の辞書
+    """
+    # バイナリのまま渡し、デコードはlibyaml側で行う（Python側のテキストラッパーを省く）
+    with open(resolved_path, "rb") as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+
 def load_config(config_path: str) -> Config:
     """
     YAML設定ファイルを読み込む
@@ -158,17 +192,21 @@ def load_config(config_path: str) -> Config:
         FileNotFoundError: ファイルが存在しない
         ValueError: バリデーションエラー
     """
-    # ファイルの存在確認
+    # ファイルの存在確認を兼ねてstatを1回だけ取得
     path = Path(config_path)
-    if not path.exists():
-        raise FileNotFoundError(f"Config file not found: {config_path}")
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Config file not found: {config_path}") from None
+
+    # YAMLファイルの読み込み（更新時刻とサイズをキーにキャッシュ）
+    raw_config = _load_yaml_cached(str(path.resolve()), stat.st_mtime_ns, stat.st_size)
 
-    # YAMLファイルの読み込み
-    with open(path, "r", encoding="utf-8") as f:
-        config_dict = yaml.safe_load(f)
+    # キャッシュ内容を汚さないよう複製してから加工する
+    config_dict = copy.deepcopy(raw_config)
 
     # 環境変数の展開
-    config_dict = _expand_env_vars_recursive(config_dict)
+    _expand_env_vars_in_place(config_dict)
 
     # バリデーション
     _validate_config(config_dict)
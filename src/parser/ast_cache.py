@@ -0,0 +1,99 @@
+"""
+解析結果キャッシュ
+
+ファイルパスと内容のハッシュをキーに、解析済みのFunctionInfoリストを
+SQLiteへ永続化する。内容が変わらないファイルはTree-sitterでの再解析を省略できる。
+"""
+
+import hashlib
+import pickle
+import sqlite3
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from src.parser.base_parser import FunctionInfo
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS funcs (
+    path TEXT NOT NULL,
+    sha BLOB NOT NULL,
+    blob BLOB NOT NULL,
+    PRIMARY KEY (path, sha)
+)
+"""
+
+
+def content_digest(data: bytes) -> bytes:
+    """
+    ファイル内容のハッシュを計算
+
+    Args:
+        data: ファイル内容
+
+    Returns:
+        SHA-256ダイジェスト
+    """
+    return hashlib.sha256(data).digest()
+
+
+class AstCache:
+    """SQLiteによる解析結果キャッシュ（プロジェクト単位）"""
+
+    def __init__(self, db_path: str):
+        """
+        初期化
+
+        Args:
+            db_path: SQLiteデータベースファイルのパス（存在しない場合は作成）
+        """
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.execute(_SCHEMA)
+        self._connection.commit()
+        self._lock = threading.Lock()
+
+    def get(self, path: str, sha: bytes) -> Optional[List["FunctionInfo"]]:
+        """
+        キャッシュ済みの解析結果を取得
+
+        Args:
+            path: ファイルパス
+            sha: ファイル内容のダイジェスト
+
+        Returns:
+            FunctionInfoのリスト、未登録の場合None
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT blob FROM funcs WHERE path = ? AND sha = ?", (path, sha)
+            ).fetchone()
+
+        if row is None:
+            return None
+        return pickle.loads(row[0])
+
+    def put(self, path: str, sha: bytes, funcs: List["FunctionInfo"]) -> None:
+        """
+        解析結果を登録
+
+        同じパスの古い内容に対するエントリは削除する
+
+        Args:
+            path: ファイルパス
+            sha: ファイル内容のダイジェスト
+            funcs: FunctionInfoのリスト
+        """
+        blob = pickle.dumps(funcs, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM funcs WHERE path = ?", (path,))
+            self._connection.execute(
+                "INSERT INTO funcs (path, sha, blob) VALUES (?, ?, ?)", (path, sha, blob)
+            )
+
+    def close(self) -> None:
+        """データベース接続を閉じる"""
+        with self._lock:
+            self._connection.close()
@@ -4,16 +4,32 @@
 TDDステップ2-3: Green - テストを通す実装
 """
 
-import re
+import mmap
+import os
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from array import array
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Sequence
 
+from tree_sitter import Node
 
-@dataclass
+
+# これ未満のファイルはmmapの準備コストの方が大きいため、通常の読み込みを行う
+_MMAP_THRESHOLD = 64 * 1024
+
+@dataclass(frozen=True, slots=True)
 class FunctionInfo:
-    """関数・メソッドの情報を保持するデータクラス"""
+    """
+    関数・メソッドの情報を保持するデータクラス
+
+    解析結果はキャッシュやテストのフィクスチャで共有されるため、作成後は変更できない
+    """
 
     # 基本情報
     name: str                           # 関数名
@@ -48,6 +64,145 @@ class FunctionInfo:
     comment_lines: int = 0              # コメント行数
 
 
+# FunctionTableで型付き配列に格納する整数フィールド
+_INT_COLUMNS = frozenset({
+    'start_line',
+    'end_line',
+    'start_column',
+    'end_column',
+    'complexity',
+    'loc',
+    'comment_lines',
+})
+
+# 先読みの既定値（読み込みスレッド数と、解析待ちとして保持するファイル数の上限）
+_PREFETCH_WORKERS = 8
+_PREFETCH_DEPTH = 16
+
+# complexityがNoneであることを表す値（型付き配列にはNoneを格納できないため）
+_NO_COMPLEXITY = -1
+
+# コメント部分を空白に置き換える変換表（改行は残して行の対応を保つ）
+_BLANK_TABLE = bytes(b if b == 0x0A else 0x20 for b in range(256))
+
+# 既定でコメントとして扱うノード
+_DEFAULT_COMMENT_TYPES = frozenset({'comment'})
+
+
+def _read_source_bytes(file_path: Path) -> bytes:
+    """
+    ソースファイルをバイト列として読み込む（先読みスレッド用）
+
+    Args:
+        file_path: 対象ファイル
+
+    Returns:
+        ファイル内容
+
+    Raises:
+        FileNotFoundError: ファイルが存在しない
+    """
+    try:
+        return file_path.read_bytes()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {file_path}") from None
+
+
+class FunctionTable:
+    """
+    関数情報を列指向（フィールドごとの配列）で保持するテーブル
+
+    整数フィールドはarray.arrayに詰めて保持するため、FunctionInfoを
+    大量に保持する場合よりオブジェクト数が少なく、集計も列単位で行える
+    """
+
+    __slots__ = ('_columns',)
+
+    def __init__(self):
+        """空のテーブルを作成"""
+        self._columns = {
+            f.name: array('q') if f.name in _INT_COLUMNS else []
+            for f in fields(FunctionInfo)
+        }
+
+    @classmethod
+    def from_functions(cls, functions: Iterable[FunctionInfo]) -> "FunctionTable":
+        """
+        FunctionInfoの列からテーブルを作成
+
+        Args:
+            functions: FunctionInfoの列
+
+        Returns:
+            FunctionTable
+        """
+        table = cls()
+        table.extend(functions)
+        return table
+
+    def append(self, func_info: FunctionInfo) -> None:
+        """
+        1件追加
+
+        Args:
+            func_info: 追加するFunctionInfo
+        """
+        for name, column in self._columns.items():
+            value = getattr(func_info, name)
+            if value is None and name == 'complexity':
+                value = _NO_COMPLEXITY
+            column.append(value)
+
+    def extend(self, functions: Iterable[FunctionInfo]) -> None:
+        """
+        複数件追加
+
+        Args:
+            functions: 追加するFunctionInfoの列
+        """
+        for func_info in functions:
+            self.append(func_info)
+
+    def column(self, name: str) -> Sequence:
+        """
+        列を取得
+
+        complexity列では、値がNoneの行は-1で表される
+
+        Args:
+            name: FunctionInfoのフィールド名
+
+        Returns:
+            列の値（整数フィールドはarray.array、それ以外はlist）
+
+        Raises:
+            KeyError: 存在しないフィールド名
+        """
+        return self._columns[name]
+
+    def __len__(self) -> int:
+        return len(self._columns['name'])
+
+    def __getitem__(self, index: int) -> FunctionInfo:
+        """
+        指定行をFunctionInfoとして復元
+
+        Args:
+            index: 行番号
+
+        Returns:
+            FunctionInfo
+        """
+        row = {name: column[index] for name, column in self._columns.items()}
+        if row['complexity'] == _NO_COMPLEXITY:
+            row['complexity'] = None
+        return FunctionInfo(**row)
+
+    def __iter__(self) -> Iterator[FunctionInfo]:
+        for index in range(len(self)):
+            yield self[index]
+
+
 class BaseParser(ABC):
     """パーサー基底クラス"""
 
@@ -77,66 +232,214 @@ class BaseParser(ABC):
         """
         pass
 
+    def parse_bytes(self, source_bytes: bytes, file_path: Path) -> List[FunctionInfo]:
+        """
+        読み込み済みのソースを解析
+
+        同じ内容を繰り返し解析する場合にファイルの再読み込みを省ける
+
+        Args:
+            source_bytes: ソースコード全体（UTF-8バイト列）
+            file_path: FunctionInfoに記録するファイルパス
+
+        Returns:
+            FunctionInfoのリスト
+        """
+        return self._parse_source(source_bytes, file_path)
+
+    def parse_string(self, source: str, file_path: str = "<inline>") -> List[FunctionInfo]:
+        """
+        文字列のソースを解析（ファイルを介さずにコード片を解析する）
+
+        Args:
+            source: ソースコード全体
+            file_path: FunctionInfoに記録するファイルパス
+
+        Returns:
+            FunctionInfoのリスト
+        """
+        return self.parse_bytes(source.encode('utf-8'), Path(file_path))
+
+    @abstractmethod
+    def _parse_source(self, source_bytes: bytes, file_path: Path) -> List[FunctionInfo]:
+        """
+        読み込み済みのソースを解析
+
+        Args:
+            source_bytes: ソースコード全体（UTF-8バイト列）
+            file_path: ファイルパス
+
+        Returns:
+            FunctionInfoのリスト
+        """
+        pass
+
+    def prefetch_and_parse(
+        self,
+        file_paths: Iterable[Path],
+        max_workers: int = _PREFETCH_WORKERS,
+        prefetch: int = _PREFETCH_DEPTH
+    ) -> List[FunctionInfo]:
+        """
+        後続ファイルを先読みしながら複数ファイルを順に解析
+
+        読み込みをスレッドプールで先行させ、ディスク待ちと解析処理を重ねる。
+        先読みはprefetch件までに制限し、メモリ使用量を抑える
+
+        Args:
+            file_paths: 解析対象ファイルの列
+            max_workers: 読み込みスレッド数
+            prefetch: 先読みして保持するファイル数の上限
+
+        Returns:
+            全ファイルのFunctionInfoのリスト（file_pathsの順序を保持）
+
+        Raises:
+            FileNotFoundError: ファイルが存在しない
+        """
+        functions = []
+        paths = iter(file_paths)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque(
+                (path, executor.submit(_read_source_bytes, path))
+                for path in islice(paths, prefetch)
+            )
+            while pending:
+                path, future = pending.popleft()
+
+                # 1件取り出すごとに次のファイルの読み込みを投入する
+                next_path = next(paths, None)
+                if next_path is not None:
+                    pending.append((next_path, executor.submit(_read_source_bytes, next_path)))
+
+                functions.extend(self._parse_source(future.result(), path))
+
+        return functions
+
     # 共通ユーティリティメソッド（実装済み）
 
-    def _count_lines(self, code: str) -> tuple[int, int]:
+    @contextmanager
+    def _open_source(self, file_path: Path) -> Iterator[bytes]:
         """
-        実効行数とコメント行数をカウント
+        ソースファイルをデコードせずにバイト列として開く
+
+        大きなファイルはmmapでマップし、読み込みバッファへのコピーを省く。
+        mmapはブロックを抜けると閉じるため、ノードのテキストはブロック内で取り出すこと
 
         Args:
-            code: ソースコード
+            file_path: 対象ファイル
+
+        Yields:
+            ファイル内容（bytesまたは読み取り専用mmap）
+
+        Raises:
+            FileNotFoundError: ファイルが存在しない
+        """
+        try:
+            f = open(file_path, 'rb')
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {file_path}") from None
+
+        with f:
+            if os.fstat(f.fileno()).st_size < _MMAP_THRESHOLD:
+                yield f.read()
+                return
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
+    def _compute_metrics(
+        self,
+        node: Node,
+        source_bytes: bytes,
+        control_types: frozenset,
+        comment_types: frozenset = _DEFAULT_COMMENT_TYPES,
+        logical_operators: frozenset = frozenset()
+    ) -> tuple[int, int, int]:
+        """
+        AST上で実効行数・コメント行数・サイクロマティック複雑度を算出
+
+        関数ノード配下を1回だけ走査し、コメントノードの範囲を空白に置き換えて行を判定する。
+        空行はどちらにも数えず、コードの後ろにコメントがある行は実効行として数える
+
+        Args:
+            node: 関数ノード
+            source_bytes: ソースコード全体（UTF-8バイト列）
+            control_types: 複雑度に加算する制御構造ノード
+            comment_types: コメントとして扱うノード
+            logical_operators: 複雑度に加算するbinary_expressionの演算子
 
         Returns:
-            (実効行数, コメント行数)
+            (実効行数, コメント行数, サイクロマティック複雑度)
         """
-        lines = code.split('\n')
-        loc = 0
-        comment_lines = 0
+        base = node.start_byte
+        original = source_bytes[base:node.end_byte]
+        stripped = bytearray(original)
+        complexity = 1  # 基本複雑度
 
-        for line in lines:
-            stripped = line.strip()
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            node_type = current.type
 
-            # 空行はスキップ
-            if not stripped:
+            if node_type in comment_types:
+                start = current.start_byte - base
+                end = current.end_byte - base
+                stripped[start:end] = stripped[start:end].translate(_BLANK_TABLE)
                 continue
 
-            # コメント行の判定（簡易実装）
-            if stripped.startswith('#') or stripped.startswith('//') or stripped.startswith('/*') or stripped.startswith('*'):
-                comment_lines += 1
-            else:
+            if node_type in control_types:
+                complexity += 1
+            elif logical_operators and node_type == 'binary_expression':
+                operator = current.child_by_field_name('operator')
+                if operator is not None and operator.type in logical_operators:
+                    complexity += 1
+
+            stack.extend(current.children)
+
+        loc = 0
+        comment_lines = 0
+        for line, code_line in zip(original.split(b'\n'), stripped.split(b'\n')):
+            if code_line.strip():
                 loc += 1
+            elif line.strip():
+                comment_lines += 1
 
-        return loc, comment_lines
+        return loc, comment_lines, complexity
 
-    def _calculate_complexity(self, code: str) -> int:
+    def _build_scope_map(self, scope_nodes: List[Node]) -> tuple[List[int], List[Node]]:
         """
-        サイクロマティック複雑度を計算
-
-        簡易実装: 分岐文（if/for/while/elif/else/case/switch等）の数 + 1
+        スコープ（クラス等）ノードを開始位置順に並べた検索用マップを構築
 
         Args:
-            code: ソースコード
+            scope_nodes: スコープノードのリスト
 
         Returns:
-            サイクロマティック複雑度
-        """
-        # 制御構造のキーワード
-        control_keywords = [
-            r'\bif\b',
-            r'\bfor\b',
-            r'\bwhile\b',
-            r'\belif\b',
-            r'\belse\b',
-            r'\bcase\b',
-            r'\bswitch\b',
-            r'\bcatch\b',
-            r'\b\?\b',  # 三項演算子
-        ]
+            (開始バイト位置のリスト, 開始位置順のスコープノードのリスト)
+        """
+        ordered = sorted(scope_nodes, key=lambda n: n.start_byte)
+        return [n.start_byte for n in ordered], ordered
 
-        complexity = 1  # 基本複雑度
+    def _find_enclosing_scope(self, scope_map: tuple[List[int], List[Node]], node: Node) -> Optional[Node]:
+        """
+        ノードを囲む最も内側のスコープノードを二分探索で取得
 
-        for keyword_pattern in control_keywords:
-            matches = re.findall(keyword_pattern, code)
-            complexity += len(matches)
+        親ノードを遡る代わりに、開始位置が手前のスコープから範囲を確認する
 
-        return complexity
+        Args:
+            scope_map: _build_scope_mapで構築したマップ
+            node: 対象ノード
+
+        Returns:
+            最も内側のスコープノード、存在しない場合None
+        """
+        starts, scopes = scope_map
+        i = bisect_right(starts, node.start_byte) - 1
+        while i >= 0:
+            scope = scopes[i]
+            # スコープ範囲は入れ子か互いに素なので、最初に包含するものが最も内側
+            if scope.end_byte >= node.end_byte:
+                return scope
+            i -= 1
+        return None
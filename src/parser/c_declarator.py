@@ -0,0 +1,44 @@
+"""
+C/C++パーサー共通のdeclarator処理
+
+C++の文法はCの文法を拡張しているため、declaratorの構造は両言語で共通
+"""
+
+from typing import Optional
+
+from tree_sitter import Node
+
+
+# 引数名の探索でdeclaratorフィールドを持たない場合に先頭の子へ降りるノード
+_DESCEND_TYPES = frozenset({
+    'pointer_declarator',
+    'reference_declarator',
+    'array_declarator',
+    'parenthesized_declarator',
+    'variadic_declarator',
+})
+
+
+def get_identifier_from_declarator(declarator: Optional[Node], source_bytes: bytes) -> Optional[str]:
+    """
+    declaratorから識別子を抽出
+
+    再帰せず、declaratorフィールド（無ければ先頭の名前付き子）を辿る
+
+    Args:
+        declarator: declaratorノード
+        source_bytes: ソースコード全体（UTF-8バイト列）
+
+    Returns:
+        識別子名、見つからない場合None
+    """
+    while declarator is not None:
+        if declarator.type == 'identifier':
+            return source_bytes[declarator.start_byte:declarator.end_byte].decode('utf-8')
+
+        inner = declarator.child_by_field_name('declarator')
+        if inner is None and declarator.type in _DESCEND_TYPES and declarator.named_child_count:
+            inner = declarator.named_child(0)
+        declarator = inner
+
+    return None
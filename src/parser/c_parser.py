@@ -4,109 +4,71 @@ Cパーサー
 TDDステップ2-3: Green - テストを通す実装
 """
 
-from pathlib import Path
-from typing import List
+from typing import List, Optional
 
-from tree_sitter import Language, Parser, Node
+from tree_sitter import Language, Node, Query
 import tree_sitter_c
 
-from src.parser.base_parser import BaseParser, FunctionInfo
-from src.utils.logger import get_logger
+from src.parser.base_parser import FunctionInfo
+from src.parser.c_declarator import get_identifier_from_declarator
+from src.parser.tree_sitter_parser import LangSpec, TreeSitterParser
+from src.utils.patterns import DOC_LINE
 
 
-logger = get_logger(__name__)
+# 複雑度に加算する制御構造ノード
+_CONTROL_TYPES = frozenset({
+    'if_statement',
+    'for_statement',
+    'while_statement',
+    'do_statement',
+    'case_statement',
+    'conditional_expression',
+})
 
+# 複雑度に加算する論理演算子
+_LOGICAL_OPERATORS = frozenset({'&&', '||'})
 
-class CParser(BaseParser):
-    """Cファイル用パーサー"""
-
-    def __init__(self):
-        """Tree-sitterパーサー初期化"""
-        self.language = Language(tree_sitter_c.language())
-        self.parser = Parser(self.language)
-
-    def get_language(self) -> str:
-        """対応言語名を返す"""
-        return "c"
-
-    def parse_file(self, file_path: Path) -> List[FunctionInfo]:
-        """
-        Cファイルを解析
-
-        Args:
-            file_path: 解析対象ファイル
-
-        Returns:
-            FunctionInfoのリスト
-
-        Raises:
-            FileNotFoundError: ファイルが存在しない
-        """
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
+# 抽出対象の修飾子（バイト列のまま照合し、デコードを省く）
+_C_MODIFIERS = {b'static': 'static', b'extern': 'extern', b'inline': 'inline'}
 
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source_code = f.read()
-        except UnicodeDecodeError as e:
-            logger.warning(f"Encoding error in {file_path}: {e}")
-            return []
-
-        # Tree-sitterでパース
-        tree = self.parser.parse(bytes(source_code, "utf8"))
-
-        if tree.root_node.has_error:
-            logger.warning(f"Syntax error in {file_path}")
-            return []
-
-        # AST走査
-        functions = self._traverse_ast(tree.root_node, source_code, file_path)
-
-        return functions
-
-    def _traverse_ast(self, node: Node, source_code: str, file_path: Path) -> List[FunctionInfo]:
-        """
-        ASTを再帰的に走査
-
-        Args:
-            node: 現在のノード
-            source_code: ソースコード全体
-            file_path: ファイルパス
-
-        Returns:
-            FunctionInfoのリスト
-        """
-        functions = []
+# 言語定義とクエリはプロセス内で共有する（クエリの構文解析は読み込み時の1回のみ）
+_C_LANGUAGE = Language(tree_sitter_c.language())
+_FUNCTION_QUERY = Query(_C_LANGUAGE, "(function_definition) @function")
 
-        # 関数定義を検出
-        if node.type == 'function_definition':
-            func_info = self._extract_function_info(node, source_code, file_path)
-            if func_info:
-                functions.append(func_info)
 
-        # 子ノードを再帰的に走査
-        for child in node.children:
-            functions.extend(self._traverse_ast(child, source_code, file_path))
+class CParser(TreeSitterParser):
+    """Cファイル用パーサー"""
 
-        return functions
+    spec = LangSpec(
+        name="c",
+        language=_C_LANGUAGE,
+        function_query=_FUNCTION_QUERY,
+    )
 
-    def _extract_function_info(self, node: Node, source_code: str, file_path: Path) -> FunctionInfo:
+    def _extract_function_info(
+        self,
+        node: Node,
+        source_bytes: bytes,
+        file_path: str,
+        class_scopes: Optional[tuple[List[int], List[Node]]]
+    ) -> FunctionInfo:
         """
         ノードからFunctionInfoを構築
 
         Args:
             node: function_definitionノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
             file_path: ファイルパス
+            class_scopes: 未使用（Cにはクラスが無いためclass_queryを指定しない）
 
         Returns:
             FunctionInfo
         """
-        # 関数名を取得（declaratorの中から）
-        function_name = self._extract_function_name(node, source_code)
+        # 関数名・引数・修飾子を1回の走査でまとめて抽出
+        extracted = self._extract_all(node, source_bytes)
 
         # コード全体を取得
-        code = self._get_node_text(node, source_code)
+        code = self._get_node_text(node, source_bytes)
 
         # 位置情報
         start_line = node.start_point[0] + 1
@@ -114,106 +76,116 @@ class CParser(BaseParser):
         start_column = node.start_point[1]
         end_column = node.end_point[1]
 
-        # 引数を抽出
-        arguments = self._extract_arguments(node, source_code)
-
         # docコメントを抽出
-        docstring = self._extract_doc_comment(node, source_code)
+        docstring = self._extract_doc_comment(node, source_bytes)
 
-        # 修飾子を抽出
-        modifiers = self._extract_modifiers(node, source_code)
-
-        # メトリクスを計算
-        loc, comment_lines = self._count_lines(code)
-        complexity = self._calculate_complexity(code)
+        # メトリクスを計算（ASTから直接算出）
+        loc, comment_lines, complexity = self._compute_metrics(
+            node, source_bytes, _CONTROL_TYPES, logical_operators=_LOGICAL_OPERATORS
+        )
 
         return FunctionInfo(
-            name=function_name,
+            name=extracted['name'],
             code=code,
-            file_path=str(file_path),
+            file_path=file_path,
             start_line=start_line,
             end_line=end_line,
             start_column=start_column,
             end_column=end_column,
             language="c",
             function_type="function",
-            arguments=arguments,
+            arguments=extracted['arguments'],
             docstring=docstring,
-            modifiers=modifiers,
+            modifiers=extracted['modifiers'],
             scope="global",
             complexity=complexity,
             loc=loc,
             comment_lines=comment_lines
         )
 
-    def _extract_function_name(self, node: Node, source_code: str) -> str:
+    def _extract_all(self, node: Node, source_bytes: bytes) -> dict:
         """
-        関数名を抽出
+        関数名・引数・修飾子を子ノードの1回の走査で抽出
 
         Args:
             node: function_definitionノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
 
         Returns:
-            関数名
+            name, arguments, modifiers をキーに持つ辞書
+        """
+        name = "unknown"
+        arguments = []
+        modifiers = []
+
+        for i, child in enumerate(node.children):
+            if child.type == 'storage_class_specifier':
+                modifier = _C_MODIFIERS.get(source_bytes[child.start_byte:child.end_byte])
+                if modifier is not None:
+                    modifiers.append(modifier)
+            elif node.field_name_for_child(i) == 'declarator':
+                function_declarator = self._find_function_declarator(child)
+                if function_declarator is not None:
+                    name = self._get_function_name(function_declarator, source_bytes)
+                    arguments = self._get_parameter_names(function_declarator, source_bytes)
+
+        return {'name': name, 'arguments': arguments, 'modifiers': modifiers}
+
+    def _find_function_declarator(self, declarator: Node) -> Optional[Node]:
         """
-        # declaratorノードを探す
-        declarator = node.child_by_field_name('declarator')
-        if not declarator:
-            return "unknown"
+        pointer_declaratorを辿ってfunction_declaratorを探す
+
+        Args:
+            declarator: function_definitionのdeclaratorノード
 
-        # function_declaratorまたはpointer_declaratorを探す
-        while declarator:
+        Returns:
+            function_declaratorノード、またはNone
+        """
+        while declarator is not None:
             if declarator.type == 'function_declarator':
-                # declaratorフィールドから識別子を取得
-                inner_declarator = declarator.child_by_field_name('declarator')
-                if inner_declarator and inner_declarator.type == 'identifier':
-                    return self._get_node_text(inner_declarator, source_code)
-                # または直接identifierを探す
-                for child in declarator.children:
-                    if child.type == 'identifier':
-                        return self._get_node_text(child, source_code)
-            elif declarator.type == 'pointer_declarator':
-                # pointer_declaratorの中を探す
-                declarator = declarator.child_by_field_name('declarator')
-            else:
-                break
+                return declarator
+            if declarator.type != 'pointer_declarator':
+                return None
+            declarator = declarator.child_by_field_name('declarator')
+
+        return None
+
+    def _get_function_name(self, function_declarator: Node, source_bytes: bytes) -> str:
+        """
+        function_declaratorから関数名を取得
+
+        Args:
+            function_declarator: function_declaratorノード
+            source_bytes: ソースコード全体（UTF-8バイト列）
+
+        Returns:
+            関数名
+        """
+        # declaratorフィールドから識別子を取得
+        inner_declarator = function_declarator.child_by_field_name('declarator')
+        if inner_declarator and inner_declarator.type == 'identifier':
+            return self._get_node_text(inner_declarator, source_bytes)
+
+        # または直接identifierを探す
+        for child in function_declarator.children:
+            if child.type == 'identifier':
+                return self._get_node_text(child, source_bytes)
 
         return "unknown"
 
-    def _extract_arguments(self, node: Node, source_code: str) -> List[str]:
+    def _get_parameter_names(self, function_declarator: Node, source_bytes: bytes) -> List[str]:
         """
-        関数の引数を抽出
+        function_declaratorから引数名を取得
 
         Args:
-            node: function_definitionノード
-            source_code: ソースコード全体
+            function_declarator: function_declaratorノード
+            source_bytes: ソースコード全体（UTF-8バイト列）
 
         Returns:
             引数名のリスト
         """
         arguments = []
 
-        # declaratorノードを探す
-        declarator = node.child_by_field_name('declarator')
-        if not declarator:
-            return arguments
-
-        # function_declaratorを探す
-        function_declarator = None
-        if declarator.type == 'function_declarator':
-            function_declarator = declarator
-        else:
-            # pointer_declaratorの場合、その中を探す
-            for child in declarator.named_children:
-                if child.type == 'function_declarator':
-                    function_declarator = child
-                    break
-
-        if not function_declarator:
-            return arguments
-
-        # parameter_listを取得
         parameters = function_declarator.child_by_field_name('parameters')
         if not parameters:
             return arguments
@@ -223,37 +195,13 @@ class CParser(BaseParser):
                 # declaratorから引数名を取得
                 param_declarator = child.child_by_field_name('declarator')
                 if param_declarator:
-                    arg_name = self._get_identifier_from_declarator(param_declarator, source_code)
+                    arg_name = get_identifier_from_declarator(param_declarator, source_bytes)
                     if arg_name:
                         arguments.append(arg_name)
 
         return arguments
 
-    def _get_identifier_from_declarator(self, declarator: Node, source_code: str) -> str:
-        """
-        declaratorから識別子を抽出
-
-        Args:
-            declarator: declaratorノード
-            source_code: ソースコード全体
-
-        Returns:
-            識別子名
-        """
-        if declarator.type == 'identifier':
-            return self._get_node_text(declarator, source_code)
-
-        # pointer_declaratorやarray_declaratorの場合、内部を探す
-        for child in declarator.named_children:
-            if child.type == 'identifier':
-                return self._get_node_text(child, source_code)
-            result = self._get_identifier_from_declarator(child, source_code)
-            if result:
-                return result
-
-        return None
-
-    def _extract_doc_comment(self, node: Node, source_code: str) -> str:
+    def _extract_doc_comment(self, node: Node, source_bytes: bytes) -> str:
         """
         docコメントを抽出
 
@@ -262,81 +210,18 @@ class CParser(BaseParser):
 
         Args:
             node: function_definitionノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
 
         Returns:
             docコメント、または None
         """
-        # 親ノードから前のコメントノードを探す
-        parent = node.parent
-        if not parent:
-            return None
-
-        # 関数の直前のコメントを探す
-        node_index = None
-        for i, child in enumerate(parent.children):
-            if child == node:
-                node_index = i
-                break
-
-        if node_index is None or node_index == 0:
-            return None
-
-        # 直前のノードがcommentかチェック
-        prev_node = parent.children[node_index - 1]
-        if prev_node.type == 'comment':
-            comment_text = self._get_node_text(prev_node, source_code)
-            # /** */ を除去
+        # 直前の兄弟ノードがcommentかチェック
+        prev_node = node.prev_sibling
+        if prev_node is not None and prev_node.type == 'comment':
+            comment_text = self._get_node_text(prev_node, source_bytes)
+            # /** */ と各行先頭の * を除去
             if comment_text.startswith('/**'):
-                lines = comment_text[3:-2].split('\n')
-                cleaned_lines = []
-                for line in lines:
-                    line = line.strip()
-                    if line.startswith('*'):
-                        line = line[1:].strip()
-                    if line:
-                        cleaned_lines.append(line)
-                return ' '.join(cleaned_lines) if cleaned_lines else None
+                cleaned = DOC_LINE.sub('', comment_text[3:-2])
+                return ' '.join(cleaned.split()) or None
 
         return None
-
-    def _extract_modifiers(self, node: Node, source_code: str) -> List[str]:
-        """
-        修飾子を抽出（static, inline等）
-
-        Args:
-            node: function_definitionノード
-            source_code: ソースコード全体
-
-        Returns:
-            修飾子のリスト
-        """
-        modifiers = []
-
-        # storage_class_specifierやtype_qualifierをチェック
-        for child in node.children:
-            if child.type == 'storage_class_specifier':
-                modifier_text = self._get_node_text(child, source_code)
-                if modifier_text in ['static', 'extern', 'inline']:
-                    modifiers.append(modifier_text)
-
-        return modifiers
-
-    def _get_node_text(self, node: Node, source_code: str) -> str:
-        """
-        ノードからテキストを抽出
-
-        Args:
-            node: ノード
-            source_code: ソースコード全体
-
-        Returns:
-            ノードのテキスト
-        """
-        if node is None:
-            return ""
-
-        start_byte = node.start_byte
-        end_byte = node.end_byte
-
-        return source_code[start_byte:end_byte]
@@ -4,109 +4,82 @@ C++パーサー
 TDDステップ2-3: Green - テストを通す実装
 """
 
-from pathlib import Path
 from typing import List
 
-from tree_sitter import Language, Parser, Node
+from tree_sitter import Language, Node, Query, QueryCursor
 import tree_sitter_cpp
 
-from src.parser.base_parser import BaseParser, FunctionInfo
-from src.utils.logger import get_logger
-
-
-logger = get_logger(__name__)
-
-
-class CppParser(BaseParser):
+from src.parser.base_parser import FunctionInfo
+from src.parser.c_declarator import get_identifier_from_declarator
+from src.parser.tree_sitter_parser import LangSpec, TreeSitterParser
+from src.utils.patterns import DOC_LINE
+
+
+# 複雑度に加算する制御構造ノード
+_CONTROL_TYPES = frozenset({
+    'if_statement',
+    'for_statement',
+    'for_range_loop',
+    'while_statement',
+    'do_statement',
+    'case_statement',
+    'catch_clause',
+    'conditional_expression',
+})
+
+# 複雑度に加算する論理演算子
+_LOGICAL_OPERATORS = frozenset({'&&', '||'})
+
+# 抽出対象の修飾子（バイト列のまま照合し、全関数で同じ文字列オブジェクトを共有する）
+_CPP_MODIFIERS = {b'static': 'static', b'extern': 'extern', b'inline': 'inline'}
+
+# 言語定義とクエリはプロセス内で共有する（クエリの構文解析は読み込み時の1回のみ）
+_CPP_LANGUAGE = Language(tree_sitter_cpp.language())
+_FUNCTION_QUERY = Query(_CPP_LANGUAGE, "(function_definition) @function")
+_CLASS_QUERY = Query(_CPP_LANGUAGE, "[(class_specifier) (struct_specifier)] @class")
+_DECLARATOR_QUERY = Query(_CPP_LANGUAGE, """
+    (function_declarator declarator: (_) parameters: (parameter_list)) @declarator
+    (parameter_list [
+        (parameter_declaration declarator: (_) @param)
+        (optional_parameter_declaration declarator: (_) @param)
+    ])
+""")
+
+
+class CppParser(TreeSitterParser):
     """C++ファイル用パーサー"""
 
-    def __init__(self):
-        """Tree-sitterパーサー初期化"""
-        self.language = Language(tree_sitter_cpp.language())
-        self.parser = Parser(self.language)
-
-    def get_language(self) -> str:
-        """対応言語名を返す"""
-        return "cpp"
-
-    def parse_file(self, file_path: Path) -> List[FunctionInfo]:
-        """
-        C++ファイルを解析
-
-        Args:
-            file_path: 解析対象ファイル
-
-        Returns:
-            FunctionInfoのリスト
-
-        Raises:
-            FileNotFoundError: ファイルが存在しない
-        """
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source_code = f.read()
-        except UnicodeDecodeError as e:
-            logger.warning(f"Encoding error in {file_path}: {e}")
-            return []
-
-        # Tree-sitterでパース
-        tree = self.parser.parse(bytes(source_code, "utf8"))
-
-        if tree.root_node.has_error:
-            logger.warning(f"Syntax error in {file_path}")
-            return []
-
-        # AST走査
-        functions = self._traverse_ast(tree.root_node, source_code, file_path)
-
-        return functions
-
-    def _traverse_ast(self, node: Node, source_code: str, file_path: Path) -> List[FunctionInfo]:
-        """
-        ASTを再帰的に走査
-
-        Args:
-            node: 現在のノード
-            source_code: ソースコード全体
-            file_path: ファイルパス
-
-        Returns:
-            FunctionInfoのリスト
-        """
-        functions = []
-
-        # 関数定義を検出
-        if node.type == 'function_definition':
-            func_info = self._extract_function_info(node, source_code, file_path)
-            if func_info:
-                functions.append(func_info)
-
-        # 子ノードを再帰的に走査
-        for child in node.children:
-            functions.extend(self._traverse_ast(child, source_code, file_path))
-
-        return functions
-
-    def _extract_function_info(self, node: Node, source_code: str, file_path: Path) -> FunctionInfo:
+    spec = LangSpec(
+        name="cpp",
+        language=_CPP_LANGUAGE,
+        function_query=_FUNCTION_QUERY,
+        class_query=_CLASS_QUERY,
+    )
+
+    def _extract_function_info(
+        self,
+        node: Node,
+        source_bytes: bytes,
+        file_path: str,
+        class_scopes: tuple[List[int], List[Node]]
+    ) -> FunctionInfo:
         """
         ノードからFunctionInfoを構築
 
         Args:
             node: function_definitionノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
             file_path: ファイルパス
+            class_scopes: クラス範囲のスコープマップ
 
         Returns:
             FunctionInfo
         """
-        # 関数名を取得
-        function_name = self._extract_function_name(node, source_code)
+        # 関数名と引数を取得
+        function_name, arguments = self._extract_signature(node, source_bytes)
 
         # コード全体を取得
-        code = self._get_node_text(node, source_code)
+        code = self._get_node_text(node, source_bytes)
 
         # 位置情報
         start_line = node.start_point[0] + 1
@@ -114,26 +87,24 @@ class CppParser(BaseParser):
         start_column = node.start_point[1]
         end_column = node.end_point[1]
 
-        # 引数を抽出
-        arguments = self._extract_arguments(node, source_code)
-
         # docコメントを抽出
-        docstring = self._extract_doc_comment(node, source_code)
+        docstring = self._extract_doc_comment(node, source_bytes)
 
         # スコープと関数タイプを判定
-        scope, function_type = self._determine_scope(node, function_name, source_code)
+        scope, function_type = self._determine_scope(node, function_name, source_bytes, class_scopes)
 
         # 修飾子を抽出
-        modifiers = self._extract_modifiers(node, source_code)
+        modifiers = self._extract_modifiers(node, source_bytes)
 
-        # メトリクスを計算
-        loc, comment_lines = self._count_lines(code)
-        complexity = self._calculate_complexity(code)
+        # メトリクスを計算（ASTから直接算出）
+        loc, comment_lines, complexity = self._compute_metrics(
+            node, source_bytes, _CONTROL_TYPES, logical_operators=_LOGICAL_OPERATORS
+        )
 
         return FunctionInfo(
             name=function_name,
             code=code,
-            file_path=str(file_path),
+            file_path=file_path,
             start_line=start_line,
             end_line=end_line,
             start_column=start_column,
@@ -149,159 +120,71 @@ class CppParser(BaseParser):
             comment_lines=comment_lines
         )
 
-    def _extract_function_name(self, node: Node, source_code: str) -> str:
+    def _extract_signature(self, node: Node, source_bytes: bytes) -> tuple[str, List[str]]:
         """
-        関数名を抽出
+        関数名と引数名を抽出
 
-        Args:
-            node: function_definitionノード
-            source_code: ソースコード全体
-
-        Returns:
-            関数名
-        """
-        # declaratorノードを探す
-        declarator = node.child_by_field_name('declarator')
-        if not declarator:
-            return "unknown"
-
-        # function_declaratorまたはその他のdeclaratorを探す
-        return self._get_function_name_from_declarator(declarator, source_code)
-
-    def _get_function_name_from_declarator(self, declarator: Node, source_code: str) -> str:
-        """
-        declaratorから関数名を抽出
-
-        Args:
-            declarator: declaratorノード
-            source_code: ソースコード全体
-
-        Returns:
-            関数名
-        """
-        if declarator.type == 'function_declarator':
-            # declaratorフィールドから識別子を取得
-            inner_declarator = declarator.child_by_field_name('declarator')
-            if inner_declarator:
-                if inner_declarator.type == 'identifier':
-                    return self._get_node_text(inner_declarator, source_code)
-                elif inner_declarator.type == 'field_identifier':
-                    return self._get_node_text(inner_declarator, source_code)
-                elif inner_declarator.type == 'qualified_identifier':
-                    # 最後の識別子を取得
-                    for child in inner_declarator.children:
-                        if child.type == 'identifier':
-                            return self._get_node_text(child, source_code)
-                else:
-                    # 再帰的に探索
-                    return self._get_function_name_from_declarator(inner_declarator, source_code)
-
-        elif declarator.type == 'pointer_declarator':
-            # pointer_declaratorの中を探す
-            inner_declarator = declarator.child_by_field_name('declarator')
-            if inner_declarator:
-                return self._get_function_name_from_declarator(inner_declarator, source_code)
-
-        elif declarator.type == 'reference_declarator':
-            # reference_declaratorの中を探す
-            inner_declarator = declarator.child_by_field_name('declarator')
-            if inner_declarator:
-                return self._get_function_name_from_declarator(inner_declarator, source_code)
-
-        return "unknown"
-
-    def _extract_arguments(self, node: Node, source_code: str) -> List[str]:
-        """
-        関数の引数を抽出
+        declarator部分木に対してクエリを1回実行し、関数名と引数のdeclaratorを
+        まとめて取得する（Python側でのフィールド探索の往復を避ける）
 
         Args:
             node: function_definitionノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
 
         Returns:
-            引数名のリスト
+            (関数名, 引数名のリスト) のタプル
         """
-        arguments = []
-
-        # declaratorノードを探す
         declarator = node.child_by_field_name('declarator')
         if not declarator:
-            return arguments
-
-        # function_declaratorを探す
-        function_declarator = self._find_function_declarator(declarator)
-        if not function_declarator:
-            return arguments
-
-        # parameter_listを取得
-        parameters = function_declarator.child_by_field_name('parameters')
-        if not parameters:
-            return arguments
-
-        for child in parameters.children:
-            if child.type == 'parameter_declaration':
-                # declaratorから引数名を取得
-                param_declarator = child.child_by_field_name('declarator')
-                if param_declarator:
-                    arg_name = self._get_identifier_from_declarator(param_declarator, source_code)
-                    if arg_name:
-                        arguments.append(arg_name)
-            elif child.type == 'optional_parameter_declaration':
-                # デフォルト引数の場合
-                param_declarator = child.child_by_field_name('declarator')
-                if param_declarator:
-                    arg_name = self._get_identifier_from_declarator(param_declarator, source_code)
-                    if arg_name:
-                        arguments.append(arg_name)
-
-        return arguments
-
-    def _find_function_declarator(self, declarator: Node) -> Node:
-        """
-        function_declaratorを見つける
+            return "unknown", []
 
-        Args:
-            declarator: declaratorノード
+        captures = QueryCursor(_DECLARATOR_QUERY).captures(declarator)
+        function_declarators = captures.get('declarator')
+        if not function_declarators:
+            return "unknown", []
 
-        Returns:
-            function_declaratorノード、またはNone
-        """
-        if declarator.type == 'function_declarator':
-            return declarator
+        # 最も外側（開始位置が最小）のfunction_declaratorが関数自身のもの
+        outer = min(function_declarators, key=lambda n: n.start_byte)
+        function_name = self._get_function_name(outer.child_by_field_name('declarator'), source_bytes)
 
-        # 子ノードを探す
-        for child in declarator.named_children:
-            result = self._find_function_declarator(child)
-            if result:
-                return result
+        # 関数ポインタ引数等の入れ子の引数リストは除外
+        parameters = outer.child_by_field_name('parameters')
+        arguments = []
+        for param_declarator in sorted(captures.get('param', []), key=lambda n: n.start_byte):
+            if param_declarator.parent.parent != parameters:
+                continue
+            arg_name = get_identifier_from_declarator(param_declarator, source_bytes)
+            if arg_name:
+                arguments.append(arg_name)
 
-        return None
+        return function_name, arguments
 
-    def _get_identifier_from_declarator(self, declarator: Node, source_code: str) -> str:
+    def _get_function_name(self, name_node: Node, source_bytes: bytes) -> str:
         """
-        declaratorから識別子を抽出
+        function_declaratorのdeclaratorフィールドから関数名を取得
 
         Args:
-            declarator: declaratorノード
-            source_code: ソースコード全体
+            name_node: function_declaratorのdeclaratorフィールドのノード
+            source_bytes: ソースコード全体（UTF-8バイト列）
 
         Returns:
-            識別子名
+            関数名
         """
-        if declarator.type == 'identifier':
-            return self._get_node_text(declarator, source_code)
+        if name_node is None:
+            return "unknown"
 
-        # pointer_declarator、reference_declarator、array_declaratorの場合、内部を探す
-        for child in declarator.named_children:
-            if child.type == 'identifier':
-                return self._get_node_text(child, source_code)
-            result = self._get_identifier_from_declarator(child, source_code)
-            if result:
-                return result
+        if name_node.type in ('identifier', 'field_identifier'):
+            return self._get_node_text(name_node, source_bytes)
 
-        return None
+        if name_node.type == 'qualified_identifier':
+            # 最後の識別子を取得
+            for child in name_node.children:
+                if child.type == 'identifier':
+                    return self._get_node_text(child, source_bytes)
+
+        return "unknown"
 
-    def _extract_doc_comment(self, node: Node, source_code: str) -> str:
+    def _extract_doc_comment(self, node: Node, source_bytes: bytes) -> str:
         """
         docコメントを抽出
 
@@ -310,77 +193,59 @@ class CppParser(BaseParser):
 
         Args:
             node: function_definitionノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
 
         Returns:
             docコメント、または None
         """
-        # 親ノードから前のコメントノードを探す
-        parent = node.parent
-        if not parent:
-            return None
-
-        # 関数の直前のコメントを探す
-        node_index = None
-        for i, child in enumerate(parent.children):
-            if child == node:
-                node_index = i
-                break
-
-        if node_index is None or node_index == 0:
-            return None
-
-        # 直前のノードがcommentかチェック
-        prev_node = parent.children[node_index - 1]
-        if prev_node.type == 'comment':
-            comment_text = self._get_node_text(prev_node, source_code)
-            # /** */ を除去
+        # 直前の兄弟ノードがcommentかチェック
+        prev_node = node.prev_sibling
+        if prev_node is not None and prev_node.type == 'comment':
+            comment_text = self._get_node_text(prev_node, source_bytes)
+            # /** */ と各行先頭の * を除去
             if comment_text.startswith('/**'):
-                lines = comment_text[3:-2].split('\n')
-                cleaned_lines = []
-                for line in lines:
-                    line = line.strip()
-                    if line.startswith('*'):
-                        line = line[1:].strip()
-                    if line:
-                        cleaned_lines.append(line)
-                return ' '.join(cleaned_lines) if cleaned_lines else None
+                cleaned = DOC_LINE.sub('', comment_text[3:-2])
+                return ' '.join(cleaned.split()) or None
 
         return None
 
-    def _determine_scope(self, node: Node, function_name: str, source_code: str) -> tuple[str, str]:
+    def _determine_scope(
+        self,
+        node: Node,
+        function_name: str,
+        source_bytes: bytes,
+        class_scopes: tuple[List[int], List[Node]]
+    ) -> tuple[str, str]:
         """
         スコープと関数タイプを判定
 
         Args:
             node: function_definitionノード
             function_name: 関数名
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
+            class_scopes: クラス範囲のスコープマップ
 
         Returns:
             (scope, function_type) のタプル
         """
-        # 親ノードを遡ってclass_specifierを探す
-        parent = node.parent
-        while parent:
-            if parent.type in ['class_specifier', 'struct_specifier']:
-                # クラス内のメンバーかチェック
-                # コンストラクタかどうか判定（関数名がクラス名と同じ）
-                class_name = self._get_class_name(parent, source_code)
-                if class_name and class_name == function_name:
-                    return "class", "constructor"
-                return "class", "method"
-            parent = parent.parent
-
-        return "global", "function"
-
-    def _get_class_name(self, class_node: Node, source_code: str = "") -> str:
+        # 関数を囲む最も内側のclass_specifier/struct_specifierを探す
+        class_node = self._find_enclosing_scope(class_scopes, node)
+        if class_node is None:
+            return "global", "function"
+
+        # コンストラクタかどうか判定（関数名がクラス名と同じ）
+        class_name = self._get_class_name(class_node, source_bytes)
+        if class_name and class_name == function_name:
+            return "class", "constructor"
+        return "class", "method"
+
+    def _get_class_name(self, class_node: Node, source_bytes: bytes = b"") -> str:
         """
         クラス名を取得
 
         Args:
             class_node: class_specifierノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
 
         Returns:
             クラス名
@@ -388,17 +253,17 @@ class CppParser(BaseParser):
         # nameフィールドから取得
         name_node = class_node.child_by_field_name('name')
         if name_node:
-            return self._get_node_text(name_node, source_code)
+            return self._get_node_text(name_node, source_bytes)
 
         return None
 
-    def _extract_modifiers(self, node: Node, source_code: str) -> List[str]:
+    def _extract_modifiers(self, node: Node, source_bytes: bytes) -> List[str]:
         """
         修飾子を抽出（static, inline, virtual等）
 
         Args:
             node: function_definitionノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
 
         Returns:
             修飾子のリスト
@@ -408,29 +273,10 @@ class CppParser(BaseParser):
         # storage_class_specifierやtype_qualifierをチェック
         for child in node.children:
             if child.type == 'storage_class_specifier':
-                modifier_text = self._get_node_text(child, source_code)
-                if modifier_text in ['static', 'extern', 'inline']:
-                    modifiers.append(modifier_text)
+                modifier = _CPP_MODIFIERS.get(source_bytes[child.start_byte:child.end_byte])
+                if modifier is not None:
+                    modifiers.append(modifier)
             elif child.type == 'virtual_function_specifier':
                 modifiers.append('virtual')
 
         return modifiers
-
-    def _get_node_text(self, node: Node, source_code: str) -> str:
-        """
-        ノードからテキストを抽出
-
-        Args:
-            node: ノード
-            source_code: ソースコード全体
-
-        Returns:
-            ノードのテキスト
-        """
-        if node is None:
-            return ""
-
-        start_byte = node.start_byte
-        end_byte = node.end_byte
-
-        return source_code[start_byte:end_byte]
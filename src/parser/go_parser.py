@@ -4,110 +4,73 @@ Goパーサー
 TDDステップ2-3: Green - テストを通す実装
 """
 
-from pathlib import Path
-from typing import List
+import re
+from typing import List, Optional
 
-from tree_sitter import Language, Parser, Node
+from tree_sitter import Language, Node, Query
 import tree_sitter_go
 
-from src.parser.base_parser import BaseParser, FunctionInfo
-from src.utils.logger import get_logger
+from src.parser.base_parser import FunctionInfo
+from src.parser.tree_sitter_parser import LangSpec, TreeSitterParser
 
 
-logger = get_logger(__name__)
+# 複雑度に加算する制御構造ノード（default節は分岐に数えない）
+_CONTROL_TYPES = frozenset({
+    'if_statement',
+    'for_statement',
+    'expression_case',
+    'type_case',
+    'communication_case',
+})
 
+# 複雑度に加算する論理演算子
+_LOGICAL_OPERATORS = frozenset({'&&', '||'})
 
-class GoParser(BaseParser):
-    """Goファイル用パーサー"""
-
-    def __init__(self):
-        """Tree-sitterパーサー初期化"""
-        self.language = Language(tree_sitter_go.language())
-        self.parser = Parser(self.language)
-
-    def get_language(self) -> str:
-        """対応言語名を返す"""
-        return "go"
-
-    def parse_file(self, file_path: Path) -> List[FunctionInfo]:
-        """
-        Goファイルを解析
-
-        Args:
-            file_path: 解析対象ファイル
-
-        Returns:
-            FunctionInfoのリスト
-
-        Raises:
-            FileNotFoundError: ファイルが存在しない
-        """
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source_code = f.read()
-        except UnicodeDecodeError as e:
-            logger.warning(f"Encoding error in {file_path}: {e}")
-            return []
-
-        # Tree-sitterでパース
-        tree = self.parser.parse(bytes(source_code, "utf8"))
-
-        if tree.root_node.has_error:
-            logger.warning(f"Syntax error in {file_path}")
-            return []
-
-        # AST走査
-        functions = self._traverse_ast(tree.root_node, source_code, file_path)
-
-        return functions
-
-    def _traverse_ast(self, node: Node, source_code: str, file_path: Path) -> List[FunctionInfo]:
-        """
-        ASTを再帰的に走査
+# 関数定義を含み得るか判定する簡易パターン（関数・メソッド宣言は必ずfuncで始まる）
+_CANDIDATE_PATTERN = re.compile(rb'\bfunc\b')
 
-        Args:
-            node: 現在のノード
-            source_code: ソースコード全体
-            file_path: ファイルパス
-
-        Returns:
-            FunctionInfoのリスト
-        """
-        functions = []
+# 言語定義とクエリはプロセス内で共有する（クエリの構文解析は読み込み時の1回のみ）
+_GO_LANGUAGE = Language(tree_sitter_go.language())
+_FUNCTION_QUERY = Query(_GO_LANGUAGE, "[(function_declaration) (method_declaration)] @function")
 
-        # 関数定義を検出
-        if node.type == 'function_declaration' or node.type == 'method_declaration':
-            func_info = self._extract_function_info(node, source_code, file_path)
-            if func_info:
-                functions.append(func_info)
 
-        # 子ノードを再帰的に走査
-        for child in node.children:
-            functions.extend(self._traverse_ast(child, source_code, file_path))
-
-        return functions
+class GoParser(TreeSitterParser):
+    """Goファイル用パーサー"""
 
-    def _extract_function_info(self, node: Node, source_code: str, file_path: Path) -> FunctionInfo:
+    spec = LangSpec(
+        name="go",
+        language=_GO_LANGUAGE,
+        function_query=_FUNCTION_QUERY,
+        candidate_pattern=_CANDIDATE_PATTERN,
+        # Goの関数・メソッド宣言はトップレベルにしか現れないため、関数本体へは降りない
+        function_max_depth=1,
+    )
+
+    def _extract_function_info(
+        self,
+        node: Node,
+        source_bytes: bytes,
+        file_path: str,
+        class_scopes: Optional[tuple[List[int], List[Node]]]
+    ) -> FunctionInfo:
         """
         ノードからFunctionInfoを構築
 
         Args:
             node: function_declaration or method_declarationノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
             file_path: ファイルパス
+            class_scopes: クラス範囲のスコープマップ（Goにはクラスが無いため常にNone）
 
         Returns:
             FunctionInfo
         """
         # 関数名を取得
         name_node = node.child_by_field_name('name')
-        function_name = self._get_node_text(name_node, source_code) if name_node else "unknown"
+        function_name = self._get_node_text(name_node, source_bytes) if name_node else "unknown"
 
         # コード全体を取得
-        code = self._get_node_text(node, source_code)
+        code = self._get_node_text(node, source_bytes)
 
         # 位置情報
         start_line = node.start_point[0] + 1
@@ -116,22 +79,23 @@ class GoParser(BaseParser):
         end_column = node.end_point[1]
 
         # 引数を抽出
-        arguments = self._extract_arguments(node, source_code)
+        arguments = self._extract_arguments(node, source_bytes)
 
         # docコメントを抽出
-        docstring = self._extract_doc_comment(node, source_code)
+        docstring = self._extract_doc_comment(node, source_bytes)
 
         # スコープと修飾子を判定
         scope, function_type = self._determine_scope(node)
 
-        # メトリクスを計算
-        loc, comment_lines = self._count_lines(code)
-        complexity = self._calculate_complexity(code)
+        # メトリクスを計算（ASTから直接算出）
+        loc, comment_lines, complexity = self._compute_metrics(
+            node, source_bytes, _CONTROL_TYPES, logical_operators=_LOGICAL_OPERATORS
+        )
 
         return FunctionInfo(
             name=function_name,
             code=code,
-            file_path=str(file_path),
+            file_path=file_path,
             start_line=start_line,
             end_line=end_line,
             start_column=start_column,
@@ -146,13 +110,13 @@ class GoParser(BaseParser):
             comment_lines=comment_lines
         )
 
-    def _extract_arguments(self, node: Node, source_code: str) -> List[str]:
+    def _extract_arguments(self, node: Node, source_bytes: bytes) -> List[str]:
         """
         関数の引数を抽出
 
         Args:
             node: function_declaration or method_declarationノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
 
         Returns:
             引数名のリスト
@@ -170,18 +134,13 @@ class GoParser(BaseParser):
                 # nameフィールドから引数名を取得
                 # Goでは複数の引数が同じ型を持つ場合、カンマ区切りで書ける
                 # 例: func Add(a, b int)
-                name_nodes = []
                 for subchild in child.children:
                     if subchild.type == 'identifier':
-                        name_nodes.append(subchild)
-
-                for name_node in name_nodes:
-                    arg_name = self._get_node_text(name_node, source_code)
-                    arguments.append(arg_name)
+                        arguments.append(self._get_node_text(subchild, source_bytes))
 
         return arguments
 
-    def _extract_doc_comment(self, node: Node, source_code: str) -> str:
+    def _extract_doc_comment(self, node: Node, source_bytes: bytes) -> str:
         """
         docコメントを抽出
 
@@ -190,30 +149,15 @@ class GoParser(BaseParser):
 
         Args:
             node: function_declaration or method_declarationノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
 
         Returns:
             docコメント、または None
         """
-        # 親ノードから前のコメントノードを探す
-        parent = node.parent
-        if not parent:
-            return None
-
-        # 関数の直前のコメントを探す
-        node_index = None
-        for i, child in enumerate(parent.children):
-            if child == node:
-                node_index = i
-                break
-
-        if node_index is None or node_index == 0:
-            return None
-
-        # 直前のノードがcommentかチェック
-        prev_node = parent.children[node_index - 1]
-        if prev_node.type == 'comment':
-            comment_text = self._get_node_text(prev_node, source_code)
+        # 直前の兄弟ノードがcommentかチェック
+        prev_node = node.prev_sibling
+        if prev_node is not None and prev_node.type == 'comment':
+            comment_text = self._get_node_text(prev_node, source_bytes)
             # // を除去
             if comment_text.startswith('//'):
                 return comment_text[2:].strip()
@@ -235,22 +179,3 @@ class GoParser(BaseParser):
             return "method", "method"
 
         return "global", "function"
-
-    def _get_node_text(self, node: Node, source_code: str) -> str:
-        """
-        ノードからテキストを抽出
-
-        Args:
-            node: ノード
-            source_code: ソースコード全体
-
-        Returns:
-            ノードのテキスト
-        """
-        if node is None:
-            return ""
-
-        start_byte = node.start_byte
-        end_byte = node.end_byte
-
-        return source_code[start_byte:end_byte]
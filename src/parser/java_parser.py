@@ -4,110 +4,81 @@ Javaパーサー
 TDDステップ2-3: Green - テストを通す実装
 """
 
-from pathlib import Path
 from typing import List
 
-from tree_sitter import Language, Parser, Node
+from tree_sitter import Language, Node, Query
 import tree_sitter_java
 
-from src.parser.base_parser import BaseParser, FunctionInfo
-from src.utils.logger import get_logger
+from src.parser.base_parser import FunctionInfo
+from src.parser.tree_sitter_parser import LangSpec, TreeSitterParser
+from src.utils.patterns import DOC_LINE
 
 
-logger = get_logger(__name__)
+# 抽出対象の修飾子（バイト列のまま照合し、全メソッドで同じ文字列オブジェクトを共有する）
+_JAVA_MODIFIERS = {
+    m.encode(): m
+    for m in ('public', 'private', 'protected', 'static', 'final', 'abstract', 'synchronized', 'native')
+}
 
+# 複雑度に加算する制御構造ノード（caseはswitch_labelのうちdefaultを除くためキーワードで数える）
+_CONTROL_TYPES = frozenset({
+    'if_statement',
+    'for_statement',
+    'enhanced_for_statement',
+    'while_statement',
+    'do_statement',
+    'case',
+    'catch_clause',
+    'ternary_expression',
+})
 
-class JavaParser(BaseParser):
-    """Javaファイル用パーサー"""
-
-    def __init__(self):
-        """Tree-sitterパーサー初期化"""
-        self.language = Language(tree_sitter_java.language())
-        self.parser = Parser(self.language)
-
-    def get_language(self) -> str:
-        """対応言語名を返す"""
-        return "java"
-
-    def parse_file(self, file_path: Path) -> List[FunctionInfo]:
-        """
-        Javaファイルを解析
-
-        Args:
-            file_path: 解析対象ファイル
-
-        Returns:
-            FunctionInfoのリスト
+# 複雑度に加算する論理演算子
+_LOGICAL_OPERATORS = frozenset({'&&', '||'})
 
-        Raises:
-            FileNotFoundError: ファイルが存在しない
-        """
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source_code = f.read()
-        except UnicodeDecodeError as e:
-            logger.warning(f"Encoding error in {file_path}: {e}")
-            return []
-
-        # Tree-sitterでパース
-        tree = self.parser.parse(bytes(source_code, "utf8"))
-
-        if tree.root_node.has_error:
-            logger.warning(f"Syntax error in {file_path}")
-            return []
-
-        # AST走査
-        functions = self._traverse_ast(tree.root_node, source_code, file_path)
+# コメント行として数えるノード
+_COMMENT_TYPES = frozenset({'line_comment', 'block_comment'})
 
-        return functions
+# 言語定義とクエリはプロセス内で共有する（クエリの構文解析は読み込み時の1回のみ）
+_JAVA_LANGUAGE = Language(tree_sitter_java.language())
+_FUNCTION_QUERY = Query(_JAVA_LANGUAGE, "[(method_declaration) (constructor_declaration)] @function")
+_CLASS_QUERY = Query(_JAVA_LANGUAGE, "(class_declaration) @class")
 
-    def _traverse_ast(self, node: Node, source_code: str, file_path: Path) -> List[FunctionInfo]:
-        """
-        ASTを再帰的に走査
-
-        Args:
-            node: 現在のノード
-            source_code: ソースコード全体
-            file_path: ファイルパス
 
-        Returns:
-            FunctionInfoのリスト
-        """
-        functions = []
-
-        # メソッド定義とコンストラクタを検出
-        if node.type == 'method_declaration' or node.type == 'constructor_declaration':
-            func_info = self._extract_function_info(node, source_code, file_path)
-            if func_info:
-                functions.append(func_info)
-
-        # 子ノードを再帰的に走査
-        for child in node.children:
-            functions.extend(self._traverse_ast(child, source_code, file_path))
-
-        return functions
+class JavaParser(TreeSitterParser):
+    """Javaファイル用パーサー"""
 
-    def _extract_function_info(self, node: Node, source_code: str, file_path: Path) -> FunctionInfo:
+    spec = LangSpec(
+        name="java",
+        language=_JAVA_LANGUAGE,
+        function_query=_FUNCTION_QUERY,
+        class_query=_CLASS_QUERY,
+    )
+
+    def _extract_function_info(
+        self,
+        node: Node,
+        source_bytes: bytes,
+        file_path: str,
+        class_scopes: tuple[List[int], List[Node]]
+    ) -> FunctionInfo:
         """
         ノードからFunctionInfoを構築
 
         Args:
             node: method_declaration or constructor_declarationノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
             file_path: ファイルパス
+            class_scopes: クラス範囲のスコープマップ
 
         Returns:
             FunctionInfo
         """
         # 関数名を取得
         name_node = node.child_by_field_name('name')
-        function_name = self._get_node_text(name_node, source_code) if name_node else "unknown"
+        function_name = self._get_node_text(name_node, source_bytes) if name_node else "unknown"
 
         # コード全体を取得
-        code = self._get_node_text(node, source_code)
+        code = self._get_node_text(node, source_bytes)
 
         # 位置情報
         start_line = node.start_point[0] + 1
@@ -116,23 +87,24 @@ class JavaParser(BaseParser):
         end_column = node.end_point[1]
 
         # 引数を抽出
-        arguments = self._extract_arguments(node, source_code)
+        arguments = self._extract_arguments(node, source_bytes)
 
         # JavaDocコメントを抽出
-        docstring = self._extract_javadoc(node, source_code)
+        docstring = self._extract_javadoc(node, source_bytes)
 
         # スコープと修飾子を判定
-        scope, function_type = self._determine_scope(node)
-        modifiers = self._extract_modifiers(node, source_code)
+        scope, function_type = self._determine_scope(node, class_scopes)
+        modifiers = self._extract_modifiers(node, source_bytes)
 
-        # メトリクスを計算
-        loc, comment_lines = self._count_lines(code)
-        complexity = self._calculate_complexity(code)
+        # メトリクスを計算（ASTから直接算出）
+        loc, comment_lines, complexity = self._compute_metrics(
+            node, source_bytes, _CONTROL_TYPES, _COMMENT_TYPES, _LOGICAL_OPERATORS
+        )
 
         return FunctionInfo(
             name=function_name,
             code=code,
-            file_path=str(file_path),
+            file_path=file_path,
             start_line=start_line,
             end_line=end_line,
             start_column=start_column,
@@ -148,13 +120,13 @@ class JavaParser(BaseParser):
             comment_lines=comment_lines
         )
 
-    def _extract_arguments(self, node: Node, source_code: str) -> List[str]:
+    def _extract_arguments(self, node: Node, source_bytes: bytes) -> List[str]:
         """
         メソッドの引数を抽出
 
         Args:
             node: method_declaration or constructor_declarationノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
 
         Returns:
             引数名のリスト
@@ -172,12 +144,12 @@ class JavaParser(BaseParser):
                 # nameフィールドから引数名を取得
                 name_node = child.child_by_field_name('name')
                 if name_node:
-                    arg_name = self._get_node_text(name_node, source_code)
+                    arg_name = self._get_node_text(name_node, source_bytes)
                     arguments.append(arg_name)
 
         return arguments
 
-    def _extract_javadoc(self, node: Node, source_code: str) -> str:
+    def _extract_javadoc(self, node: Node, source_bytes: bytes) -> str:
         """
         JavaDocコメントを抽出
 
@@ -186,51 +158,29 @@ class JavaParser(BaseParser):
 
         Args:
             node: method_declaration or constructor_declarationノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
 
         Returns:
             JavaDocコメント、または None
         """
-        # 親ノードから前のコメントノードを探す
-        parent = node.parent
-        if not parent:
-            return None
-
-        # メソッドの直前のコメントを探す
-        node_index = None
-        for i, child in enumerate(parent.children):
-            if child == node:
-                node_index = i
-                break
-
-        if node_index is None or node_index == 0:
-            return None
-
-        # 直前のノードがblock_commentかチェック
-        prev_node = parent.children[node_index - 1]
-        if prev_node.type == 'block_comment':
-            comment_text = self._get_node_text(prev_node, source_code)
-            # /** と */ を除去
+        # 直前の兄弟ノードがblock_commentかチェック
+        prev_node = node.prev_sibling
+        if prev_node is not None and prev_node.type == 'block_comment':
+            comment_text = self._get_node_text(prev_node, source_bytes)
+            # /** */ と各行先頭の * を除去
             if comment_text.startswith('/**'):
-                # /** */ を除去し、各行の * を除去
-                lines = comment_text[3:-2].split('\n')
-                cleaned_lines = []
-                for line in lines:
-                    line = line.strip()
-                    if line.startswith('*'):
-                        line = line[1:].strip()
-                    if line:
-                        cleaned_lines.append(line)
-                return ' '.join(cleaned_lines) if cleaned_lines else None
+                cleaned = DOC_LINE.sub('', comment_text[3:-2])
+                return ' '.join(cleaned.split()) or None
 
         return None
 
-    def _determine_scope(self, node: Node) -> tuple[str, str]:
+    def _determine_scope(self, node: Node, class_scopes: tuple[List[int], List[Node]]) -> tuple[str, str]:
         """
         スコープと関数タイプを判定
 
         Args:
             node: method_declaration or constructor_declarationノード
+            class_scopes: クラス範囲のスコープマップ
 
         Returns:
             (scope, function_type) のタプル
@@ -239,22 +189,19 @@ class JavaParser(BaseParser):
         if node.type == 'constructor_declaration':
             return "class", "constructor"
 
-        # 親ノードを遡ってclass_declarationを探す
-        parent = node.parent
-        while parent:
-            if parent.type == 'class_declaration':
-                return "class", "method"
-            parent = parent.parent
+        # class_declarationの範囲内にあればメソッド
+        if self._find_enclosing_scope(class_scopes, node) is not None:
+            return "class", "method"
 
         return "global", "method"
 
-    def _extract_modifiers(self, node: Node, source_code: str) -> List[str]:
+    def _extract_modifiers(self, node: Node, source_bytes: bytes) -> List[str]:
         """
         修飾子を抽出（public, private, static等）
 
         Args:
             node: method_declaration or constructor_declarationノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
 
         Returns:
             修飾子のリスト
@@ -265,28 +212,10 @@ class JavaParser(BaseParser):
         for child in node.children:
             if child.type == 'modifiers':
                 for modifier_child in child.children:
-                    modifier_text = self._get_node_text(modifier_child, source_code)
-                    if modifier_text in ['public', 'private', 'protected', 'static',
-                                       'final', 'abstract', 'synchronized', 'native']:
-                        modifiers.append(modifier_text)
+                    modifier = _JAVA_MODIFIERS.get(
+                        source_bytes[modifier_child.start_byte:modifier_child.end_byte]
+                    )
+                    if modifier is not None:
+                        modifiers.append(modifier)
 
         return modifiers
-
-    def _get_node_text(self, node: Node, source_code: str) -> str:
-        """
-        ノードからテキストを抽出
-
-        Args:
-            node: ノード
-            source_code: ソースコード全体
-
-        Returns:
-            ノードのテキスト
-        """
-        if node is None:
-            return ""
-
-        start_byte = node.start_byte
-        end_byte = node.end_byte
-
-        return source_code[start_byte:end_byte]
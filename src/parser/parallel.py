@@ -0,0 +1,99 @@
+"""
+ファイル単位の並列解析
+
+Pythonレイヤー（FunctionInfo構築等）がGILに律速されるため、
+プロセスプールでファイル単位に並列化する
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Type
+
+from src.parser.base_parser import BaseParser, FunctionInfo
+
+
+# ワーカープロセス内で再利用するパーサー（言語定義の初期化を1回に抑える）
+_worker_parsers: Dict[Type[BaseParser], BaseParser] = {}
+
+
+def _parse_one(
+    parser_cls: Type[BaseParser],
+    file_path: Path,
+    source_bytes: Optional[bytes] = None
+) -> List[FunctionInfo]:
+    """
+    ワーカープロセスで1ファイルを解析
+
+    Args:
+        parser_cls: パーサークラス
+        file_path: 解析対象ファイル
+        source_bytes: 読み込み済みのソース（Noneの場合はワーカーでファイルを読み込む）
+
+    Returns:
+        FunctionInfoのリスト
+    """
+    parser = _worker_parsers.get(parser_cls)
+    if parser is None:
+        parser = _worker_parsers[parser_cls] = parser_cls()
+    if source_bytes is None:
+        return parser.parse_file(file_path)
+    return parser.parse_bytes(source_bytes, file_path)
+
+
+def parse_each_parallel(
+    file_paths: Sequence[Path],
+    parser_classes: Sequence[Type[BaseParser]],
+    max_workers: Optional[int] = None,
+    sources: Optional[Sequence[Optional[bytes]]] = None
+) -> List[List[FunctionInfo]]:
+    """
+    複数ファイルをプロセスプールで並列に解析し、ファイルごとの結果を返す
+
+    Args:
+        file_paths: 解析対象ファイルのリスト
+        parser_classes: 各ファイルの解析に使うパーサークラス（file_pathsと同じ順序）
+        max_workers: ワーカープロセス数（Noneの場合はCPU数）
+        sources: 読み込み済みのソース（file_pathsと同じ順序。Noneの要素はワーカーで読み込む）
+
+    Returns:
+        ファイルごとのFunctionInfoのリスト（file_pathsの順序を保持）
+
+    Raises:
+        FileNotFoundError: ファイルが存在しない
+    """
+    if not file_paths:
+        return []
+
+    workers = max_workers or os.cpu_count() or 1
+    # プロセス間通信の回数を抑えるため、ワーカーあたり数回に分けて投入
+    chunksize = max(1, len(file_paths) // (workers * 4))
+
+    if sources is None:
+        sources = [None] * len(file_paths)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_parse_one, parser_classes, file_paths, sources, chunksize=chunksize))
+
+
+def parse_files_parallel(
+    file_paths: List[Path],
+    parser_cls: Type[BaseParser],
+    max_workers: Optional[int] = None
+) -> List[FunctionInfo]:
+    """
+    複数ファイルをプロセスプールで並列に解析
+
+    Args:
+        file_paths: 解析対象ファイルのリスト
+        parser_cls: パーサークラス
+        max_workers: ワーカープロセス数（Noneの場合はCPU数）
+
+    Returns:
+        全ファイルのFunctionInfoのリスト（file_pathsの順序を保持）
+
+    Raises:
+        FileNotFoundError: ファイルが存在しない
+    """
+    results = parse_each_parallel(file_paths, [parser_cls] * len(file_paths), max_workers)
+    return [func_info for functions in results for func_info in functions]
@@ -4,38 +4,81 @@
 TDDステップ4-4: Green - テストを通す実装
 """
 
+import functools
+import importlib
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
-from src.parser.base_parser import BaseParser
-from src.parser.python_parser import PythonParser
-from src.parser.rust_parser import RustParser
-from src.parser.go_parser import GoParser
-from src.parser.java_parser import JavaParser
-from src.parser.c_parser import CParser
-from src.parser.cpp_parser import CppParser
+from src.parser.ast_cache import AstCache, content_digest
+from src.parser.base_parser import BaseParser, FunctionInfo, _read_source_bytes
+from src.parser.parallel import parse_each_parallel
+
+
+# 拡張子から言語名への対応表（呼び出しごとに作り直さないようモジュールで保持）
+_EXTENSION_MAP = {
+    '.py': 'python',
+    '.rs': 'rust',
+    '.go': 'go',
+    '.java': 'java',
+    '.c': 'c',
+    '.h': 'c',
+    '.cpp': 'cpp',
+    '.cc': 'cpp',
+    '.cxx': 'cpp',
+    '.hpp': 'cpp',
+    '.hh': 'cpp',
+    '.hxx': 'cpp'
+}
+
+# 言語名からパーサークラスの所在（モジュール名, クラス名）への対応表
+# （使われた言語のモジュールだけを読み込み、Tree-sitter言語定義のロードを必要な分に抑える）
+_PARSER_CLASSES = {
+    'python': ('src.parser.python_parser', 'PythonParser'),
+    'rust': ('src.parser.rust_parser', 'RustParser'),
+    'go': ('src.parser.go_parser', 'GoParser'),
+    'java': ('src.parser.java_parser', 'JavaParser'),
+    'c': ('src.parser.c_parser', 'CParser'),
+    'cpp': ('src.parser.cpp_parser', 'CppParser')
+}
+
+# 実行中に保持する解析結果の最大件数（パス・更新時刻・サイズが同じなら再読み込みしない）
+_MEMO_SIZE = 2048
+
+
+def _create_parser(language: str) -> BaseParser:
+    """
+    言語のパーサーを生成（初回はパーサーモジュールを読み込む）
+
+    Args:
+        language: 言語名（python/rust/go/java/c/cpp）
+
+    Returns:
+        パーサーインスタンス
+    """
+    module_name, class_name = _PARSER_CLASSES[language]
+    return getattr(importlib.import_module(module_name), class_name)()
 
 
 class ParserFactory:
     """パーサーファクトリ（シングルトンパターン）"""
 
-    def __init__(self):
-        """遅延初期化（get_parserで初回アクセス時に初期化）"""
+    def __init__(self, cache: Optional[AstCache] = None):
+        """
+        遅延初期化（get_parserで言語ごとに初回アクセス時に初期化）
+
+        Args:
+            cache: 解析結果の永続キャッシュ（Noneの場合は実行中のメモリ上のみ保持）
+        """
         self._parsers: Dict[str, BaseParser] = {}
-        self._initialized = False
+        self.cache = cache
+        self._memo: "OrderedDict[Tuple[str, int, int], Tuple[FunctionInfo, ...]]" = OrderedDict()
 
     def _initialize_parsers(self):
-        """パーサーインスタンスを初期化"""
-        if not self._initialized:
-            self._parsers = {
-                'python': PythonParser(),
-                'rust': RustParser(),
-                'go': GoParser(),
-                'java': JavaParser(),
-                'c': CParser(),
-                'cpp': CppParser()
-            }
-            self._initialized = True
+        """全言語のパーサーインスタンスを初期化（未生成の言語のみ）"""
+        for language in _PARSER_CLASSES:
+            if language not in self._parsers:
+                self._parsers[language] = _create_parser(language)
 
     def get_parser(self, file_path: Path) -> Optional[BaseParser]:
         """
@@ -47,9 +90,142 @@ class ParserFactory:
         Returns:
             対応するパーサー、未対応の場合None
         """
-        self._initialize_parsers()
         language = self._detect_language(file_path)
-        return self._parsers.get(language)
+        if language is None:
+            return None
+
+        parser = self._parsers.get(language)
+        if parser is None:
+            parser = self._parsers[language] = _create_parser(language)
+        return parser
+
+    def parse_file(self, file_path: Path) -> List[FunctionInfo]:
+        """
+        キャッシュを参照しながらソースファイルを解析
+
+        メモリ上の結果（パス・更新時刻・サイズで照合）、永続キャッシュ（内容のハッシュで照合）の
+        順に参照し、どちらにも無い場合のみパーサーで解析する
+
+        Args:
+            file_path: 解析対象ファイル
+
+        Returns:
+            FunctionInfoのリスト（未対応言語の場合は空リスト）
+
+        Raises:
+            FileNotFoundError: ファイルが存在しない
+        """
+        parser = self.get_parser(file_path)
+        if parser is None:
+            return []
+
+        memo_key = self._memo_key(file_path)
+        cached = self._memo.get(memo_key)
+        if cached is not None:
+            self._memo.move_to_end(memo_key)
+            return list(cached)
+
+        if self.cache is None:
+            functions = parser.parse_file(file_path)
+        else:
+            # ハッシュ計算のために読み込んだ内容をそのまま解析に使い、ファイルを1回だけ読む
+            path_str = str(file_path)
+            source_bytes = _read_source_bytes(file_path)
+            digest = content_digest(source_bytes)
+            functions = self.cache.get(path_str, digest)
+            if functions is None:
+                functions = parser.parse_bytes(source_bytes, file_path)
+                self.cache.put(path_str, digest, functions)
+
+        self._remember(memo_key, functions)
+        return functions
+
+    def parse_files(
+        self,
+        file_paths: List[Path],
+        max_workers: Optional[int] = None
+    ) -> Dict[Path, List[FunctionInfo]]:
+        """
+        複数ファイルをプロセスプールで並列に解析
+
+        キャッシュ済みのファイルはワーカーへ送らず、未解析のファイルのみを並列に解析する
+
+        Args:
+            file_paths: 解析対象ファイルのリスト
+            max_workers: ワーカープロセス数（Noneの場合はCPU数）
+
+        Returns:
+            ファイルパスからFunctionInfoのリストへの辞書
+            （未対応言語のファイルは含まない。挿入順はfile_pathsの順序）
+
+        Raises:
+            FileNotFoundError: ファイルが存在しない
+        """
+        # 未対応言語のファイルはワーカーへ送らない
+        targets = [path for path in file_paths if self._detect_language(path) is not None]
+
+        results: Dict[Path, Optional[List[FunctionInfo]]] = {}
+        misses = []
+        for path in targets:
+            memo_key = self._memo_key(path)
+            cached = self._memo.get(memo_key)
+            functions = None if cached is None else list(cached)
+            source_bytes = digest = None
+            if functions is None and self.cache is not None:
+                source_bytes = _read_source_bytes(path)
+                digest = content_digest(source_bytes)
+                functions = self.cache.get(str(path), digest)
+            results[path] = functions
+            if functions is None:
+                misses.append((path, source_bytes, digest))
+
+        if misses:
+            # ハッシュ計算のために読み込んだ内容はワーカーへ渡し、ファイルを再読み込みさせない
+            paths = [path for path, _, _ in misses]
+            parser_classes = [type(self.get_parser(path)) for path in paths]
+            sources = [source_bytes for _, source_bytes, _ in misses]
+            parsed = parse_each_parallel(paths, parser_classes, max_workers, sources)
+            for (path, _, digest), functions in zip(misses, parsed):
+                results[path] = functions
+                if digest is not None:
+                    self.cache.put(str(path), digest, functions)
+
+        for path in targets:
+            self._remember(self._memo_key(path), results[path])
+        return results
+
+    def _memo_key(self, file_path: Path) -> Tuple[str, int, int]:
+        """
+        メモリ上の解析結果のキー（パス・更新時刻・サイズ）を取得
+
+        Args:
+            file_path: ファイルパス
+
+        Returns:
+            (パス, 更新時刻[ns], サイズ) のタプル
+
+        Raises:
+            FileNotFoundError: ファイルが存在しない
+        """
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {file_path}") from None
+        return str(file_path), stat.st_mtime_ns, stat.st_size
+
+    def _remember(self, memo_key: Tuple[str, int, int], functions: List[FunctionInfo]) -> None:
+        """
+        解析結果をメモリ上に保持（上限を超えた分は最も古く参照されたものから破棄）
+
+        Args:
+            memo_key: _memo_keyで取得したキー
+            functions: FunctionInfoのリスト
+        """
+        # 呼び出し元がリストを変更してもメモが変わらないようタプルで保持し、参照時に新しいリストを返す
+        self._memo[memo_key] = tuple(functions)
+        self._memo.move_to_end(memo_key)
+        if len(self._memo) > _MEMO_SIZE:
+            self._memo.popitem(last=False)
 
     def _detect_language(self, file_path: Path) -> Optional[str]:
         """
@@ -61,21 +237,28 @@ class ParserFactory:
         Returns:
             言語名（python/rust/go/java/c/cpp）、未対応の場合None
         """
-        suffix = file_path.suffix.lower()
-
-        extension_map = {
-            '.py': 'python',
-            '.rs': 'rust',
-            '.go': 'go',
-            '.java': 'java',
-            '.c': 'c',
-            '.h': 'c',
-            '.cpp': 'cpp',
-            '.cc': 'cpp',
-            '.cxx': 'cpp',
-            '.hpp': 'cpp',
-            '.hh': 'cpp',
-            '.hxx': 'cpp'
-        }
-
-        return extension_map.get(suffix)
+        return _EXTENSION_MAP.get(file_path.suffix.lower())
+
+
+@functools.cache
+def get_factory() -> ParserFactory:
+    """
+    プロセス共有のParserFactoryを取得
+
+    Returns:
+        ParserFactory（初回呼び出し時に生成）
+    """
+    return ParserFactory()
+
+
+def get_parser(file_path: Path) -> Optional[BaseParser]:
+    """
+    プロセス共有のファクトリからファイルパスに対応するパーサーを取得
+
+    Args:
+        file_path: ソースファイルパス
+
+    Returns:
+        対応するパーサー、未対応の場合None
+    """
+    return get_factory().get_parser(file_path)
@@ -4,110 +4,78 @@ Pythonパーサー
 TDDステップ4: Refactor - コードの改善
 """
 
-from pathlib import Path
+import re
 from typing import List
 
-from tree_sitter import Language, Parser, Node
+from tree_sitter import Language, Node, Query
 import tree_sitter_python
 
-from src.parser.base_parser import BaseParser, FunctionInfo
-from src.utils.logger import get_logger
+from src.parser.base_parser import FunctionInfo
+from src.parser.tree_sitter_parser import LangSpec, TreeSitterParser
 
 
-logger = get_logger(__name__)
+# 複雑度に加算する制御構造ノード（boolean_operatorはand/or）
+_CONTROL_TYPES = frozenset({
+    'if_statement',
+    'elif_clause',
+    'for_statement',
+    'while_statement',
+    'except_clause',
+    'case_clause',
+    'boolean_operator',
+    'conditional_expression',
+})
 
+# 関数定義を含み得るか判定する簡易パターン（関数定義は必ずdefで始まる）
+_CANDIDATE_PATTERN = re.compile(rb'\bdef\b')
 
-class PythonParser(BaseParser):
-    """Pythonファイル用パーサー"""
-
-    def __init__(self):
-        """Tree-sitterパーサー初期化"""
-        self.language = Language(tree_sitter_python.language())
-        self.parser = Parser(self.language)
-
-    def get_language(self) -> str:
-        """対応言語名を返す"""
-        return "python"
-
-    def parse_file(self, file_path: Path) -> List[FunctionInfo]:
-        """
-        Pythonファイルを解析
-
-        Args:
-            file_path: 解析対象ファイル
-
-        Returns:
-            FunctionInfoのリスト
-
-        Raises:
-            FileNotFoundError: ファイルが存在しない
-        """
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source_code = f.read()
-        except UnicodeDecodeError as e:
-            logger.warning(f"Encoding error in {file_path}: {e}")
-            return []
-
-        # Tree-sitterでパース
-        tree = self.parser.parse(bytes(source_code, "utf8"))
-
-        if tree.root_node.has_error:
-            logger.warning(f"Syntax error in {file_path}")
-            return []
-
-        # AST走査
-        functions = self._traverse_ast(tree.root_node, source_code, file_path)
-
-        return functions
-
-    def _traverse_ast(self, node: Node, source_code: str, file_path: Path) -> List[FunctionInfo]:
-        """
-        ASTを再帰的に走査
+# 言語定義とクエリはプロセス内で共有する（クエリの構文解析は読み込み時の1回のみ）
+_PY_LANGUAGE = Language(tree_sitter_python.language())
+_FUNCTION_QUERY = Query(_PY_LANGUAGE, "(function_definition) @function")
+_CLASS_QUERY = Query(_PY_LANGUAGE, "(class_definition) @class")
 
-        Args:
-            node: 現在のノード
-            source_code: ソースコード全体
-            file_path: ファイルパス
+# 子ノード取得に使うフィールドID（名前による検索を呼び出しごとに行わないよう事前に解決する）
+_FIELD_NAME = _PY_LANGUAGE.field_id_for_name('name')
+_FIELD_PARAMETERS = _PY_LANGUAGE.field_id_for_name('parameters')
+_FIELD_BODY = _PY_LANGUAGE.field_id_for_name('body')
 
-        Returns:
-            FunctionInfoのリスト
-        """
-        functions = []
 
-        # 関数定義を検出
-        if node.type == 'function_definition':
-            func_info = self._extract_function_info(node, source_code, file_path)
-            if func_info:
-                functions.append(func_info)
-
-        # 子ノードを再帰的に走査
-        for child in node.children:
-            functions.extend(self._traverse_ast(child, source_code, file_path))
-
-        return functions
+class PythonParser(TreeSitterParser):
+    """Pythonファイル用パーサー"""
 
-    def _extract_function_info(self, node: Node, source_code: str, file_path: Path) -> FunctionInfo:
+    spec = LangSpec(
+        name="python",
+        language=_PY_LANGUAGE,
+        function_query=_FUNCTION_QUERY,
+        candidate_pattern=_CANDIDATE_PATTERN,
+        class_query=_CLASS_QUERY,
+    )
+
+    def _extract_function_info(
+        self,
+        node: Node,
+        source_bytes: bytes,
+        file_path: str,
+        class_scopes: tuple[List[int], List[Node]]
+    ) -> FunctionInfo:
         """
         ノードからFunctionInfoを構築
 
         Args:
             node: function_definitionノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
             file_path: ファイルパス
+            class_scopes: クラス範囲のスコープマップ
 
         Returns:
             FunctionInfo
         """
         # 関数名を取得
-        name_node = node.child_by_field_name('name')
-        function_name = self._get_node_text(name_node, source_code) if name_node else "unknown"
+        name_node = node.child_by_field_id(_FIELD_NAME)
+        function_name = self._get_node_text(name_node, source_bytes) if name_node else "unknown"
 
         # コード全体を取得
-        code = self._get_node_text(node, source_code)
+        code = self._get_node_text(node, source_bytes)
 
         # 位置情報
         start_line = node.start_point[0] + 1  # 0-indexedから1-indexedへ
@@ -116,22 +84,21 @@ class PythonParser(BaseParser):
         end_column = node.end_point[1]
 
         # 引数を抽出
-        arguments = self._extract_arguments(node, source_code)
+        arguments = self._extract_arguments(node, source_bytes)
 
         # docstringを抽出
-        docstring = self._extract_docstring(node, source_code)
+        docstring = self._extract_docstring(node, source_bytes)
 
         # スコープ判定（クラス内かグローバルか）
-        scope, function_type = self._determine_scope(node)
+        scope, function_type = self._determine_scope(node, class_scopes)
 
         # メトリクスを計算
-        loc, comment_lines = self._count_lines(code)
-        complexity = self._calculate_complexity(code)
+        loc, comment_lines, complexity = self._compute_metrics(node, source_bytes, _CONTROL_TYPES)
 
         return FunctionInfo(
             name=function_name,
             code=code,
-            file_path=str(file_path),
+            file_path=file_path,
             start_line=start_line,
             end_line=end_line,
             start_column=start_column,
@@ -146,27 +113,27 @@ class PythonParser(BaseParser):
             comment_lines=comment_lines
         )
 
-    def _extract_arguments(self, node: Node, source_code: str) -> List[str]:
+    def _extract_arguments(self, node: Node, source_bytes: bytes) -> List[str]:
         """
         関数の引数を抽出
 
         Args:
             node: function_definitionノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
 
         Returns:
             引数名のリスト
         """
         arguments = []
 
-        parameters_node = node.child_by_field_name('parameters')
+        parameters_node = node.child_by_field_id(_FIELD_PARAMETERS)
         if not parameters_node:
             return arguments
 
         for child in parameters_node.children:
             # identifier（引数名）またはtyped_parameter（型付き引数）
             if child.type == 'identifier':
-                arg_name = self._get_node_text(child, source_code)
+                arg_name = self._get_node_text(child, source_bytes)
                 # selfは除外
                 if arg_name != 'self':
                     arguments.append(arg_name)
@@ -174,33 +141,33 @@ class PythonParser(BaseParser):
                 # 型付き引数の場合、識別子部分を取得
                 for subchild in child.children:
                     if subchild.type == 'identifier':
-                        arg_name = self._get_node_text(subchild, source_code)
+                        arg_name = self._get_node_text(subchild, source_bytes)
                         if arg_name != 'self':
                             arguments.append(arg_name)
                         break
             elif child.type == 'default_parameter':
                 # デフォルト引数の場合
-                name_node = child.child_by_field_name('name')
+                name_node = child.child_by_field_id(_FIELD_NAME)
                 if name_node:
-                    arg_name = self._get_node_text(name_node, source_code)
+                    arg_name = self._get_node_text(name_node, source_bytes)
                     if arg_name != 'self':
                         arguments.append(arg_name)
 
         return arguments
 
-    def _extract_docstring(self, node: Node, source_code: str) -> str:
+    def _extract_docstring(self, node: Node, source_bytes: bytes) -> str:
         """
         docstringを抽出
 
         Args:
             node: function_definitionノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
 
         Returns:
             docstring、または None
         """
         # 関数本体を取得
-        body_node = node.child_by_field_name('body')
+        body_node = node.child_by_field_id(_FIELD_BODY)
         if not body_node:
             return None
 
@@ -210,47 +177,26 @@ class PythonParser(BaseParser):
                 # その中にstringがあればdocstring
                 for subchild in child.children:
                     if subchild.type == 'string':
-                        docstring = self._get_node_text(subchild, source_code)
+                        docstring = self._get_node_text(subchild, source_bytes)
                         # クォートを除去
                         return docstring.strip('"\'').strip()
                 break
 
         return None
 
-    def _determine_scope(self, node: Node) -> tuple[str, str]:
+    def _determine_scope(self, node: Node, class_scopes: tuple[List[int], List[Node]]) -> tuple[str, str]:
         """
         スコープと関数タイプを判定
 
         Args:
             node: function_definitionノード
+            class_scopes: クラス範囲のスコープマップ
 
         Returns:
             (scope, function_type) のタプル
         """
-        # 親ノードを遡ってclass_definitionを探す
-        parent = node.parent
-        while parent:
-            if parent.type == 'class_definition':
-                return "class", "method"
-            parent = parent.parent
+        # class_definitionの範囲内にあればメソッド
+        if self._find_enclosing_scope(class_scopes, node) is not None:
+            return "class", "method"
 
         return "global", "function"
-
-    def _get_node_text(self, node: Node, source_code: str) -> str:
-        """
-        ノードからテキストを抽出
-
-        Args:
-            node: ノード
-            source_code: ソースコード全体
-
-        Returns:
-            ノードのテキスト
-        """
-        if node is None:
-            return ""
-
-        start_byte = node.start_byte
-        end_byte = node.end_byte
-
-        return source_code[start_byte:end_byte]
@@ -4,110 +4,80 @@ Rustパーサー
 TDDステップ2-3: Green - テストを通す実装
 """
 
-from pathlib import Path
+import re
 from typing import List
 
-from tree_sitter import Language, Parser, Node
+from tree_sitter import Language, Node, Query
 import tree_sitter_rust
 
-from src.parser.base_parser import BaseParser, FunctionInfo
-from src.utils.logger import get_logger
+from src.parser.base_parser import FunctionInfo
+from src.parser.tree_sitter_parser import LangSpec, TreeSitterParser
 
 
-logger = get_logger(__name__)
+# 複雑度に加算する制御構造ノード
+_CONTROL_TYPES = frozenset({
+    'if_expression',
+    'for_expression',
+    'while_expression',
+    'match_arm',
+})
 
+# 複雑度に加算する論理演算子
+_LOGICAL_OPERATORS = frozenset({'&&', '||'})
 
-class RustParser(BaseParser):
-    """Rustファイル用パーサー"""
-
-    def __init__(self):
-        """Tree-sitterパーサー初期化"""
-        self.language = Language(tree_sitter_rust.language())
-        self.parser = Parser(self.language)
-
-    def get_language(self) -> str:
-        """対応言語名を返す"""
-        return "rust"
-
-    def parse_file(self, file_path: Path) -> List[FunctionInfo]:
-        """
-        Rustファイルを解析
-
-        Args:
-            file_path: 解析対象ファイル
-
-        Returns:
-            FunctionInfoのリスト
+# コメント行として数えるノード
+_COMMENT_TYPES = frozenset({'line_comment', 'block_comment'})
 
-        Raises:
-            FileNotFoundError: ファイルが存在しない
-        """
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source_code = f.read()
-        except UnicodeDecodeError as e:
-            logger.warning(f"Encoding error in {file_path}: {e}")
-            return []
-
-        # Tree-sitterでパース
-        tree = self.parser.parse(bytes(source_code, "utf8"))
+# 関数定義を含み得るか判定する簡易パターン（関数定義は必ずfnキーワードを含む）
+_CANDIDATE_PATTERN = re.compile(rb'\bfn\b')
 
-        if tree.root_node.has_error:
-            logger.warning(f"Syntax error in {file_path}")
-            return []
+# 言語定義とクエリはプロセス内で共有する（クエリの構文解析は読み込み時の1回のみ）
+_RUST_LANGUAGE = Language(tree_sitter_rust.language())
+_FUNCTION_QUERY = Query(_RUST_LANGUAGE, "(function_item) @function")
+_IMPL_QUERY = Query(_RUST_LANGUAGE, "(impl_item) @class")
 
-        # AST走査
-        functions = self._traverse_ast(tree.root_node, source_code, file_path)
+# 子ノード取得に使うフィールドID（名前による検索を呼び出しごとに行わないよう事前に解決する）
+_FIELD_NAME = _RUST_LANGUAGE.field_id_for_name('name')
+_FIELD_PARAMETERS = _RUST_LANGUAGE.field_id_for_name('parameters')
+_FIELD_PATTERN = _RUST_LANGUAGE.field_id_for_name('pattern')
 
-        return functions
-
-    def _traverse_ast(self, node: Node, source_code: str, file_path: Path) -> List[FunctionInfo]:
-        """
-        ASTを再帰的に走査
 
-        Args:
-            node: 現在のノード
-            source_code: ソースコード全体
-            file_path: ファイルパス
-
-        Returns:
-            FunctionInfoのリスト
-        """
-        functions = []
-
-        # 関数定義を検出
-        if node.type == 'function_item':
-            func_info = self._extract_function_info(node, source_code, file_path)
-            if func_info:
-                functions.append(func_info)
-
-        # 子ノードを再帰的に走査
-        for child in node.children:
-            functions.extend(self._traverse_ast(child, source_code, file_path))
-
-        return functions
+class RustParser(TreeSitterParser):
+    """Rustファイル用パーサー"""
 
-    def _extract_function_info(self, node: Node, source_code: str, file_path: Path) -> FunctionInfo:
+    spec = LangSpec(
+        name="rust",
+        language=_RUST_LANGUAGE,
+        function_query=_FUNCTION_QUERY,
+        candidate_pattern=_CANDIDATE_PATTERN,
+        class_query=_IMPL_QUERY,
+    )
+
+    def _extract_function_info(
+        self,
+        node: Node,
+        source_bytes: bytes,
+        file_path: str,
+        class_scopes: tuple[List[int], List[Node]]
+    ) -> FunctionInfo:
         """
         ノードからFunctionInfoを構築
 
         Args:
             node: function_itemノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
             file_path: ファイルパス
+            class_scopes: impl範囲のスコープマップ
 
         Returns:
             FunctionInfo
         """
         # 関数名を取得
-        name_node = node.child_by_field_name('name')
-        function_name = self._get_node_text(name_node, source_code) if name_node else "unknown"
+        name_node = node.child_by_field_id(_FIELD_NAME)
+        function_name = self._get_node_text(name_node, source_bytes) if name_node else "unknown"
 
         # コード全体を取得
-        code = self._get_node_text(node, source_code)
+        code = self._get_node_text(node, source_bytes)
 
         # 位置情報
         start_line = node.start_point[0] + 1
@@ -116,23 +86,24 @@ class RustParser(BaseParser):
         end_column = node.end_point[1]
 
         # 引数を抽出
-        arguments = self._extract_arguments(node, source_code)
+        arguments = self._extract_arguments(node, source_bytes)
 
         # docコメントを抽出
-        docstring = self._extract_doc_comment(node, source_code)
+        docstring = self._extract_doc_comment(node, source_bytes)
 
         # スコープと修飾子を判定
-        scope, function_type = self._determine_scope(node)
-        modifiers = self._extract_modifiers(node, source_code)
+        scope, function_type = self._determine_scope(node, class_scopes)
+        modifiers = self._extract_modifiers(node, source_bytes)
 
         # メトリクスを計算
-        loc, comment_lines = self._count_lines(code)
-        complexity = self._calculate_complexity(code)
+        loc, comment_lines, complexity = self._compute_metrics(
+            node, source_bytes, _CONTROL_TYPES, _COMMENT_TYPES, _LOGICAL_OPERATORS
+        )
 
         return FunctionInfo(
             name=function_name,
             code=code,
-            file_path=str(file_path),
+            file_path=file_path,
             start_line=start_line,
             end_line=end_line,
             start_column=start_column,
@@ -148,20 +119,20 @@ class RustParser(BaseParser):
             comment_lines=comment_lines
         )
 
-    def _extract_arguments(self, node: Node, source_code: str) -> List[str]:
+    def _extract_arguments(self, node: Node, source_bytes: bytes) -> List[str]:
         """
         関数の引数を抽出
 
         Args:
             node: function_itemノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
 
         Returns:
             引数名のリスト
         """
         arguments = []
 
-        parameters_node = node.child_by_field_name('parameters')
+        parameters_node = node.child_by_field_id(_FIELD_PARAMETERS)
         if not parameters_node:
             return arguments
 
@@ -169,9 +140,9 @@ class RustParser(BaseParser):
             # parameter（通常の引数）
             if child.type == 'parameter':
                 # patternフィールドから引数名を取得
-                pattern_node = child.child_by_field_name('pattern')
+                pattern_node = child.child_by_field_id(_FIELD_PATTERN)
                 if pattern_node:
-                    arg_name = self._get_node_text(pattern_node, source_code)
+                    arg_name = self._get_node_text(pattern_node, source_bytes)
                     # &selfや&mut selfは除外
                     if arg_name not in ['self', '&self', '&mut self']:
                         arguments.append(arg_name)
@@ -179,7 +150,7 @@ class RustParser(BaseParser):
 
         return arguments
 
-    def _extract_doc_comment(self, node: Node, source_code: str) -> str:
+    def _extract_doc_comment(self, node: Node, source_bytes: bytes) -> str:
         """
         docコメントを抽出
 
@@ -188,30 +159,15 @@ class RustParser(BaseParser):
 
         Args:
             node: function_itemノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
 
         Returns:
             docコメント、または None
         """
-        # 親ノードから前のコメントノードを探す
-        parent = node.parent
-        if not parent:
-            return None
-
-        # 関数の直前のコメントを探す
-        node_index = None
-        for i, child in enumerate(parent.children):
-            if child == node:
-                node_index = i
-                break
-
-        if node_index is None or node_index == 0:
-            return None
-
-        # 直前のノードがline_commentかblock_commentかチェック
-        prev_node = parent.children[node_index - 1]
-        if prev_node.type in ['line_comment', 'block_comment']:
-            comment_text = self._get_node_text(prev_node, source_code)
+        # 直前の兄弟ノードがline_commentかblock_commentかチェック
+        prev_node = node.prev_sibling
+        if prev_node is not None and prev_node.type in _COMMENT_TYPES:
+            comment_text = self._get_node_text(prev_node, source_bytes)
             # /// を除去
             if comment_text.startswith('///'):
                 return comment_text[3:].strip()
@@ -220,68 +176,44 @@ class RustParser(BaseParser):
 
         return None
 
-    def _determine_scope(self, node: Node) -> tuple[str, str]:
+    def _determine_scope(self, node: Node, class_scopes: tuple[List[int], List[Node]]) -> tuple[str, str]:
         """
         スコープと関数タイプを判定
 
         Args:
             node: function_itemノード
+            class_scopes: impl範囲のスコープマップ
 
         Returns:
             (scope, function_type) のタプル
         """
-        # 親ノードを遡ってimpl_itemを探す
-        parent = node.parent
-        while parent:
-            if parent.type == 'impl_item':
-                return "impl", "method"
-            parent = parent.parent
+        # impl_itemの範囲内にあればメソッド
+        if self._find_enclosing_scope(class_scopes, node) is not None:
+            return "impl", "method"
 
         return "global", "function"
 
-    def _extract_modifiers(self, node: Node, source_code: str) -> List[str]:
+    def _extract_modifiers(self, node: Node, source_bytes: bytes) -> List[str]:
         """
         修飾子を抽出（pub, async, unsafe等）
 
         Args:
             node: function_itemノード
-            source_code: ソースコード全体
+            source_bytes: ソースコード全体（UTF-8バイト列）
 
         Returns:
             修飾子のリスト
         """
         modifiers = []
 
-        # visibility_modifierフィールドをチェック
-        visibility_node = node.child_by_field_name('visibility_modifier')
-        if visibility_node:
-            modifiers.append('pub')
-
-        # function_modifiersノードをチェック
+        # visibility_modifier（フィールドではなく子ノード）とfunction_modifiersノードをチェック
         for child in node.children:
-            if child.type == 'function_modifiers':
+            if child.type == 'visibility_modifier':
+                modifiers.append('pub')
+            elif child.type == 'function_modifiers':
                 for modifier_child in child.children:
-                    modifier_text = self._get_node_text(modifier_child, source_code)
+                    modifier_text = self._get_node_text(modifier_child, source_bytes)
                     if modifier_text in ['async', 'unsafe', 'const', 'extern']:
                         modifiers.append(modifier_text)
 
         return modifiers
-
-    def _get_node_text(self, node: Node, source_code: str) -> str:
-        """
-        ノードからテキストを抽出
-
-        Args:
-            node: ノード
-            source_code: ソースコード全体
-
-        Returns:
-            ノードのテキスト
-        """
-        if node is None:
-            return ""
-
-        start_byte = node.start_byte
-        end_byte = node.end_byte
-
-        return source_code[start_byte:end_byte]
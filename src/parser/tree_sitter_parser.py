@@ -0,0 +1,234 @@
+"""
+Tree-sitterパーサー共通実装
+
+C/C++/Go/Java/Python/Rustパーサーで共通の読み込み・キャッシュ・パース・関数ノード列挙を
+言語定義（LangSpec）で切り替えて1か所に集約する。
+クエリは各言語モジュールの読み込み時に1回だけコンパイルし、LangSpecで共有する。
+サブクラスは言語固有のFunctionInfo構築のみを実装する
+"""
+
+import re
+import sys
+import threading
+from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from tree_sitter import Language, Parser, Node, Query, QueryCursor
+
+from src.parser.ast_cache import AstCache, content_digest
+from src.parser.base_parser import BaseParser, FunctionInfo
+from src.utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+# Parserはスレッドセーフではないため、スレッドごと・言語ごとに1つを使い回す
+_local = threading.local()
+
+
+def _get_parser(language: Language) -> Parser:
+    """
+    呼び出し元スレッド専用のTree-sitterパーサーを取得
+
+    Args:
+        language: Tree-sitter言語定義
+
+    Returns:
+        Tree-sitterパーサー（言語ごとに初回呼び出し時に生成）
+    """
+    parsers = getattr(_local, 'parsers', None)
+    if parsers is None:
+        parsers = _local.parsers = {}
+
+    parser = parsers.get(language)
+    if parser is None:
+        parser = parsers[language] = Parser(language)
+    return parser
+
+
+@dataclass(frozen=True, slots=True)
+class LangSpec:
+    """言語ごとのパーサー定義"""
+
+    name: str                                   # 言語名（get_language/FunctionInfo.language）
+    language: Language                          # Tree-sitter言語定義
+    function_query: Query                       # 関数ノードを@functionで捕捉するクエリ
+    candidate_pattern: Optional[re.Pattern] = None  # 関数定義を含み得るかの事前判定パターン（Noneは判定しない）
+    class_query: Optional[Query] = None         # クラスノードを@classで捕捉するクエリ（スコープ判定用）
+    function_max_depth: Optional[int] = None    # 関数ノードを探す最大の深さ（Noneは無制限）
+
+
+class TreeSitterParser(BaseParser):
+    """LangSpecで言語を切り替えるTree-sitterパーサー基底クラス"""
+
+    # サブクラスで言語定義を指定する
+    spec: LangSpec
+
+    def __init__(self, cache: Optional[AstCache] = None, strict: bool = False):
+        """
+        Tree-sitterパーサー初期化
+
+        Args:
+            cache: 解析結果キャッシュ（Noneの場合はキャッシュしない）
+            strict: Trueの場合はバイト列での事前判定（candidate_pattern）を行わず、常にパースする
+        """
+        self.cache = cache
+        self.strict = strict
+        self.language = self.spec.language
+
+    @property
+    def parser(self) -> Parser:
+        """呼び出し元スレッド専用のTree-sitterパーサー（インスタンスを複数スレッドで共有しても安全）"""
+        return _get_parser(self.language)
+
+    def get_language(self) -> str:
+        """対応言語名を返す"""
+        return self.spec.name
+
+    def parse_file(self, file_path: Path) -> List[FunctionInfo]:
+        """
+        ソースファイルを解析
+
+        Args:
+            file_path: 解析対象ファイル
+
+        Returns:
+            FunctionInfoのリスト
+
+        Raises:
+            FileNotFoundError: ファイルが存在しない
+        """
+        # デコードせずにバイト列のままTree-sitterへ渡す
+        # （大きなファイルはmmapで開き、読み込みバッファへのコピーを省く）
+        with self._open_source(file_path) as source_bytes:
+            return self._parse_source(source_bytes, file_path)
+
+    def parse_files(self, file_paths: List[Path], max_workers: Optional[int] = None) -> List[FunctionInfo]:
+        """
+        複数ファイルをスレッドプールで並列に解析
+
+        Tree-sitterはパース中にGILを解放し、Parserは呼び出し元スレッドごとに使い分けるため、
+        1つのインスタンスを複数スレッドから使える
+
+        Args:
+            file_paths: 解析対象ファイルのリスト
+            max_workers: ワーカースレッド数（Noneの場合はThreadPoolExecutorの既定値）
+
+        Returns:
+            全ファイルのFunctionInfoのリスト（file_pathsの順序を保持）
+
+        Raises:
+            FileNotFoundError: ファイルが存在しない
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(self.parse_file, file_paths)
+            return [func_info for functions in results for func_info in functions]
+
+    def _parse_source(self, source_bytes: bytes, file_path: Path) -> List[FunctionInfo]:
+        """
+        ソースのバイト列を解析
+
+        Args:
+            source_bytes: ソースコード全体（UTF-8バイト列またはmmap）
+            file_path: ファイルパス
+
+        Returns:
+            FunctionInfoのリスト
+        """
+        # 関数定義を含み得ないファイルはTree-sitterでパースせずに除外する
+        pattern = self.spec.candidate_pattern
+        if not self.strict and pattern is not None and pattern.search(source_bytes) is None:
+            return []
+
+        # 同一ファイルの全FunctionInfoで1つのパス文字列を共有する
+        path_str = sys.intern(str(file_path))
+
+        # 内容が変わっていなければキャッシュ済みの解析結果を返す
+        digest = None
+        if self.cache is not None:
+            digest = content_digest(source_bytes)
+            cached = self.cache.get(path_str, digest)
+            if cached is not None:
+                return cached
+
+        # Tree-sitterでパース
+        tree = self.parser.parse(source_bytes)
+
+        # クラスの範囲を一括取得し、スコープ判定で親ノードを遡らずに済むようにする
+        class_scopes = None
+        if self.spec.class_query is not None:
+            class_captures = QueryCursor(self.spec.class_query).captures(tree.root_node)
+            class_scopes = self._build_scope_map(class_captures.get('class', []))
+
+        # 関数定義ノードをクエリでC側から一括取得
+        # （capturesの並びは出現順とは限らないため開始位置でソート）
+        cursor = QueryCursor(self.spec.function_query)
+        if self.spec.function_max_depth is not None:
+            cursor.set_max_start_depth(self.spec.function_max_depth)
+        captures = cursor.captures(tree.root_node)
+        function_nodes = sorted(captures.get('function', []), key=lambda n: n.start_byte)
+
+        functions = []
+        try:
+            for function_node in function_nodes:
+                # 構文エラーを含む関数のみスキップし、他の関数は抽出を続ける
+                if function_node.has_error:
+                    logger.debug(
+                        "Syntax error in function at %s:%d", file_path, function_node.start_point[0] + 1
+                    )
+                    continue
+
+                func_info = self._extract_function_info(function_node, source_bytes, path_str, class_scopes)
+                if func_info:
+                    functions.append(func_info)
+        except UnicodeDecodeError as e:
+            # デコードはノード単位で行うため、エンコーディング不正はここで検出される
+            logger.warning("Encoding error in %s: %s", file_path, e)
+            return []
+
+        if self.cache is not None:
+            self.cache.put(path_str, digest, functions)
+
+        return functions
+
+    @abstractmethod
+    def _extract_function_info(
+        self,
+        node: Node,
+        source_bytes: bytes,
+        file_path: str,
+        class_scopes: Optional[tuple[List[int], List[Node]]]
+    ) -> FunctionInfo:
+        """
+        ノードからFunctionInfoを構築（言語ごとに実装）
+
+        Args:
+            node: 関数定義ノード
+            source_bytes: ソースコード全体（UTF-8バイト列）
+            file_path: ファイルパス
+            class_scopes: クラス範囲のスコープマップ（class_query未指定の場合None）
+
+        Returns:
+            FunctionInfo
+        """
+        pass
+
+    def _get_node_text(self, node: Node, source_bytes: bytes) -> str:
+        """
+        ノードからテキストを抽出
+
+        Args:
+            node: ノード
+            source_bytes: ソースコード全体（UTF-8バイト列）
+
+        Returns:
+            ノードのテキスト
+        """
+        if node is None:
+            return ""
+
+        # ノード部分のみをデコード
+        return source_bytes[node.start_byte:node.end_byte].decode('utf-8')
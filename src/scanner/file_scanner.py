@@ -4,20 +4,46 @@
 TDDステップ4: Refactor - コードの改善
 """
 
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from types import MappingProxyType
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 import pathspec
 
 
-# 言語別拡張子マッピング
-LANGUAGE_EXTENSIONS = {
-    'python': ['.py'],
-    'rust': ['.rs'],
-    'go': ['.go'],
-    'java': ['.java'],
-    'c': ['.c', '.h'],
-    'cpp': ['.cpp', '.cc', '.cxx', '.hpp', '.hh', '.hxx']
+# 言語別拡張子マッピング（読み取り専用。拡張子の所属判定はfrozensetで定数時間）
+LANGUAGE_EXTENSIONS = MappingProxyType({
+    'python': frozenset({'.py'}),
+    'rust': frozenset({'.rs'}),
+    'go': frozenset({'.go'}),
+    'java': frozenset({'.java'}),
+    'c': frozenset({'.c', '.h'}),
+    'cpp': frozenset({'.cpp', '.cc', '.cxx', '.hpp', '.hh', '.hxx'})
+})
+
+# バイナリ判定のワーカースレッド数（I/O待ちが主なのでCPU数より多く取る）
+_BINARY_CHECK_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# バイナリ判定で読み込む先頭バイト数（NULバイトを含めばバイナリとみなす）
+_BINARY_CHECK_BYTES = 8192
+
+# 走査を省くディレクトリ名の候補（VCS・依存パッケージ・キャッシュ。FileScannerのskip_dirsに指定して使う）
+DEFAULT_SKIP_DIRS = frozenset({'.git', '.hg', '.svn', '__pycache__', 'node_modules', '.venv', 'venv'})
+
+# パス区切り文字が/以外の環境ではPOSIX形式への変換が必要
+_NEED_POSIX = os.sep != '/'
+
+# pathspecが生成する正規表現の名前付きグループ（和集合にすると名前が重複するため非捕捉に置換する）
+_NAMED_GROUP = re.compile(r'\(\?P<\w+>')
+
+# 拡張子から言語名への逆引き表（ファイルごとの線形探索を避ける）
+_SUFFIX_TO_LANGUAGE = {
+    extension: language
+    for language, extensions in LANGUAGE_EXTENSIONS.items()
+    for extension in extensions
 }
 
 
@@ -28,7 +54,9 @@ class FileScanner:
         self,
         source_dir: str,
         languages: Optional[List[str]] = None,
-        ignore_file: Optional[str] = None
+        ignore_file: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        skip_dirs: Iterable[str] = ()
     ):
         """
         初期化
@@ -37,11 +65,16 @@ class FileScanner:
             source_dir: スキャン対象ディレクトリ
             languages: 対象言語リスト（Noneの場合は全言語）
             ignore_file: .ragignoreファイル名（Noneの場合は除外なし）
+            max_workers: バイナリ判定のワーカースレッド数（Noneの場合は_BINARY_CHECK_WORKERS）
+            skip_dirs: 配下を走査しないディレクトリ名（既定では全ディレクトリを走査。DEFAULT_SKIP_DIRS等を指定）
         """
         self.source_dir = Path(source_dir)
         self.languages = languages
         self.ignore_file = ignore_file
+        self.max_workers = max_workers or _BINARY_CHECK_WORKERS
+        self.skip_dirs = frozenset(skip_dirs)
         self.ignore_spec = self._load_ignore_patterns()
+        self._ignore_regex = self._compile_ignore_regex()
 
     def scan(self) -> List[Path]:
         """
@@ -50,40 +83,70 @@ class FileScanner:
         Returns:
             対象ファイルのPathリスト
         """
-        files = []
+        candidates = []
 
-        # source_dirの再帰的走査
-        for file_path in self.source_dir.rglob('*'):
-            # ディレクトリはスキップ
-            if not file_path.is_file():
+        # source_dirの再帰的走査（パスだけで判定できる除外をメインスレッドで先に行う）
+        # DirEntryのまま判定し、残ったファイルだけをPathに変換する
+        for entry, relative_path in self._walk():
+            # 言語判定
+            language = _SUFFIX_TO_LANGUAGE.get(os.path.splitext(entry.name)[1].lower())
+            if language is None:
                 continue
 
-            # 相対パスを取得（.ragignore用）
-            try:
-                relative_path = file_path.relative_to(self.source_dir)
-            except ValueError:
+            # 対象言語フィルタリング
+            if self.languages is not None and language not in self.languages:
                 continue
 
             # .ragignoreパターンマッチング
-            if self._is_ignored(relative_path):
+            if self._match_ignore(relative_path):
                 continue
 
-            # バイナリファイル除外
-            if self._is_binary(file_path):
-                continue
+            candidates.append(Path(entry.path))
 
-            # 言語判定
-            language = self._get_language(file_path)
-            if language is None:
-                continue
+        if not candidates:
+            return []
 
-            # 対象言語フィルタリング
-            if self.languages is not None and language not in self.languages:
-                continue
+        # バイナリファイル除外（ファイル読み込みを伴うためスレッドプールで並列化）
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            is_binary = list(executor.map(self._is_binary, candidates))
+
+        return [path for path, binary in zip(candidates, is_binary) if not binary]
 
-            files.append(file_path)
+    def _walk(self) -> Iterator[Tuple[os.DirEntry, str]]:
+        """
+        source_dir配下のファイルをos.scandirで再帰的に列挙
 
-        return files
+        DirEntryはreaddirの結果を保持しているため、種別判定で追加のstatを発行しない。
+        skip_dirsに含まれるディレクトリと、.ragignoreに一致するディレクトリは配下へ降りない。
+        ただし.ragignoreに否定パターン（!）がある場合は、配下のファイルが再包含され得るため
+        ディレクトリ単位では除外せず、ファイルごとにPathSpecで判定する
+
+        Yields:
+            (ファイルのDirEntry, source_dirからの相対パス（POSIX形式）) のタプル
+        """
+        root = os.fspath(self.source_dir)
+        stack = [(root, '')]
+        while stack:
+            directory, prefix = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        relative_path = prefix + entry.name
+                        # シンボリックリンクのディレクトリは循環を避けるため辿らない
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name in self.skip_dirs:
+                                continue
+                            # 和集合正規表現は否定パターンが無い場合のみ作られるため、
+                            # その場合に限り除外ディレクトリの配下を枝刈りする
+                            directory_path = relative_path + '/'
+                            if self._ignore_regex is not None and self._ignore_regex.match(directory_path):
+                                continue
+                            stack.append((entry.path, directory_path))
+                        elif entry.is_file():
+                            yield entry, relative_path
+            except OSError:
+                # 読み込めないディレクトリはスキップ
+                continue
 
     def _load_ignore_patterns(self) -> Optional[pathspec.PathSpec]:
         """
@@ -105,6 +168,33 @@ class FileScanner:
         # gitignore互換の文法でPathSpecを作成
         return pathspec.PathSpec.from_lines('gitwildmatch', patterns)
 
+    def _compile_ignore_regex(self) -> Optional[re.Pattern]:
+        """
+        除外パターンを1つの正規表現（和集合）にまとめる
+
+        パスごとにパターン数だけ照合を繰り返さず、1回の照合で判定できるようにする
+
+        Returns:
+            コンパイル済み正規表現。除外パターンが無い場合、
+            または否定パターン（!）を含み順序依存の判定が必要な場合はNone
+        """
+        if self.ignore_spec is None:
+            return None
+
+        regexes = []
+        for pattern in self.ignore_spec.patterns:
+            # コメント・空行
+            if pattern.include is None:
+                continue
+            # 否定パターンは後勝ちの評価が必要なため、PathSpecでの判定に任せる
+            if not pattern.include:
+                return None
+            regexes.append(_NAMED_GROUP.sub('(?:', pattern.regex.pattern))
+
+        if not regexes:
+            return None
+        return re.compile('|'.join(f'(?:{regex})' for regex in regexes))
+
     def _is_ignored(self, path: Path) -> bool:
         """
         PathSpecによる除外判定
@@ -115,12 +205,25 @@ class FileScanner:
         Returns:
             True: 除外対象, False: 対象
         """
+        # Pathオブジェクトを文字列に変換（POSIX形式。区切り文字が/の環境ではstrと同一）
+        return self._match_ignore(path.as_posix() if _NEED_POSIX else str(path))
+
+    def _match_ignore(self, path_str: str) -> bool:
+        """
+        POSIX形式の相対パス文字列による除外判定
+
+        Args:
+            path_str: チェック対象パス（POSIX形式の相対パス）
+
+        Returns:
+            True: 除外対象, False: 対象
+        """
+        if self._ignore_regex is not None:
+            return self._ignore_regex.match(path_str) is not None
+
         if self.ignore_spec is None:
             return False
 
-        # Pathオブジェクトを文字列に変換（POSIX形式）
-        path_str = path.as_posix()
-
         return self.ignore_spec.match_file(path_str)
 
     def _is_binary(self, path: Path) -> bool:
@@ -133,14 +236,23 @@ class FileScanner:
         Returns:
             True: バイナリ, False: テキスト
         """
+        # バッファ付きファイルオブジェクトを作らず、先頭ブロックを1回のreadで取得する
         try:
-            with open(path, 'rb') as f:
-                chunk = f.read(8192)
-                return b'\x00' in chunk
-        except Exception:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
             # 読み込めない場合はバイナリ扱い
             return True
 
+        try:
+            chunk = os.read(fd, _BINARY_CHECK_BYTES)
+        except OSError:
+            return True
+        finally:
+            os.close(fd)
+
+        # bytesのin演算子はmemchrで走査される
+        return b'\x00' in chunk
+
     def _get_language(self, path: Path) -> Optional[str]:
         """
         ファイルの言語判定
@@ -151,10 +263,4 @@ class FileScanner:
         Returns:
             言語名（python/rust/go/java/c/cpp）、または None
         """
-        suffix = path.suffix.lower()
-
-        for language, extensions in LANGUAGE_EXTENSIONS.items():
-            if suffix in extensions:
-                return language
-
-        return None
+        return _SUFFIX_TO_LANGUAGE.get(path.suffix.lower())
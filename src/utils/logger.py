@@ -4,8 +4,12 @@
 TDDステップ4: Refactor - コードの改善
 """
 
+import atexit
 import logging
+import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
@@ -14,6 +18,31 @@ from typing import Optional
 LOG_FORMAT = "[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# ログレベル名（大文字）からloggingのレベル値への対応表（設定ファイルで有効なレベル名と一致させる）
+_LOG_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARN": logging.WARN,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+# 出力先ハンドラーへの書き込みを行うリスナーと、ルートロガーに付けたキューハンドラー
+# （ログ呼び出し側はキューへの投入のみ行い、コンソール・ファイルへの書き込みは別スレッドで行う）
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+# フォーマットで使わない属性の収集を省くための設定値（スレッド・プロセス情報、呼び出し元フレームの探索）
+# loggingモジュール全体の設定のため、setup_loggerで変更前の値を保存し、shutdown_loggerで元に戻す
+_DISABLED_RECORD_ATTRIBUTES = {
+    "logThreads": False,
+    "logProcesses": False,
+    "logMultiprocessing": False,
+    "_srcfile": None,
+}
+_saved_record_attributes: Optional[dict] = None
+
 
 def _create_formatter() -> logging.Formatter:
     """ログフォーマッターを作成する"""
@@ -47,6 +76,9 @@ def setup_logger(
     """
     ルートロガーをセットアップする
 
+    ログ呼び出しはキューへの投入のみ行い、出力先への書き込みはQueueListenerのスレッドで行う。
+    書き出しを確定させる場合はshutdown_loggerを呼ぶ
+
     Args:
         level: ログレベル (DEBUG, INFO, WARN, ERROR)
         log_file: ログファイルのパス (オプション)
@@ -54,26 +86,93 @@ def setup_logger(
     Returns:
         設定済みのルートロガー
     """
+    global _listener, _queue_handler, _saved_record_attributes
+
     # ログレベルの変換
-    log_level = getattr(logging, level.upper())
+    log_level = _LOG_LEVELS[level.upper()]
+
+    # 以前の設定のリスナーを停止（キューに残ったログを書き出してから出力先を閉じる）
+    shutdown_logger()
+
+    # フォーマットで使わない属性の収集を省く（変更前の値はshutdown_loggerで戻す）
+    _saved_record_attributes = {name: getattr(logging, name) for name in _DISABLED_RECORD_ATTRIBUTES}
+    for name, value in _DISABLED_RECORD_ATTRIBUTES.items():
+        setattr(logging, name, value)
 
     # ルートロガーを取得
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
 
-    # 既存のハンドラーをクリア（重複を防ぐ）
+    # 既存のハンドラーを閉じてクリア（重複とファイルディスクリプタのリークを防ぐ）
+    for handler in root_logger.handlers:
+        handler.close()
     root_logger.handlers.clear()
 
-    # コンソールハンドラーの追加
-    root_logger.addHandler(_create_console_handler(log_level))
-
-    # ファイルハンドラーの追加（指定された場合）
+    # コンソールハンドラー、ファイルハンドラー（指定された場合）を出力先とする
+    handlers = [_create_console_handler(log_level)]
     if log_file:
-        root_logger.addHandler(_create_file_handler(log_file, log_level))
+        handlers.append(_create_file_handler(log_file, log_level))
+
+    # ルートロガーにはキューハンドラーのみを付け、出力先への書き込みはリスナーのスレッドで行う
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _queue_handler = QueueHandler(log_queue)
+    root_logger.addHandler(_queue_handler)
+    _listener.start()
 
     return root_logger
 
 
+def shutdown_logger() -> None:
+    """
+    setup_loggerで開始したリスナーを停止する
+
+    キューに残ったログを出力先へ書き出してから、出力先のハンドラーを閉じ、
+    ルートロガーからキューハンドラーを外す。setup_loggerで変更したloggingモジュールの
+    設定も元に戻す。未設定の場合は何もしない
+    """
+    global _listener, _queue_handler, _saved_record_attributes
+    if _saved_record_attributes is not None:
+        for name, value in _saved_record_attributes.items():
+            setattr(logging, name, value)
+        _saved_record_attributes = None
+
+    if _listener is None:
+        return
+
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener = None
+    _queue_handler = None
+
+
+def _use_direct_handlers_in_child() -> None:
+    """
+    fork後の子プロセスでは出力先ハンドラーをルートロガーへ直接付け直す
+
+    リスナーのスレッドは子プロセスへ引き継がれず、ワーカープロセスの終了時には
+    atexitも実行されないため、キュー経由のままではログが書き出されない
+    """
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+
+    root_logger = logging.getLogger()
+    root_logger.removeHandler(_queue_handler)
+    for handler in _listener.handlers:
+        root_logger.addHandler(handler)
+    _listener = None
+    _queue_handler = None
+
+
+# プロセス終了時にキューに残ったログを書き出す
+atexit.register(shutdown_logger)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_use_direct_handlers_in_child)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     モジュール別のロガーを取得する
@@ -0,0 +1,14 @@
+"""
+共通正規表現パターン
+
+モジュール読み込み時に一度だけコンパイルし、各モジュールから共有する
+"""
+
+import re
+
+
+# ${VAR_NAME} 形式の環境変数参照
+ENV_VAR = re.compile(r'\$\{([^}]+)\}')
+
+# docコメント各行の先頭の * を除去するパターン
+DOC_LINE = re.compile(r'^\s*\*\s?', re.MULTILINE)
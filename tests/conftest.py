@@ -0,0 +1,205 @@
+"""
+テスト共通フィクスチャ
+
+パーサーはparse_fileの呼び出し間で状態を持たないため、言語ごとに1つをセッション全体で共有する
+"""
+
+from pathlib import Path
+
+import pytest
+
+from src.parser.c_parser import CParser
+from src.parser.cpp_parser import CppParser
+from src.parser.go_parser import GoParser
+from src.parser.java_parser import JavaParser
+from src.parser.python_parser import PythonParser
+from src.parser.rust_parser import RustParser
+
+
+SAMPLE_CODE_DIR = Path(__file__).parent / "fixtures" / "sample_code"
+
+
+@pytest.fixture(scope="session")
+def c_parser():
+    """CParserインスタンス（セッション共有）"""
+    return CParser()
+
+
+@pytest.fixture(scope="session")
+def cpp_parser():
+    """CppParserインスタンス（セッション共有）"""
+    return CppParser()
+
+
+@pytest.fixture(scope="session")
+def go_parser():
+    """GoParserインスタンス（セッション共有）"""
+    return GoParser()
+
+
+@pytest.fixture(scope="session")
+def java_parser():
+    """JavaParserインスタンス（セッション共有）"""
+    return JavaParser()
+
+
+@pytest.fixture(scope="session")
+def python_parser():
+    """PythonParserインスタンス（セッション共有）"""
+    return PythonParser()
+
+
+@pytest.fixture(scope="session")
+def rust_parser():
+    """RustParserインスタンス（セッション共有）"""
+    return RustParser()
+
+
+@pytest.fixture(scope="session")
+def fixtures_dir():
+    """サンプルコードのディレクトリ"""
+    return SAMPLE_CODE_DIR
+
+
+@pytest.fixture(scope="session")
+def sample_c_file():
+    """サンプルCファイル"""
+    return SAMPLE_CODE_DIR / "sample.c"
+
+
+@pytest.fixture(scope="session")
+def with_struct_file():
+    """構造体付きCファイル"""
+    return SAMPLE_CODE_DIR / "with_struct.c"
+
+
+@pytest.fixture(scope="session")
+def sample_cpp_file():
+    """サンプルC++ファイル"""
+    return SAMPLE_CODE_DIR / "sample.cpp"
+
+
+@pytest.fixture(scope="session")
+def with_class_cpp_file():
+    """クラス付きC++ファイル"""
+    return SAMPLE_CODE_DIR / "with_class.cpp"
+
+
+@pytest.fixture(scope="session")
+def sample_go_file():
+    """サンプルGoファイル"""
+    return SAMPLE_CODE_DIR / "sample.go"
+
+
+@pytest.fixture(scope="session")
+def with_methods_file():
+    """メソッド付きGoファイル"""
+    return SAMPLE_CODE_DIR / "with_methods.go"
+
+
+@pytest.fixture(scope="session")
+def sample_java_file():
+    """サンプルJavaファイル"""
+    return SAMPLE_CODE_DIR / "Sample.java"
+
+
+@pytest.fixture(scope="session")
+def with_class_java_file():
+    """クラス付きJavaファイル"""
+    return SAMPLE_CODE_DIR / "WithClass.java"
+
+
+@pytest.fixture(scope="session")
+def sample_c_functions(c_parser, sample_c_file):
+    """sample.cの解析結果（セッション内で1回だけ解析する）"""
+    return c_parser.parse_file(sample_c_file)
+
+
+@pytest.fixture(scope="session")
+def with_struct_functions(c_parser, with_struct_file):
+    """with_struct.cの解析結果（セッション内で1回だけ解析する）"""
+    return c_parser.parse_file(with_struct_file)
+
+
+@pytest.fixture(scope="session")
+def sample_cpp_functions(cpp_parser, sample_cpp_file):
+    """sample.cppの解析結果（セッション内で1回だけ解析する）"""
+    return cpp_parser.parse_file(sample_cpp_file)
+
+
+@pytest.fixture(scope="session")
+def with_class_cpp_functions(cpp_parser, with_class_cpp_file):
+    """with_class.cppの解析結果（セッション内で1回だけ解析する）"""
+    return cpp_parser.parse_file(with_class_cpp_file)
+
+
+@pytest.fixture(scope="session")
+def sample_go_functions(go_parser, sample_go_file):
+    """sample.goの解析結果（セッション内で1回だけ解析する）"""
+    return go_parser.parse_file(sample_go_file)
+
+
+@pytest.fixture(scope="session")
+def with_methods_functions(go_parser, with_methods_file):
+    """with_methods.goの解析結果（セッション内で1回だけ解析する）"""
+    return go_parser.parse_file(with_methods_file)
+
+
+@pytest.fixture(scope="session")
+def sample_java_functions(java_parser, sample_java_file):
+    """Sample.javaの解析結果（セッション内で1回だけ解析する）"""
+    return java_parser.parse_file(sample_java_file)
+
+
+@pytest.fixture(scope="session")
+def with_class_java_functions(java_parser, with_class_java_file):
+    """WithClass.javaの解析結果（セッション内で1回だけ解析する）"""
+    return java_parser.parse_file(with_class_java_file)
+
+
+@pytest.fixture(scope="session")
+def fixture_bytes(fixtures_dir):
+    """サンプルコードの内容（ファイル名をキーに、セッション内で1回だけ読み込む）"""
+    return {p.name: p.read_bytes() for p in fixtures_dir.iterdir() if p.is_file()}
+
+
+@pytest.fixture(scope="session")
+def parsed_python(python_parser, fixtures_dir, fixture_bytes):
+    """サンプルPythonファイルの解析結果（ファイル名をキーに、セッション内で1回だけ解析する）"""
+    return {
+        name: python_parser.parse_bytes(data, fixtures_dir / name)
+        for name, data in fixture_bytes.items() if name.endswith(".py")
+    }
+
+
+@pytest.fixture(scope="session")
+def parsed_rust(rust_parser, fixtures_dir, fixture_bytes):
+    """サンプルRustファイルの解析結果（ファイル名をキーに、セッション内で1回だけ解析する）"""
+    return {
+        name: rust_parser.parse_bytes(data, fixtures_dir / name)
+        for name, data in fixture_bytes.items() if name.endswith(".rs")
+    }
+
+
+@pytest.fixture(scope="session")
+def sample_c_bytes(fixture_bytes, sample_c_file):
+    """sample.cの内容（セッション内で1回だけ読み込む）"""
+    return fixture_bytes[sample_c_file.name]
+
+
+@pytest.fixture(scope="session")
+def sample_cpp_bytes(fixture_bytes, sample_cpp_file):
+    """sample.cppの内容（セッション内で1回だけ読み込む）"""
+    return fixture_bytes[sample_cpp_file.name]
+
+
+@pytest.fixture(scope="session")
+def sample_go_bytes(fixture_bytes, sample_go_file):
+    """sample.goの内容（セッション内で1回だけ読み込む）"""
+    return fixture_bytes[sample_go_file.name]
+
+
+@pytest.fixture(scope="session")
+def sample_java_bytes(fixture_bytes, sample_java_file):
+    """Sample.javaの内容（セッション内で1回だけ読み込む）"""
+    return fixture_bytes[sample_java_file.name]
@@ -0,0 +1,79 @@
+"""
+解析結果キャッシュのテスト
+"""
+
+import pytest
+
+from src.parser.ast_cache import AstCache, content_digest
+from src.parser.base_parser import FunctionInfo
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """一時ディレクトリ上のAstCache"""
+    ast_cache = AstCache(str(tmp_path / "cache" / "ast.sqlite3"))
+    yield ast_cache
+    ast_cache.close()
+
+
+def _make_function(name: str) -> FunctionInfo:
+    return FunctionInfo(
+        name=name,
+        code=f"void {name}() {{}}",
+        file_path="/src/sample.cpp",
+        start_line=1,
+        end_line=1,
+        start_column=0,
+        end_column=16,
+        language="cpp",
+        arguments=["a", "b"]
+    )
+
+
+def test_get_missing_returns_none(cache):
+    """未登録のキーではNoneを返す"""
+    assert cache.get("/src/sample.cpp", content_digest(b"int x;")) is None
+
+
+def test_put_and_get_roundtrip(cache):
+    """登録した解析結果を取得できる"""
+    digest = content_digest(b"void f() {}")
+    functions = [_make_function("f")]
+
+    cache.put("/src/sample.cpp", digest, functions)
+
+    assert cache.get("/src/sample.cpp", digest) == functions
+
+
+def test_empty_result_is_cached(cache):
+    """関数を含まないファイルの結果（空リスト）もキャッシュされる"""
+    digest = content_digest(b"int x;")
+    cache.put("/src/empty.cpp", digest, [])
+
+    assert cache.get("/src/empty.cpp", digest) == []
+
+
+def test_changed_content_misses(cache):
+    """内容が変わると古いエントリは使われない"""
+    old_digest = content_digest(b"void f() {}")
+    new_digest = content_digest(b"void g() {}")
+
+    cache.put("/src/sample.cpp", old_digest, [_make_function("f")])
+    cache.put("/src/sample.cpp", new_digest, [_make_function("g")])
+
+    assert cache.get("/src/sample.cpp", old_digest) is None
+    assert cache.get("/src/sample.cpp", new_digest)[0].name == "g"
+
+
+def test_persists_across_connections(tmp_path):
+    """接続を閉じても内容が保持される"""
+    db_path = str(tmp_path / "ast.sqlite3")
+    digest = content_digest(b"void f() {}")
+
+    first = AstCache(db_path)
+    first.put("/src/sample.cpp", digest, [_make_function("f")])
+    first.close()
+
+    second = AstCache(db_path)
+    assert second.get("/src/sample.cpp", digest)[0].name == "f"
+    second.close()
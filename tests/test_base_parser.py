@@ -4,11 +4,14 @@
 TDDステップ1: Red - 失敗するテストを作成
 """
 
+import dataclasses
+import mmap
+from array import array
 from pathlib import Path
 
 import pytest
 
-from src.parser.base_parser import BaseParser, FunctionInfo
+from src.parser.base_parser import BaseParser, FunctionInfo, FunctionTable
 
 
 class TestFunctionInfo:
@@ -34,6 +37,22 @@ class TestFunctionInfo:
         assert func_info.end_line == 11
         assert func_info.language == "python"
 
+    def test_function_info_is_frozen(self):
+        """FunctionInfoのフィールドは作成後に再代入できないことを確認"""
+        func_info = FunctionInfo(
+            name="test_function",
+            code="def test_function():\n    pass",
+            file_path="/path/to/file.py",
+            start_line=10,
+            end_line=11,
+            start_column=0,
+            end_column=8,
+            language="python"
+        )
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            func_info.name = "renamed"
+
     def test_function_info_with_defaults(self):
         """デフォルト値が正しく設定されることを確認"""
         func_info = FunctionInfo(
@@ -100,6 +119,21 @@ class TestFunctionInfo:
         assert func_info.loc == 2
         assert func_info.comment_lines == 1
 
+    def test_function_info_uses_slots(self):
+        """インスタンスごとの__dict__を持たないことを確認"""
+        func_info = FunctionInfo(
+            name="slim",
+            code="code",
+            file_path="/test.py",
+            start_line=1,
+            end_line=1,
+            start_column=0,
+            end_column=4,
+            language="python"
+        )
+
+        assert not hasattr(func_info, "__dict__")
+
 
 class TestBaseParser:
     """BaseParserクラスのテスト"""
@@ -117,6 +151,9 @@ class TestBaseParser:
             def get_language(self):
                 return "test"
 
+            def _parse_source(self, source_bytes, file_path):
+                return []
+
         with pytest.raises(TypeError):
             IncompleteParser()
 
@@ -127,25 +164,27 @@ class TestBaseParser:
             def parse_file(self, file_path):
                 return []
 
+            def _parse_source(self, source_bytes, file_path):
+                return []
+
         with pytest.raises(TypeError):
             IncompleteParser()
 
-    def test_concrete_parser_can_be_instantiated(self):
-        """抽象メソッドを実装したサブクラスはインスタンス化できることを確認"""
-        class ConcreteParser(BaseParser):
+    def test_base_parser_parse_source_is_abstract(self):
+        """_parse_sourceが抽象メソッドであることを確認"""
+        # バイト列からの解析を実装していないサブクラスはインスタンス化できない
+        class IncompleteParser(BaseParser):
             def parse_file(self, file_path):
                 return []
 
             def get_language(self):
                 return "test"
 
-        # 全ての抽象メソッドを実装していればインスタンス化できる
-        parser = ConcreteParser()
-        assert parser.get_language() == "test"
-        assert parser.parse_file(Path("/test.py")) == []
+        with pytest.raises(TypeError):
+            IncompleteParser()
 
-    def test_count_lines_utility(self):
-        """_count_linesユーティリティメソッドが正しく動作することを確認"""
+    def test_concrete_parser_can_be_instantiated(self):
+        """抽象メソッドを実装したサブクラスはインスタンス化できることを確認"""
         class ConcreteParser(BaseParser):
             def parse_file(self, file_path):
                 return []
@@ -153,24 +192,16 @@ class TestBaseParser:
             def get_language(self):
                 return "test"
 
-        parser = ConcreteParser()
-
-        code = """def hello():
-    # This is a comment
-    print("Hello")
-
-    # Another comment
-    return True
-"""
-        loc, comment_lines = parser._count_lines(code)
+            def _parse_source(self, source_bytes, file_path):
+                return []
 
-        # 実効行数: 3行 (def, print, return)
-        # コメント行数: 2行
-        assert loc == 3
-        assert comment_lines == 2
+        # 全ての抽象メソッドを実装していればインスタンス化できる
+        parser = ConcreteParser()
+        assert parser.get_language() == "test"
+        assert parser.parse_file(Path("/test.py")) == []
 
-    def test_calculate_complexity_utility(self):
-        """_calculate_complexityユーティリティメソッドが正しく動作することを確認"""
+    def test_open_source(self, tmp_path, mocker):
+        """小さなファイルはbytes、閾値以上のファイルはmmapで開くことを確認"""
         class ConcreteParser(BaseParser):
             def parse_file(self, file_path):
                 return []
@@ -178,24 +209,64 @@ class TestBaseParser:
             def get_language(self):
                 return "test"
 
-        parser = ConcreteParser()
-
-        # 分岐なし: 複雑度 1
-        simple_code = "def simple():\n    return 1"
-        assert parser._calculate_complexity(simple_code) == 1
-
-        # if文1つ: 複雑度 2
-        code_with_if = """def test():
-    if x > 0:
-        return True
-    return False
-"""
-        assert parser._calculate_complexity(code_with_if) == 2
+            def _parse_source(self, source_bytes, file_path):
+                return []
 
-        # if + for: 複雑度 3
-        complex_code = """def complex():
-    if x > 0:
-        for i in range(10):
-            print(i)
-"""
-        assert parser._calculate_complexity(complex_code) == 3
+        parser = ConcreteParser()
+        source_file = tmp_path / "source.c"
+        source_file.write_bytes(b"int main(void) { return 0; }\n")
+
+        with parser._open_source(source_file) as source:
+            assert source == b"int main(void) { return 0; }\n"
+
+        mocker.patch("src.parser.base_parser._MMAP_THRESHOLD", 0)
+        with parser._open_source(source_file) as source:
+            assert isinstance(source, mmap.mmap)
+            assert source[:3] == b"int"
+        assert source.closed
+
+        with pytest.raises(FileNotFoundError):
+            with parser._open_source(tmp_path / "missing.c"):
+                pass
+
+
+class TestFunctionTable:
+    """FunctionTableクラスのテスト"""
+
+    def test_round_trip(self):
+        """追加したFunctionInfoを行として復元できることを確認"""
+        functions = [
+            FunctionInfo(
+                name="add", code="int add(int a, int b) { return a + b; }",
+                file_path="/src/math.c", start_line=1, end_line=1,
+                start_column=0, end_column=40, language="c",
+                arguments=["a", "b"], complexity=1, loc=1
+            ),
+            FunctionInfo(
+                name="sub", code="int sub(int a, int b) { return a - b; }",
+                file_path="/src/math.c", start_line=3, end_line=3,
+                start_column=0, end_column=40, language="c"
+            ),
+        ]
+        table = FunctionTable.from_functions(functions)
+
+        assert len(table) == 2
+        assert table[0] == functions[0]
+        assert table[1].complexity is None
+        assert list(table) == functions
+
+    def test_columns(self):
+        """整数フィールドは型付き配列の列として集計できることを確認"""
+        table = FunctionTable()
+        for i in range(3):
+            table.append(FunctionInfo(
+                name=f"f{i}", code="", file_path="/a.py",
+                start_line=i * 10 + 1, end_line=i * 10 + 5,
+                start_column=0, end_column=0, language="python", loc=i
+            ))
+
+        assert isinstance(table.column("start_line"), array)
+        assert sum(table.column("loc")) == 3
+        assert table.column("name") == ["f0", "f1", "f2"]
+        with pytest.raises(KeyError):
+            table.column("unknown")
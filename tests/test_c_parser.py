@@ -7,46 +7,16 @@ TDDステップ2-3: Red - テストを先に書く
 import pytest
 from pathlib import Path
 
+from src.parser.ast_cache import AstCache
 from src.parser.c_parser import CParser
 
 
-@pytest.fixture
-def parser():
-    """CParserインスタンス"""
-    return CParser()
-
-
-@pytest.fixture
-def sample_c_file():
-    """サンプルCファイル"""
-    return Path("tests/fixtures/sample_code/sample.c")
-
-
-@pytest.fixture
-def with_struct_file():
-    """構造体付きCファイル"""
-    return Path("tests/fixtures/sample_code/with_struct.c")
-
-
-@pytest.fixture
-def syntax_error_file():
-    """構文エラーのあるCファイル"""
-    return Path("tests/fixtures/sample_code/c_syntax_error.c")
-
-
-def test_get_language(parser):
-    """言語名の取得"""
-    assert parser.get_language() == "c"
-
-
-def test_parse_simple_functions(parser, sample_c_file):
+def test_parse_simple_functions(sample_c_functions):
     """シンプルな関数の解析"""
-    functions = parser.parse_file(sample_c_file)
-
-    assert len(functions) == 3
+    assert len(sample_c_functions) == 3
 
     # greet関数
-    greet = functions[0]
+    greet = sample_c_functions[0]
     assert greet.name == "greet"
     assert greet.language == "c"
     assert greet.function_type == "function"
@@ -55,106 +25,167 @@ def test_parse_simple_functions(parser, sample_c_file):
     assert "greet" in greet.code
 
     # add関数
-    add = functions[1]
+    add = sample_c_functions[1]
     assert add.name == "add"
     assert add.function_type == "function"
 
 
-def test_extract_arguments(parser, sample_c_file):
+def test_extract_arguments(sample_c_functions):
     """引数の抽出"""
-    functions = parser.parse_file(sample_c_file)
-
-    greet = functions[0]
+    greet = sample_c_functions[0]
     assert greet.arguments == ["name"]
 
-    add = functions[1]
+    add = sample_c_functions[1]
     assert add.arguments == ["a", "b"]
 
-    no_args = functions[2]
+    no_args = sample_c_functions[2]
     assert no_args.arguments == []
 
 
-def test_extract_doc_comment(parser, sample_c_file):
+def test_extract_doc_comment(sample_c_functions):
     """docコメントの抽出"""
-    functions = parser.parse_file(sample_c_file)
-
-    greet = functions[0]
+    greet = sample_c_functions[0]
     assert greet.docstring is not None
     assert "Greet a person" in greet.docstring
 
-    add = functions[1]
+    add = sample_c_functions[1]
     assert add.docstring is not None
     assert "Add two numbers" in add.docstring
 
-    no_args = functions[2]
+    no_args = sample_c_functions[2]
     assert no_args.docstring is None
 
 
-def test_parse_struct_functions(parser, with_struct_file):
+def test_parse_struct_functions(with_struct_functions):
     """構造体関連関数の解析"""
-    functions = parser.parse_file(with_struct_file)
-
     # create_calculator, calculator_add, multiply, reset
-    assert len(functions) == 4
+    assert len(with_struct_functions) == 4
 
-    create = functions[0]
+    create = with_struct_functions[0]
     assert create.name == "create_calculator"
     assert create.function_type == "function"
 
-    calc_add = functions[1]
+    calc_add = with_struct_functions[1]
     assert calc_add.name == "calculator_add"
     assert calc_add.arguments == ["calc", "x", "y"]
 
 
-def test_extract_modifiers(parser, with_struct_file):
+def test_extract_modifiers(with_struct_functions):
     """修飾子の抽出"""
-    functions = parser.parse_file(with_struct_file)
-
     # static関数
-    multiply = functions[2]
+    multiply = with_struct_functions[2]
     assert multiply.name == "multiply"
     assert "static" in multiply.modifiers
 
 
-def test_syntax_error_handling(parser, syntax_error_file):
-    """構文エラーのハンドリング"""
-    functions = parser.parse_file(syntax_error_file)
-    assert functions == []
-
-
-def test_file_not_found(parser):
-    """存在しないファイル"""
-    with pytest.raises(FileNotFoundError):
-        parser.parse_file(Path("nonexistent.c"))
-
-
-def test_position_info(parser, sample_c_file):
-    """位置情報の抽出"""
-    functions = parser.parse_file(sample_c_file)
-
-    greet = functions[0]
+def test_function_attributes(sample_c_functions, with_struct_file, with_struct_functions):
+    """位置情報・メトリクス・メタデータの抽出"""
+    # 位置情報
+    greet = sample_c_functions[0]
     assert greet.start_line > 0
     assert greet.end_line > greet.start_line
     assert greet.start_column >= 0
     assert greet.end_column >= 0
 
-
-def test_metrics(parser, with_struct_file):
-    """メトリクスの計算"""
-    functions = parser.parse_file(with_struct_file)
-
-    calc_add = functions[1]
+    # メトリクス
+    calc_add = with_struct_functions[1]
     assert calc_add.loc > 0
     assert calc_add.complexity is not None
     assert calc_add.complexity >= 1
 
-
-def test_metadata_extraction(parser, with_struct_file):
-    """メタデータの抽出"""
-    functions = parser.parse_file(with_struct_file)
-
-    calc_add = functions[1]
+    # メタデータ
     assert calc_add.file_path == str(with_struct_file)
     assert calc_add.language == "c"
     assert isinstance(calc_add.code, str)
     assert len(calc_add.code) > 0
+
+
+def test_metrics_from_ast(c_parser):
+    """ASTから算出したメトリクス"""
+    functions = c_parser.parse_string(
+        "int classify(int x, int y) {\n"
+        "    // 分岐の例\n"
+        "    if (x > 0 && y > 0) {\n"
+        "        return 1;\n"
+        "    }\n"
+        "    return x < 0 ? -1 : 0;\n"
+        "}\n"
+    )
+
+    classify = functions[0]
+    # if + && + 三項演算子
+    assert classify.complexity == 4
+    assert classify.comment_lines == 1
+    assert classify.loc == 6
+
+
+def test_non_ascii_source(c_parser):
+    """非ASCII文字を含むファイルでもバイトオフセットで正しく抽出できる"""
+    functions = c_parser.parse_string(
+        "/** 二つの数を加算する */\n"
+        "int add(int a, int b) {\n"
+        "    return a + b;\n"
+        "}\n"
+    )
+
+    add = functions[0]
+    assert add.name == "add"
+    assert add.arguments == ["a", "b"]
+    assert add.docstring == "二つの数を加算する"
+    assert add.code.startswith("int add")
+
+
+def test_encoding_error_handling(c_parser):
+    """UTF-8として不正なバイト列を含むファイル"""
+    functions = c_parser.parse_bytes(b'const char *greet(void) {\n    return "caf\xe9";\n}\n', Path("latin1.c"))
+    assert functions == []
+
+
+def test_parse_files_parallel(c_parser, sample_c_file, with_struct_file):
+    """複数ファイルの並列解析"""
+    functions = c_parser.parse_files([sample_c_file, with_struct_file], max_workers=2)
+
+    # ファイル順・出現順が保持される
+    assert [f.name for f in functions] == [
+        f.name for f in c_parser.parse_file(sample_c_file) + c_parser.parse_file(with_struct_file)
+    ]
+    assert len(functions) == 7
+
+
+def test_prefetch_and_parse(c_parser, sample_c_file, with_struct_file):
+    """先読みしながらの解析でも逐次解析と同じ結果・順序になる"""
+    paths = [sample_c_file, with_struct_file, sample_c_file]
+    functions = c_parser.prefetch_and_parse(paths, max_workers=2, prefetch=1)
+
+    assert functions == [f for path in paths for f in c_parser.parse_file(path)]
+
+    with pytest.raises(FileNotFoundError):
+        c_parser.prefetch_and_parse([sample_c_file, Path("nonexistent.c")])
+
+
+def test_partial_syntax_error(c_parser):
+    """構文エラーを含む関数のみスキップされる"""
+    functions = c_parser.parse_string(
+        "int good(int a) {\n"
+        "    return a;\n"
+        "}\n"
+        "\n"
+        "int bad(int a) {\n"
+        "    return a +;\n"
+        "}\n"
+    )
+
+    assert [f.name for f in functions] == ["good"]
+
+
+def test_parse_file_uses_cache(tmp_path, mocker, sample_c_file):
+    """内容が同じファイルはTree-sitterで再解析しない"""
+    cache = AstCache(str(tmp_path / "ast.sqlite3"))
+    cached_parser = CParser(cache=cache)
+    expected = cached_parser.parse_file(sample_c_file)
+
+    parser_property = mocker.patch.object(CParser, "parser", new_callable=mocker.PropertyMock)
+
+    assert cached_parser.parse_file(sample_c_file) == expected
+    parser_property.return_value.parse.assert_not_called()
+    cache.close()
@@ -4,10 +4,13 @@
 TDDステップ1: Red - 失敗するテストを作成
 """
 
+import dataclasses
+import itertools
 import os
 from pathlib import Path
 
 import pytest
+import yaml
 
 from src.config.config_loader import (
     Config,
@@ -20,12 +23,59 @@ from src.config.config_loader import (
 )
 
 
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture(scope="session")
+def config_dir(tmp_path_factory):
+    """
+    設定ファイルの作業ディレクトリ（セッション共有）
+
+    source_dir用の空ディレクトリ src/ を含む。
+    YAMLのパース結果はパスをキーにキャッシュされるため、各テストは固有のファイル名で書き込む
+    """
+    base = tmp_path_factory.mktemp("cfg")
+    (base / "src").mkdir()
+    return base
+
+
+@pytest.fixture(scope="session")
+def make_config_yaml(config_dir):
+    """最小構成の設定ファイルを作成する関数を返す（ファイル名は呼び出しごとに変える）"""
+    source_dir = config_dir / "src"
+    counter = itertools.count()
+
+    def build(source_dir=source_dir, url="http://localhost:6333", log_level=None):
+        config_file = config_dir / f"config_{next(counter)}.yaml"
+        content = f"""
+input:
+  source_dir: "{source_dir}"
+
+qdrant:
+  url: "{url}"
+
+embedding:
+  model_name: "jinaai/jina-embeddings-v2-base-code"
+  dimension: 768
+  max_length: 8192
+"""
+        if log_level is not None:
+            content += f"""
+logging:
+  level: "{log_level}"
+"""
+        config_file.write_text(content)
+        return config_file
+
+    return build
+
+
 class TestLoadConfig:
     """load_config関数のテスト"""
 
     def test_load_valid_config(self):
         """正常な設定ファイルを読み込めることを確認"""
-        config_path = Path(__file__).parent / "fixtures" / "valid_config.yaml"
+        config_path = FIXTURES_DIR / "valid_config.yaml"
         config = load_config(str(config_path))
 
         assert isinstance(config, Config)
@@ -49,15 +99,40 @@ class TestLoadConfig:
         # 環境変数を設定
         monkeypatch.setenv("QDRANT_API_KEY", "test-api-key-12345")
 
-        config_path = Path(__file__).parent / "fixtures" / "valid_config.yaml"
+        config_path = FIXTURES_DIR / "valid_config.yaml"
         config = load_config(str(config_path))
 
         # 環境変数が展開されているか確認
         assert config.qdrant.api_key == "test-api-key-12345"
 
+    def test_expand_env_vars_in_list(self, config_dir, monkeypatch):
+        """リスト内の文字列でも環境変数が展開されることを確認"""
+        monkeypatch.setenv("EXTRA_LANGUAGE", "java")
+        config_file = config_dir / "list_env.yaml"
+        config_file.write_text(f"""
+input:
+  source_dir: "{config_dir / 'src'}"
+
+qdrant:
+  url: "http://localhost:6333"
+
+embedding:
+  model_name: "jinaai/jina-embeddings-v2-base-code"
+  dimension: 768
+  max_length: 8192
+
+processing:
+  languages:
+    - python
+    - "${{EXTRA_LANGUAGE}}"
+""")
+        config = load_config(str(config_file))
+
+        assert config.processing.languages == ["python", "java"]
+
     def test_default_values(self):
         """デフォルト値が適用されることを確認"""
-        config_path = Path(__file__).parent / "fixtures" / "minimal_config.yaml"
+        config_path = FIXTURES_DIR / "minimal_config.yaml"
         config = load_config(str(config_path))
 
         # デフォルト値の確認
@@ -71,83 +146,104 @@ class TestLoadConfig:
 
     def test_collection_name_defaults_to_dirname(self):
         """collection_name未指定時にディレクトリ名が使われることを確認"""
-        config_path = Path(__file__).parent / "fixtures" / "minimal_config.yaml"
+        config_path = FIXTURES_DIR / "minimal_config.yaml"
         config = load_config(str(config_path))
 
         # この時点ではNone（実際のディレクトリ名への変換は別処理で行う）
         assert config.qdrant.collection_name is None
 
-    def test_validate_invalid_source_dir(self, tmp_path):
+    def test_validate_invalid_source_dir(self, make_config_yaml):
         """存在しないsource_dirで例外が発生することを確認"""
         # 存在しないディレクトリを指定した設定ファイルを作成
-        invalid_config = tmp_path / "invalid_source.yaml"
-        invalid_config.write_text("""
-input:
-  source_dir: "/nonexistent/directory/path"
-
-qdrant:
-  url: "http://localhost:6333"
-
-embedding:
-  model_name: "jinaai/jina-embeddings-v2-base-code"
-  dimension: 768
-  max_length: 8192
-""")
+        invalid_config = make_config_yaml(source_dir="/nonexistent/directory/path")
 
         with pytest.raises(ValueError, match="source_dir does not exist"):
             load_config(str(invalid_config))
 
-    def test_validate_invalid_url(self, tmp_path):
+    def test_validate_invalid_url(self, make_config_yaml):
         """不正なURL形式で例外が発生することを確認"""
-        invalid_config = tmp_path / "invalid_url.yaml"
-        # 一時的なディレクトリを作成
-        test_dir = tmp_path / "test_source"
-        test_dir.mkdir()
+        invalid_config = make_config_yaml(url="invalid-url-format")
+
+        with pytest.raises(ValueError, match="Invalid URL format"):
+            load_config(str(invalid_config))
+
+    def test_validate_invalid_log_level(self, make_config_yaml):
+        """不正なログレベルで例外が発生することを確認"""
+        invalid_config = make_config_yaml(log_level="INVALID_LEVEL")
+
+        with pytest.raises(ValueError, match="Invalid log level"):
+            load_config(str(invalid_config))
+
+    def test_yaml_parse_is_cached(self, make_config_yaml, mocker):
+        """同一ファイルの再読み込みではYAMLを再パースしないことを確認"""
+        config_file = make_config_yaml()
+        spy = mocker.spy(yaml, "load")
+
+        first = load_config(str(config_file))
+        second = load_config(str(config_file))
+
+        assert spy.call_count == 1
+        assert first == second
+        # 呼び出し元ごとに独立したオブジェクトを返す
+        assert first is not second
+
+    @pytest.mark.skipif(not yaml.__with_libyaml__, reason="libyaml未対応のPyYAML")
+    def test_uses_c_loader(self, make_config_yaml, mocker):
+        """libyamlが利用できる場合はCSafeLoaderでパースすることを確認"""
+        config_file = make_config_yaml()
+        spy = mocker.spy(yaml, "load")
+
+        load_config(str(config_file))
+
+        assert spy.call_args.kwargs["Loader"] is yaml.CSafeLoader
 
-        invalid_config.write_text(f"""
+    def test_cache_invalidated_on_change(self, config_dir):
+        """ファイル更新後は新しい内容が読み込まれることを確認"""
+        config_file = config_dir / "changing.yaml"
+        template = """
 input:
-  source_dir: "{test_dir}"
+  source_dir: "{source_dir}"
 
 qdrant:
-  url: "invalid-url-format"
+  url: "http://localhost:6333"
+  collection_name: "{collection}"
 
 embedding:
   model_name: "jinaai/jina-embeddings-v2-base-code"
   dimension: 768
   max_length: 8192
-""")
-
-        with pytest.raises(ValueError, match="Invalid URL format"):
-            load_config(str(invalid_config))
+"""
+        config_file.write_text(template.format(source_dir=config_dir / "src", collection="before"))
+        assert load_config(str(config_file)).qdrant.collection_name == "before"
 
-    def test_validate_invalid_log_level(self, tmp_path):
-        """不正なログレベルで例外が発生することを確認"""
-        invalid_config = tmp_path / "invalid_log_level.yaml"
-        test_dir = tmp_path / "test_source"
-        test_dir.mkdir()
+        config_file.write_text(template.format(source_dir=config_dir / "src", collection="after-update"))
+        assert load_config(str(config_file)).qdrant.collection_name == "after-update"
 
-        invalid_config.write_text(f"""
+    def test_non_ascii_values(self, config_dir):
+        """UTF-8の非ASCII文字を含む設定値を正しく読み込めることを確認"""
+        config_file = config_dir / "non_ascii.yaml"
+        config_file.write_text(
+            f"""
 input:
-  source_dir: "{test_dir}"
+  source_dir: "{config_dir / 'src'}"
 
 qdrant:
   url: "http://localhost:6333"
+  collection_name: "関数コレクション"
 
 embedding:
   model_name: "jinaai/jina-embeddings-v2-base-code"
   dimension: 768
   max_length: 8192
+""",
+            encoding="utf-8"
+        )
 
-logging:
-  level: "INVALID_LEVEL"
-""")
-
-        with pytest.raises(ValueError, match="Invalid log level"):
-            load_config(str(invalid_config))
+        assert load_config(str(config_file)).qdrant.collection_name == "関数コレクション"
 
     def test_validate_missing_required_fields(self):
         """必須フィールドが欠けている場合に例外が発生することを確認"""
-        config_path = Path(__file__).parent / "fixtures" / "invalid_config.yaml"
+        config_path = FIXTURES_DIR / "invalid_config.yaml"
 
         with pytest.raises((KeyError, ValueError)):
             load_config(str(config_path))
@@ -156,54 +252,18 @@ logging:
 class TestConfigDataClasses:
     """設定データクラスのテスト"""
 
-    def test_input_config_creation(self):
-        """InputConfigが作成できることを確認"""
-        input_config = InputConfig(
-            source_dir="/tmp/test",
-            ignore_file=".ragignore"
-        )
-        assert input_config.source_dir == "/tmp/test"
-        assert input_config.ignore_file == ".ragignore"
-
-    def test_qdrant_config_creation(self):
-        """QdrantConfigが作成できることを確認"""
-        qdrant_config = QdrantConfig(
-            url="http://localhost:6333",
-            api_key="test-key",
-            collection_name="test-collection"
-        )
-        assert qdrant_config.url == "http://localhost:6333"
-        assert qdrant_config.api_key == "test-key"
-        assert qdrant_config.collection_name == "test-collection"
-
-    def test_embedding_config_creation(self):
-        """EmbeddingConfigが作成できることを確認"""
-        embedding_config = EmbeddingConfig(
-            model_name="test-model",
-            dimension=768,
-            max_length=8192,
-            batch_size=8
-        )
-        assert embedding_config.model_name == "test-model"
-        assert embedding_config.dimension == 768
-
-    def test_processing_config_creation(self):
-        """ProcessingConfigが作成できることを確認"""
-        processing_config = ProcessingConfig(
-            parallel_workers=4,
-            languages=["python", "rust"]
-        )
-        assert processing_config.parallel_workers == 4
-        assert processing_config.languages == ["python", "rust"]
-
-    def test_logging_config_creation(self):
-        """LoggingConfigが作成できることを確認"""
-        logging_config = LoggingConfig(
-            level="DEBUG",
-            file="test.log"
-        )
-        assert logging_config.level == "DEBUG"
-        assert logging_config.file == "test.log"
+    @pytest.mark.parametrize("cls,kwargs", [
+        (InputConfig, dict(source_dir="/tmp/test", ignore_file=".ragignore")),
+        (QdrantConfig, dict(url="http://localhost:6333", api_key="test-key", collection_name="test-collection")),
+        (EmbeddingConfig, dict(model_name="test-model", dimension=768, max_length=8192, batch_size=8)),
+        (ProcessingConfig, dict(parallel_workers=4, languages=["python", "rust"])),
+        (LoggingConfig, dict(level="DEBUG", file="test.log")),
+    ])
+    def test_dataclass_creation(self, cls, kwargs):
+        """各設定データクラスが指定値で作成できることを確認"""
+        obj = cls(**kwargs)
+        for name, value in kwargs.items():
+            assert getattr(obj, name) == value
 
     def test_config_creation(self):
         """Configが作成できることを確認"""
@@ -218,6 +278,6 @@ class TestConfigDataClasses:
             processing=ProcessingConfig(),
             logging=LoggingConfig()
         )
-        assert isinstance(config.input, InputConfig)
-        assert isinstance(config.qdrant, QdrantConfig)
-        assert isinstance(config.embedding, EmbeddingConfig)
+        assert [type(getattr(config, f.name)) for f in dataclasses.fields(config)] == [
+            InputConfig, QdrantConfig, EmbeddingConfig, ProcessingConfig, LoggingConfig
+        ]
@@ -8,7 +8,10 @@ from pathlib import Path
 
 import pytest
 
-from src.scanner.file_scanner import FileScanner, LANGUAGE_EXTENSIONS
+from src.scanner.file_scanner import DEFAULT_SKIP_DIRS, FileScanner, LANGUAGE_EXTENSIONS
+
+
+SAMPLE_PROJECT_DIR = Path(__file__).parent / "fixtures" / "sample_project"
 
 
 class TestFileScanner:
@@ -17,7 +20,7 @@ class TestFileScanner:
     @pytest.fixture
     def sample_project_dir(self):
         """サンプルプロジェクトディレクトリを返す"""
-        return Path(__file__).parent / "fixtures" / "sample_project"
+        return SAMPLE_PROJECT_DIR
 
     def test_scan_finds_python_files(self, sample_project_dir):
         """Pythonファイルを発見することを確認"""
@@ -87,6 +90,19 @@ class TestFileScanner:
         assert scanner._is_binary(binary_file) is True
         assert scanner._is_binary(text_file) is False
 
+    def test_is_binary_reads_leading_block_only(self, tmp_path):
+        """先頭ブロックのNULバイトで判定し、読めないファイルはバイナリ扱いすることを確認"""
+        scanner = FileScanner(source_dir=str(tmp_path), languages=None, ignore_file=None)
+
+        late_nul = tmp_path / "late.py"
+        late_nul.write_bytes(b"x = 1\n" * 4096 + b"\x00")
+        empty = tmp_path / "empty.py"
+        empty.write_bytes(b"")
+
+        assert scanner._is_binary(late_nul) is False
+        assert scanner._is_binary(empty) is False
+        assert scanner._is_binary(tmp_path / "missing.py") is True
+
     def test_get_language_returns_correct_language(self):
         """言語判定が正しいことを確認"""
         scanner = FileScanner(
@@ -133,6 +149,43 @@ class TestFileScanner:
         # 通常のファイルは含まれる
         assert scanner._is_ignored(Path("src/main.py")) is False
 
+    def test_ignore_regex_matches_pathspec(self, sample_project_dir, tmp_path):
+        """除外パターンの和集合正規表現がPathSpecと同じ判定をすることを確認"""
+        scanner = FileScanner(
+            source_dir=str(sample_project_dir),
+            languages=None,
+            ignore_file=".ragignore"
+        )
+        assert scanner._ignore_regex is not None
+
+        paths = ["build/", "src/build/", "src/main.py", "src/a.pyc", "x/test_a.py", "a_test.py", "buildx/a.py"]
+        for path in paths:
+            assert scanner._match_ignore(path) == scanner.ignore_spec.match_file(path), path
+
+        # 否定パターンを含む場合はPathSpecでの判定にフォールバック
+        (tmp_path / ".ragignore").write_text("*.py\n!keep.py\n")
+        scanner = FileScanner(source_dir=str(tmp_path), languages=None, ignore_file=".ragignore")
+        assert scanner._ignore_regex is None
+        assert scanner._is_ignored(Path("drop.py")) is True
+        assert scanner._is_ignored(Path("keep.py")) is False
+
+    def test_scan_with_negated_pattern_matches_pathspec(self, tmp_path):
+        """否定パターンで再び含めたファイルがスキャン結果に含まれ、PathSpecでの判定と一致することを確認"""
+        for relative in ("a.py", "drop_test.py", "keep_test.py", "pkg/b.py", "pkg/c_test.py", "pkg/keep_test.py"):
+            (tmp_path / relative).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / relative).write_text("x = 1\n")
+        (tmp_path / ".ragignore").write_text("*_test.py\n!keep_test.py\n")
+
+        scanner = FileScanner(source_dir=str(tmp_path), languages=None, ignore_file=".ragignore")
+        assert scanner._ignore_regex is None
+
+        files = sorted(f.relative_to(tmp_path).as_posix() for f in scanner.scan())
+        expected = sorted(
+            path for path in (f.relative_to(tmp_path).as_posix() for f in tmp_path.rglob("*.py"))
+            if not scanner.ignore_spec.match_file(path)
+        )
+        assert files == expected == ["a.py", "keep_test.py", "pkg/b.py", "pkg/keep_test.py"]
+
     def test_scan_with_specific_languages_only(self, sample_project_dir):
         """特定言語のみをスキャンすることを確認"""
         # Pythonのみ
@@ -147,6 +200,99 @@ class TestFileScanner:
         assert not any(f.suffix == ".rs" for f in files)
         assert not any(f.suffix == ".go" for f in files)
 
+    def test_scan_walks_nested_directories(self, tmp_path):
+        """ネストしたディレクトリのファイルを相対パスで除外判定しながら列挙することを確認"""
+        (tmp_path / "pkg" / "sub").mkdir(parents=True)
+        (tmp_path / "pkg" / "a.py").write_text("x = 1\n")
+        (tmp_path / "pkg" / "sub" / "b.rs").write_text("fn b() {}\n")
+        (tmp_path / "pkg" / "sub" / "skip_test.py").write_text("x = 1\n")
+        (tmp_path / "pkg" / "notes.txt").write_text("memo\n")
+        (tmp_path / ".ragignore").write_text("*_test.py\n")
+
+        scanner = FileScanner(source_dir=str(tmp_path), languages=None, ignore_file=".ragignore")
+        files = scanner.scan()
+
+        assert sorted(f.relative_to(tmp_path).as_posix() for f in files) == ["pkg/a.py", "pkg/sub/b.rs"]
+        assert all(f.is_absolute() == tmp_path.is_absolute() for f in files)
+
+    def test_scan_prunes_ignored_directories(self, tmp_path, monkeypatch):
+        """除外対象のディレクトリ配下を走査しないことを確認"""
+        for directory in ("src", "out/gen", ".git/hooks", "node_modules/pkg"):
+            (tmp_path / directory).mkdir(parents=True)
+            (tmp_path / directory / "mod.py").write_text("x = 1\n")
+        (tmp_path / ".ragignore").write_text("out/\n")
+
+        scanner = FileScanner(
+            source_dir=str(tmp_path), languages=None, ignore_file=".ragignore", skip_dirs=DEFAULT_SKIP_DIRS
+        )
+        checked = []
+        original = scanner._match_ignore
+        monkeypatch.setattr(scanner, "_match_ignore", lambda path: checked.append(path) or original(path))
+        files = scanner.scan()
+
+        assert [f.relative_to(tmp_path).as_posix() for f in files] == ["src/mod.py"]
+        # 枝刈りしたディレクトリ配下のパスは判定すら行われない
+        assert not any(path.startswith(("out/gen", ".git", "node_modules")) for path in checked)
+
+    def test_scan_walks_skip_dirs_by_default(self, tmp_path):
+        """skip_dirsを指定しない場合はvenv等のディレクトリも走査することを確認"""
+        for directory in ("venv", ".venv", "node_modules"):
+            (tmp_path / directory).mkdir()
+            (tmp_path / directory / "mod.py").write_text("x = 1\n")
+
+        scanner = FileScanner(source_dir=str(tmp_path), languages=None, ignore_file=None)
+        files = sorted(f.relative_to(tmp_path).as_posix() for f in scanner.scan())
+
+        assert files == [".venv/mod.py", "node_modules/mod.py", "venv/mod.py"]
+
+    @pytest.mark.parametrize("patterns, expected", [
+        ("*\n!*.py\n", ["a.py", "logs/keep.py", "pkg/sub/b.py"]),
+        ("logs/\n!logs/keep.py\n", ["a.py", "logs/keep.py", "pkg/sub/b.py", "pkg/sub/c.rs"]),
+    ])
+    def test_scan_negated_pattern_under_ignored_directory(self, tmp_path, patterns, expected):
+        """否定パターンがある場合は除外ディレクトリ配下のファイルも再包含できることを確認"""
+        for relative in ("a.py", "logs/keep.py", "logs/drop.rs", "pkg/sub/b.py", "pkg/sub/c.rs"):
+            (tmp_path / relative).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / relative).write_text("x = 1\n")
+        (tmp_path / ".ragignore").write_text(patterns)
+
+        scanner = FileScanner(source_dir=str(tmp_path), languages=None, ignore_file=".ragignore")
+        files = sorted(f.relative_to(tmp_path).as_posix() for f in scanner.scan())
+
+        # PathSpecでファイルごとに判定した結果と一致する
+        pathspec_files = sorted(
+            path for path in (f.relative_to(tmp_path).as_posix() for f in tmp_path.rglob("*") if f.is_file())
+            if path != ".ragignore" and not scanner.ignore_spec.match_file(path)
+        )
+        assert files == pathspec_files == expected
+
+    def test_scan_binary_check_preserves_order(self, tmp_path):
+        """並列のバイナリ判定でも走査順を保ち、バイナリのみ除外することを確認"""
+        for i in range(20):
+            path = tmp_path / f"mod{i:02d}.py"
+            if i % 3 == 0:
+                path.write_bytes(b"\x00\x01binary")
+            else:
+                path.write_text(f"def f{i}():\n    pass\n")
+
+        scanner = FileScanner(source_dir=str(tmp_path), languages=None, ignore_file=None)
+        files = scanner.scan()
+
+        expected = [p for p in tmp_path.rglob('*') if not scanner._is_binary(p)]
+        assert files == expected
+        assert len(files) == 13
+
+    def test_scan_parallel_binary_detection(self, sample_project_dir):
+        """ワーカー数によらず同じファイル集合を返すことを確認"""
+        sequential = FileScanner(
+            source_dir=str(sample_project_dir), languages=None, ignore_file=".ragignore", max_workers=1
+        )
+        parallel = FileScanner(
+            source_dir=str(sample_project_dir), languages=None, ignore_file=".ragignore", max_workers=8
+        )
+
+        assert parallel.scan() == sequential.scan()
+
 
 class TestLanguageExtensions:
     """言語拡張子マッピングのテスト"""
@@ -170,3 +316,9 @@ class TestLanguageExtensions:
         assert ".h" in LANGUAGE_EXTENSIONS["c"]
         assert ".cpp" in LANGUAGE_EXTENSIONS["cpp"]
         assert ".hpp" in LANGUAGE_EXTENSIONS["cpp"]
+
+    def test_language_extensions_are_frozensets(self):
+        """拡張子集合がfrozensetで、マッピングが変更不可であることを確認"""
+        assert all(isinstance(v, frozenset) for v in LANGUAGE_EXTENSIONS.values())
+        with pytest.raises(TypeError):
+            LANGUAGE_EXTENSIONS["python"] = frozenset({".pyi"})
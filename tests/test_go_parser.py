@@ -4,49 +4,17 @@ Goパーサーのテスト
 TDDステップ2-3: Red - テストを先に書く
 """
 
-import pytest
-from pathlib import Path
+import threading
 
 from src.parser.go_parser import GoParser
 
 
-@pytest.fixture
-def parser():
-    """GoParserインスタンス"""
-    return GoParser()
-
-
-@pytest.fixture
-def sample_go_file():
-    """サンプルGoファイル"""
-    return Path("tests/fixtures/sample_code/sample.go")
-
-
-@pytest.fixture
-def with_methods_file():
-    """メソッド付きGoファイル"""
-    return Path("tests/fixtures/sample_code/with_methods.go")
-
-
-@pytest.fixture
-def syntax_error_file():
-    """構文エラーのあるGoファイル"""
-    return Path("tests/fixtures/sample_code/go_syntax_error.go")
-
-
-def test_get_language(parser):
-    """言語名の取得"""
-    assert parser.get_language() == "go"
-
-
-def test_parse_simple_functions(parser, sample_go_file):
+def test_parse_simple_functions(sample_go_functions):
     """シンプルな関数の解析"""
-    functions = parser.parse_file(sample_go_file)
-
-    assert len(functions) == 3
+    assert len(sample_go_functions) == 3
 
     # Greet関数
-    greet = functions[0]
+    greet = sample_go_functions[0]
     assert greet.name == "Greet"
     assert greet.language == "go"
     assert greet.function_type == "function"
@@ -55,104 +23,154 @@ def test_parse_simple_functions(parser, sample_go_file):
     assert "Greet" in greet.code
 
     # Add関数
-    add = functions[1]
+    add = sample_go_functions[1]
     assert add.name == "Add"
     assert add.function_type == "function"
 
 
-def test_extract_arguments(parser, sample_go_file):
+def test_extract_arguments(sample_go_functions):
     """引数の抽出"""
-    functions = parser.parse_file(sample_go_file)
-
-    greet = functions[0]
+    greet = sample_go_functions[0]
     assert greet.arguments == ["name"]
 
-    add = functions[1]
+    add = sample_go_functions[1]
     assert add.arguments == ["a", "b"]
 
-    no_args = functions[2]
+    no_args = sample_go_functions[2]
     assert no_args.arguments == []
 
 
-def test_extract_doc_comment(parser, sample_go_file):
+def test_extract_doc_comment(sample_go_functions):
     """docコメントの抽出"""
-    functions = parser.parse_file(sample_go_file)
-
-    greet = functions[0]
+    greet = sample_go_functions[0]
     assert greet.docstring == "Greet greets a person by name"
 
-    add = functions[1]
+    add = sample_go_functions[1]
     assert add.docstring == "Add adds two numbers"
 
-    no_args = functions[2]
+    no_args = sample_go_functions[2]
     assert no_args.docstring is None
 
 
-def test_parse_methods(parser, with_methods_file):
+def test_parse_methods(with_methods_functions):
     """メソッドの解析"""
-    functions = parser.parse_file(with_methods_file)
-
     # NewCalculator, Add, Multiply, StandaloneFunction
-    assert len(functions) == 4
+    assert len(with_methods_functions) == 4
 
     # 通常の関数
-    new_calc = functions[0]
+    new_calc = with_methods_functions[0]
     assert new_calc.name == "NewCalculator"
     assert new_calc.function_type == "function"
     assert new_calc.scope == "global"
 
     # メソッド (receiver付き)
-    add_method = functions[1]
+    add_method = with_methods_functions[1]
     assert add_method.name == "Add"
     assert add_method.function_type == "method"
     assert add_method.scope == "method"
     assert "c" not in add_method.arguments  # receiverは除外
     assert add_method.arguments == ["x", "y"]
 
-    multiply_method = functions[2]
+    multiply_method = with_methods_functions[2]
     assert multiply_method.name == "Multiply"
     assert multiply_method.function_type == "method"
 
 
-def test_syntax_error_handling(parser, syntax_error_file):
-    """構文エラーのハンドリング"""
-    functions = parser.parse_file(syntax_error_file)
-    assert functions == []
-
-
-def test_file_not_found(parser):
-    """存在しないファイル"""
-    with pytest.raises(FileNotFoundError):
-        parser.parse_file(Path("nonexistent.go"))
-
-
-def test_position_info(parser, sample_go_file):
-    """位置情報の抽出"""
-    functions = parser.parse_file(sample_go_file)
-
-    greet = functions[0]
+def test_function_attributes(sample_go_functions, with_methods_file, with_methods_functions):
+    """位置情報・メトリクス・メタデータの抽出"""
+    # 位置情報
+    greet = sample_go_functions[0]
     assert greet.start_line > 0
     assert greet.end_line > greet.start_line
     assert greet.start_column >= 0
     assert greet.end_column >= 0
 
-
-def test_metrics(parser, with_methods_file):
-    """メトリクスの計算"""
-    functions = parser.parse_file(with_methods_file)
-
-    add_method = functions[1]
+    # メトリクス
+    add_method = with_methods_functions[1]
     assert add_method.loc > 0
     assert add_method.complexity is not None
     assert add_method.complexity >= 1
 
-
-def test_metadata_extraction(parser, with_methods_file):
-    """メタデータの抽出"""
-    functions = parser.parse_file(with_methods_file)
-
-    add_method = functions[1]
+    # メタデータ
     assert add_method.file_path == str(with_methods_file)
     assert add_method.language == "go"
     assert isinstance(add_method.code, str)
     assert len(add_method.code) > 0
+
+
+def test_non_ascii_source(go_parser):
+    """非ASCII文字を含むファイルでもバイトオフセットで正しく抽出できる"""
+    functions = go_parser.parse_string(
+        "package main\n"
+        "\n"
+        "// 二つの数を加算する\n"
+        "func Add(a, b int) int {\n"
+        "\treturn a + b\n"
+        "}\n"
+    )
+
+    add = functions[0]
+    assert add.name == "Add"
+    assert add.arguments == ["a", "b"]
+    assert add.docstring == "二つの数を加算する"
+
+
+def test_parser_shared_within_thread():
+    """同一スレッド内のインスタンスはTree-sitterパーサーを共有する"""
+    first = GoParser()
+    second = GoParser()
+    assert first.parser is second.parser
+    assert first.language is second.language
+
+    other_thread = {}
+    thread = threading.Thread(target=lambda: other_thread.setdefault('parser', GoParser().parser))
+    thread.start()
+    thread.join()
+    assert other_thread['parser'] is not first.parser
+
+
+def test_function_literals_not_extracted(go_parser):
+    """関数本体内の関数リテラルは抽出対象にならない"""
+    functions = go_parser.parse_string(
+        "package main\n"
+        "\n"
+        "func Run() {\n"
+        "    inner := func(x int) int { return x }\n"
+        "    _ = inner\n"
+        "}\n"
+        "\n"
+        "func (s *Server) Stop() {}\n"
+    )
+
+    assert [f.name for f in functions] == ["Run", "Stop"]
+
+
+def test_prefilter_skips_files_without_functions(mocker):
+    """funcを含まないファイルはパースせずに空リストを返す（strict指定時は常にパース）"""
+    source = "package model\n\ntype Point struct {\n    X, Y int\n}\n"
+
+    ts_parser = mocker.Mock(wraps=GoParser().parser)
+    mocker.patch.object(GoParser, "parser", new_callable=mocker.PropertyMock, return_value=ts_parser)
+
+    assert GoParser().parse_string(source) == []
+    ts_parser.parse.assert_not_called()
+
+    assert GoParser(strict=True).parse_string(source) == []
+    ts_parser.parse.assert_called_once()
+
+
+def test_partial_syntax_error(go_parser):
+    """構文エラーを含む関数のみスキップされる"""
+    functions = go_parser.parse_string(
+        "package main\n"
+        "\n"
+        "func Good(a int) int {\n"
+        "\treturn a\n"
+        "}\n"
+        "\n"
+        "func Bad(a int) int {\n"
+        "\treturn a +\n"
+        "}\n"
+    )
+
+    assert [f.name for f in functions] == ["Good"]
@@ -4,49 +4,16 @@ Javaパーサーのテスト
 TDDステップ2-3: Red - テストを先に書く
 """
 
-import pytest
-from pathlib import Path
-
+from src.parser.ast_cache import AstCache
 from src.parser.java_parser import JavaParser
 
 
-@pytest.fixture
-def parser():
-    """JavaParserインスタンス"""
-    return JavaParser()
-
-
-@pytest.fixture
-def sample_java_file():
-    """サンプルJavaファイル"""
-    return Path("tests/fixtures/sample_code/Sample.java")
-
-
-@pytest.fixture
-def with_class_file():
-    """クラス付きJavaファイル"""
-    return Path("tests/fixtures/sample_code/WithClass.java")
-
-
-@pytest.fixture
-def syntax_error_file():
-    """構文エラーのあるJavaファイル"""
-    return Path("tests/fixtures/sample_code/java_syntax_error.java")
-
-
-def test_get_language(parser):
-    """言語名の取得"""
-    assert parser.get_language() == "java"
-
-
-def test_parse_simple_methods(parser, sample_java_file):
+def test_parse_simple_methods(sample_java_functions):
     """シンプルなメソッドの解析"""
-    functions = parser.parse_file(sample_java_file)
-
-    assert len(functions) == 3
+    assert len(sample_java_functions) == 3
 
     # greetメソッド
-    greet = functions[0]
+    greet = sample_java_functions[0]
     assert greet.name == "greet"
     assert greet.language == "java"
     assert greet.function_type == "method"
@@ -55,125 +22,158 @@ def test_parse_simple_methods(parser, sample_java_file):
     assert "greet" in greet.code
 
     # addメソッド
-    add = functions[1]
+    add = sample_java_functions[1]
     assert add.name == "add"
     assert add.function_type == "method"
 
 
-def test_extract_arguments(parser, sample_java_file):
+def test_extract_arguments(sample_java_functions):
     """引数の抽出"""
-    functions = parser.parse_file(sample_java_file)
-
-    greet = functions[0]
+    greet = sample_java_functions[0]
     assert greet.arguments == ["name"]
 
-    add = functions[1]
+    add = sample_java_functions[1]
     assert add.arguments == ["a", "b"]
 
-    no_args = functions[2]
+    no_args = sample_java_functions[2]
     assert no_args.arguments == []
 
 
-def test_extract_javadoc(parser, sample_java_file):
+def test_extract_javadoc(sample_java_functions):
     """JavaDocコメントの抽出"""
-    functions = parser.parse_file(sample_java_file)
-
-    greet = functions[0]
+    greet = sample_java_functions[0]
     assert greet.docstring is not None
     assert "Greet a person" in greet.docstring
 
-    add = functions[1]
+    add = sample_java_functions[1]
     assert add.docstring is not None
     assert "Add two numbers" in add.docstring
 
-    no_args = functions[2]
+    no_args = sample_java_functions[2]
     assert no_args.docstring is None
 
 
-def test_parse_class_methods(parser, with_class_file):
+def test_parse_class_methods(with_class_java_functions):
     """クラス内メソッドの解析"""
-    functions = parser.parse_file(with_class_file)
-
     # Constructor, add, multiply, reset, standaloneFunction
-    assert len(functions) == 5
+    assert len(with_class_java_functions) == 5
 
     # コンストラクタ
-    constructor = functions[0]
+    constructor = with_class_java_functions[0]
     assert constructor.name == "Calculator"
     assert constructor.function_type == "constructor"
     assert constructor.scope == "class"
 
     # 通常のメソッド
-    add_method = functions[1]
+    add_method = with_class_java_functions[1]
     assert add_method.name == "add"
     assert add_method.function_type == "method"
     assert add_method.scope == "class"
     assert add_method.arguments == ["x", "y"]
 
     # staticメソッド
-    multiply_method = functions[2]
+    multiply_method = with_class_java_functions[2]
     assert multiply_method.name == "multiply"
     assert multiply_method.function_type == "method"
     assert "static" in multiply_method.modifiers
 
 
-def test_extract_modifiers(parser, with_class_file):
+def test_extract_modifiers(with_class_java_functions):
     """修飾子の抽出"""
-    functions = parser.parse_file(with_class_file)
-
     # publicメソッド
-    add_method = functions[1]
+    add_method = with_class_java_functions[1]
     assert "public" in add_method.modifiers
 
     # staticメソッド
-    multiply_method = functions[2]
+    multiply_method = with_class_java_functions[2]
     assert "public" in multiply_method.modifiers
     assert "static" in multiply_method.modifiers
 
     # privateメソッド
-    reset_method = functions[3]
+    reset_method = with_class_java_functions[3]
     assert "private" in reset_method.modifiers
 
 
-def test_syntax_error_handling(parser, syntax_error_file):
-    """構文エラーのハンドリング"""
-    functions = parser.parse_file(syntax_error_file)
-    assert functions == []
-
-
-def test_file_not_found(parser):
-    """存在しないファイル"""
-    with pytest.raises(FileNotFoundError):
-        parser.parse_file(Path("nonexistent.java"))
-
-
-def test_position_info(parser, sample_java_file):
-    """位置情報の抽出"""
-    functions = parser.parse_file(sample_java_file)
-
-    greet = functions[0]
+def test_function_attributes(sample_java_functions, with_class_java_file, with_class_java_functions):
+    """位置情報・メトリクス・メタデータの抽出"""
+    # 位置情報
+    greet = sample_java_functions[0]
     assert greet.start_line > 0
     assert greet.end_line > greet.start_line
     assert greet.start_column >= 0
     assert greet.end_column >= 0
 
-
-def test_metrics(parser, with_class_file):
-    """メトリクスの計算"""
-    functions = parser.parse_file(with_class_file)
-
-    add_method = functions[1]
+    # メトリクス
+    add_method = with_class_java_functions[1]
     assert add_method.loc > 0
     assert add_method.complexity is not None
     assert add_method.complexity >= 1
 
-
-def test_metadata_extraction(parser, with_class_file):
-    """メタデータの抽出"""
-    functions = parser.parse_file(with_class_file)
-
-    add_method = functions[1]
-    assert add_method.file_path == str(with_class_file)
+    # メタデータ
+    assert add_method.file_path == str(with_class_java_file)
     assert add_method.language == "java"
     assert isinstance(add_method.code, str)
     assert len(add_method.code) > 0
+
+
+def test_non_ascii_source(java_parser):
+    """非ASCII文字を含むファイルでもバイトオフセットで正しく抽出できる"""
+    functions = java_parser.parse_string(
+        "public class NonAscii {\n"
+        "    /** 二つの数を加算する */\n"
+        "    public int add(int a, int b) {\n"
+        "        return a + b;\n"
+        "    }\n"
+        "}\n"
+    )
+
+    add = functions[0]
+    assert add.name == "add"
+    assert add.arguments == ["a", "b"]
+    assert add.docstring == "二つの数を加算する"
+
+
+def test_parse_file_uses_cache(tmp_path, mocker, sample_java_file):
+    """キャッシュ済みのファイルはTree-sitterで再解析しない"""
+    cache = AstCache(str(tmp_path / "ast.sqlite3"))
+    expected = JavaParser(cache=cache).parse_file(sample_java_file)
+
+    cached_parser = JavaParser(cache=cache)
+    parser_property = mocker.patch.object(JavaParser, "parser", new_callable=mocker.PropertyMock)
+
+    assert cached_parser.parse_file(sample_java_file) == expected
+    parser_property.return_value.parse.assert_not_called()
+    cache.close()
+
+
+def test_parse_mapped_file(java_parser, mocker, sample_java_file):
+    """mmapで開いた場合も通常の読み込みと同じ結果になる"""
+    expected = java_parser.parse_file(sample_java_file)
+
+    mocker.patch("src.parser.base_parser._MMAP_THRESHOLD", 0)
+    assert java_parser.parse_file(sample_java_file) == expected
+
+
+def test_shared_strings(with_class_java_functions):
+    """修飾子とファイルパスは全メソッドで同じ文字列オブジェクトを共有する"""
+    public_modifiers = [m for f in with_class_java_functions for m in f.modifiers if m == "public"]
+
+    assert len(public_modifiers) >= 2
+    assert all(m is public_modifiers[0] for m in public_modifiers)
+    assert all(f.file_path is with_class_java_functions[0].file_path for f in with_class_java_functions)
+
+
+def test_multiline_javadoc(java_parser):
+    """複数行のJavaDocは各行先頭の * を除去して1行に連結する"""
+    functions = java_parser.parse_string(
+        "public class Doc {\n"
+        "    /**\n"
+        "     * Adds two numbers.\n"
+        "     *\n"
+        "     * @param a first value\n"
+        "     */\n"
+        "    public int add(int a, int b) { return a + b; }\n"
+        "}\n"
+    )
+
+    assert functions[0].docstring == "Adds two numbers. @param a first value"
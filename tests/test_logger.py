@@ -5,12 +5,56 @@ TDDステップ1: Red - 失敗するテストを作成
 """
 
 import logging
+import os
+import re
 import tempfile
+from logging.handlers import QueueHandler
 from pathlib import Path
 
 import pytest
 
-from src.utils.logger import setup_logger, get_logger
+from src.utils import logger as logger_module
+from src.utils.logger import _LOG_LEVELS, setup_logger, shutdown_logger, get_logger
+
+
+# [2025-11-23 10:30:45] [INFO] [root] Test message のような形式
+_LOG_PATTERN = re.compile(r"\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\] \[INFO\] \[.*?\] Test message")
+
+# ログファイル末尾から読み込む最大バイト数（1行分に十分な長さ）
+_TAIL_BYTES = 512
+
+
+def _last_line(log_file: Path) -> str:
+    """ログファイルの最終行を末尾の一定バイト数だけ読んで返す"""
+    with open(log_file, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - _TAIL_BYTES))
+        return f.read().decode("utf-8").splitlines()[-1]
+
+
+def _output_handlers() -> list:
+    """setup_loggerが設定した出力先ハンドラー（QueueListener側）を返す"""
+    return list(logger_module._listener.handlers)
+
+
+@pytest.fixture(scope="session")
+def log_dir(tmp_path_factory):
+    """ログファイルの出力先（セッション共有。テストごとにファイル名を変える）"""
+    return tmp_path_factory.mktemp("logs")
+
+
+@pytest.fixture(autouse=True)
+def _reset_logging():
+    """ルートロガーのレベルとハンドラーをテストごとに元へ戻す（FileHandlerは閉じる）"""
+    root = logging.getLogger()
+    saved_level, saved_handlers = root.level, list(root.handlers)
+    yield
+    shutdown_logger()
+    for handler in root.handlers:
+        if isinstance(handler, logging.FileHandler) and handler not in saved_handlers:
+            handler.close()
+    root.handlers[:] = saved_handlers
+    root.setLevel(saved_level)
 
 
 class TestSetupLogger:
@@ -18,63 +62,99 @@ class TestSetupLogger:
 
     def test_setup_logger_creates_console_handler(self):
         """コンソールハンドラーが作成されることを確認"""
-        logger = setup_logger(level="INFO")
+        setup_logger(level="INFO")
 
         # StreamHandlerが存在することを確認
         console_handlers = [
-            h for h in logger.handlers
+            h for h in _output_handlers()
             if isinstance(h, logging.StreamHandler) and not isinstance(h, logging.FileHandler)
         ]
         assert len(console_handlers) > 0, "Console handler should be created"
 
-    def test_setup_logger_creates_file_handler(self, tmp_path):
+    def test_setup_logger_creates_file_handler(self, log_dir):
         """ファイルハンドラーが作成されることを確認"""
-        log_file = tmp_path / "test.log"
-        logger = setup_logger(level="INFO", log_file=str(log_file))
+        log_file = log_dir / "test.log"
+        setup_logger(level="INFO", log_file=str(log_file))
 
         # FileHandlerが存在することを確認
-        file_handlers = [h for h in logger.handlers if isinstance(h, logging.FileHandler)]
+        file_handlers = [h for h in _output_handlers() if isinstance(h, logging.FileHandler)]
         assert len(file_handlers) > 0, "File handler should be created"
         assert log_file.exists(), "Log file should be created"
 
-    def test_setup_logger_sets_log_level(self):
-        """ログレベルが正しく設定されることを確認"""
-        # DEBUGレベル
-        logger = setup_logger(level="DEBUG")
-        assert logger.level == logging.DEBUG
+    def test_setup_logger_closes_previous_file_handler(self, log_dir):
+        """再設定時に以前のFileHandlerが閉じられることを確認"""
+        setup_logger(level="INFO", log_file=str(log_dir / "reconfigure.log"))
+        previous = next(h for h in _output_handlers() if isinstance(h, logging.FileHandler))
 
-        # INFOレベル
+        setup_logger(level="INFO")
+
+        assert previous not in _output_handlers()
+        assert previous.stream is None
+
+    def test_root_logger_only_enqueues(self):
+        """ルートロガーにはキューハンドラーのみが付き、出力先はリスナーが持つことを確認"""
         logger = setup_logger(level="INFO")
-        assert logger.level == logging.INFO
 
-        # WARNレベル
-        logger = setup_logger(level="WARN")
-        assert logger.level == logging.WARN
+        assert [type(h) for h in logger.handlers] == [QueueHandler]
+        assert _output_handlers()
+
+        shutdown_logger()
+        assert logger.handlers == []
+        assert logger_module._listener is None
 
-        # ERRORレベル
-        logger = setup_logger(level="ERROR")
-        assert logger.level == logging.ERROR
+    @pytest.mark.parametrize("level, expected", [
+        ("DEBUG", logging.DEBUG),
+        ("INFO", logging.INFO),
+        ("WARN", logging.WARN),
+        ("ERROR", logging.ERROR),
+    ])
+    def test_log_level_mapping(self, level, expected):
+        """ログレベル名がloggingのレベル値に対応することを確認（ロガーは構築しない）"""
+        assert _LOG_LEVELS[level] == expected
+
+    def test_setup_logger_sets_log_level(self):
+        """ログレベルが正しく設定されることを確認"""
+        logger = setup_logger(level="info")
+        assert logger.level == logging.INFO
 
-    def test_log_format_is_correct(self, tmp_path, caplog):
+    def test_log_format_is_correct(self, log_dir, caplog):
         """ログフォーマットが仕様通りであることを確認
 
         フォーマット: [TIMESTAMP] [LEVEL] [COMPONENT] MESSAGE
         """
-        log_file = tmp_path / "format_test.log"
+        log_file = log_dir / "format_test.log"
         logger = setup_logger(level="INFO", log_file=str(log_file))
 
         # テストメッセージをログ出力
         test_message = "Test message"
         logger.info(test_message)
+        shutdown_logger()
 
-        # ファイルに書き込まれた内容を確認
-        log_content = log_file.read_text()
+        # ファイルに書き込まれた最終行を確認
+        last_line = _last_line(log_file)
 
         # フォーマットの確認（正規表現で検証）
-        import re
-        # [2025-11-23 10:30:45] [INFO] [root] Test message のような形式
-        pattern = r"\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\] \[INFO\] \[.*?\] Test message"
-        assert re.search(pattern, log_content), f"Log format incorrect: {log_content}"
+        assert test_message in last_line and _LOG_PATTERN.match(last_line), f"Log format incorrect: {last_line}"
+
+    def test_lazy_arguments_are_formatted(self, log_dir):
+        """%形式の引数が出力時に展開されることを確認"""
+        log_file = log_dir / "lazy_test.log"
+        setup_logger(level="WARN", log_file=str(log_file))
+
+        logger = get_logger("test.lazy")
+        logger.warning("Encoding error in %s: %s", "sample.py", "invalid byte")
+        shutdown_logger()
+
+        assert _last_line(log_file).endswith("Encoding error in sample.py: invalid byte")
+
+    def test_shutdown_restores_logging_settings(self, log_dir):
+        """setup_loggerで変更したloggingモジュールの設定がshutdown_loggerで元に戻ることを確認"""
+        before = (logging.logThreads, logging.logProcesses, logging.logMultiprocessing)
+
+        setup_logger(level="INFO", log_file=str(log_dir / "restore_test.log"))
+        shutdown_logger()
+
+        assert (logging.logThreads, logging.logProcesses, logging.logMultiprocessing) == before
 
 
 class TestGetLogger:
@@ -94,12 +174,13 @@ class TestGetLogger:
 
     def test_get_logger_inherits_root_config(self):
         """get_loggerで取得したロガーがルートロガーの設定を継承することを確認"""
-        # ルートロガーを設定
-        setup_logger(level="DEBUG")
+        # ルートロガーのレベルのみ設定（ハンドラーの構築は不要。状態はautouseフィクスチャで戻す）
+        logging.getLogger().setLevel(logging.DEBUG)
 
         # モジュール別ロガーを取得
         module_logger = get_logger("test.module")
 
         # ルートロガーの設定を継承していることを確認
         # (ハンドラーは伝播するため、独自のハンドラーを持たなくてもログ出力可能)
-        assert module_logger.level == logging.NOTSET or module_logger.level <= logging.DEBUG
+        assert module_logger.level == logging.NOTSET
+        assert module_logger.getEffectiveLevel() == logging.DEBUG
@@ -0,0 +1,35 @@
+"""
+並列解析のテスト
+"""
+
+from pathlib import Path
+
+import pytest
+
+from src.parser.cpp_parser import CppParser
+from src.parser.go_parser import GoParser
+from src.parser.parallel import parse_files_parallel
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "sample_code"
+
+
+def test_parallel_matches_serial():
+    """並列解析の結果が逐次解析と一致する"""
+    paths = [FIXTURES_DIR / "sample.cpp", FIXTURES_DIR / "with_class.cpp"]
+
+    serial_parser = CppParser()
+    expected = [f for path in paths for f in serial_parser.parse_file(path)]
+
+    assert parse_files_parallel(paths, CppParser, max_workers=2) == expected
+
+
+def test_parallel_empty_input():
+    """入力が空の場合はプロセスを起動せず空リストを返す"""
+    assert parse_files_parallel([], GoParser) == []
+
+
+def test_parallel_file_not_found():
+    """存在しないファイルの例外が呼び出し元に伝播する"""
+    with pytest.raises(FileNotFoundError):
+        parse_files_parallel([Path("nonexistent.go")], GoParser, max_workers=1)
@@ -7,7 +7,8 @@ TDDステップ4-4: Red - テストを先に書く
 import pytest
 from pathlib import Path
 
-from src.parser.parser_factory import ParserFactory
+from src.parser.ast_cache import AstCache
+from src.parser.parser_factory import ParserFactory, get_factory, get_parser
 from src.parser.python_parser import PythonParser
 from src.parser.rust_parser import RustParser
 from src.parser.go_parser import GoParser
@@ -16,89 +17,44 @@ from src.parser.c_parser import CParser
 from src.parser.cpp_parser import CppParser
 
 
-@pytest.fixture
-def factory():
-    """ParserFactoryインスタンス"""
-    return ParserFactory()
-
-
-def test_get_python_parser(factory):
-    """Pythonパーサーの取得"""
-    parser = factory.get_parser(Path("test.py"))
-    assert parser is not None
-    assert isinstance(parser, PythonParser)
-    assert parser.get_language() == "python"
-
-
-def test_get_rust_parser(factory):
-    """Rustパーサーの取得"""
-    parser = factory.get_parser(Path("test.rs"))
-    assert parser is not None
-    assert isinstance(parser, RustParser)
-    assert parser.get_language() == "rust"
-
-
-def test_get_go_parser(factory):
-    """Goパーサーの取得"""
-    parser = factory.get_parser(Path("test.go"))
-    assert parser is not None
-    assert isinstance(parser, GoParser)
-    assert parser.get_language() == "go"
-
-
-def test_get_java_parser(factory):
-    """Javaパーサーの取得"""
-    parser = factory.get_parser(Path("test.java"))
-    assert parser is not None
-    assert isinstance(parser, JavaParser)
-    assert parser.get_language() == "java"
+# 言語ごとの (パーサークラス, 言語名, 拡張子)
+_EXPECTED_PARSERS = [
+    (PythonParser, "python", ("py",)),
+    (RustParser, "rust", ("rs",)),
+    (GoParser, "go", ("go",)),
+    (JavaParser, "java", ("java",)),
+    (CParser, "c", ("c", "h")),
+    (CppParser, "cpp", ("cpp", "cc", "cxx", "hpp", "hh", "hxx")),
+]
 
+# 拡張子ごとの (ファイルパス, パーサークラス, 言語名)（Pathはコレクション時に1回だけ生成する）
+_EXTENSION_CASES = [
+    (Path(f"test.{ext}"), parser_cls, language)
+    for parser_cls, language, extensions in _EXPECTED_PARSERS
+    for ext in extensions
+]
 
-def test_get_c_parser(factory):
-    """Cパーサーの取得"""
-    parser = factory.get_parser(Path("test.c"))
-    assert parser is not None
-    assert isinstance(parser, CParser)
-    assert parser.get_language() == "c"
 
-    # .hファイルもCとして扱う
-    parser_h = factory.get_parser(Path("test.h"))
-    assert parser_h is not None
-    assert isinstance(parser_h, CParser)
-
-
-def test_get_cpp_parser(factory):
-    """C++パーサーの取得"""
-    # .cpp
-    parser_cpp = factory.get_parser(Path("test.cpp"))
-    assert parser_cpp is not None
-    assert isinstance(parser_cpp, CppParser)
-    assert parser_cpp.get_language() == "cpp"
+@pytest.fixture(scope="session")
+def factory():
+    """ParserFactoryインスタンス（セッション共有。言語ごとのパーサー生成は1回だけ）"""
+    return ParserFactory()
 
-    # .cc
-    parser_cc = factory.get_parser(Path("test.cc"))
-    assert parser_cc is not None
-    assert isinstance(parser_cc, CppParser)
 
-    # .cxx
-    parser_cxx = factory.get_parser(Path("test.cxx"))
-    assert parser_cxx is not None
-    assert isinstance(parser_cxx, CppParser)
+@pytest.fixture
+def fresh_factory():
+    """未初期化のParserFactoryインスタンス（遅延初期化の検証用）"""
+    return ParserFactory()
 
-    # .hpp
-    parser_hpp = factory.get_parser(Path("test.hpp"))
-    assert parser_hpp is not None
-    assert isinstance(parser_hpp, CppParser)
 
-    # .hh
-    parser_hh = factory.get_parser(Path("test.hh"))
-    assert parser_hh is not None
-    assert isinstance(parser_hh, CppParser)
+@pytest.mark.parametrize("path, parser_cls, language", _EXTENSION_CASES, ids=lambda v: v.suffix if isinstance(v, Path) else None)
+def test_get_parser_by_extension(factory, path, parser_cls, language):
+    """拡張子に対応する言語判定とパーサーの取得"""
+    assert factory._detect_language(path) == language
 
-    # .hxx
-    parser_hxx = factory.get_parser(Path("test.hxx"))
-    assert parser_hxx is not None
-    assert isinstance(parser_hxx, CppParser)
+    parser = factory.get_parser(path)
+    assert type(parser) is parser_cls
+    assert parser.get_language() == language
 
 
 def test_unsupported_extension(factory):
@@ -112,13 +68,8 @@ def test_unsupported_extension(factory):
 
 def test_case_insensitive_extension(factory):
     """大文字小文字を区別しない"""
-    parser_py = factory.get_parser(Path("test.PY"))
-    assert parser_py is not None
-    assert isinstance(parser_py, PythonParser)
-
-    parser_rs = factory.get_parser(Path("test.RS"))
-    assert parser_rs is not None
-    assert isinstance(parser_rs, RustParser)
+    assert type(factory.get_parser(Path("test.PY"))) is PythonParser
+    assert type(factory.get_parser(Path("test.RS"))) is RustParser
 
 
 def test_singleton_pattern(factory):
@@ -130,34 +81,34 @@ def test_singleton_pattern(factory):
     assert parser1 is parser2
 
 
-def test_lazy_initialization(factory):
-    """遅延初期化 - 初回アクセス時に初期化される"""
-    # 初期化前は_initializedがFalse
-    assert factory._initialized == False
+def test_lazy_initialization(fresh_factory):
+    """遅延初期化 - 言語ごとに初回アクセス時に初期化される"""
+    # 初期化前はパーサーが無い
+    assert fresh_factory._parsers == {}
 
-    # get_parserを呼ぶと初期化される
-    factory.get_parser(Path("test.py"))
-    assert factory._initialized == True
+    # get_parserを呼ぶと要求された言語のみ初期化される
+    python_parser = fresh_factory.get_parser(Path("test.py"))
+    assert list(fresh_factory._parsers) == ["python"]
 
     # 2回目以降は初期化されない（既に初期化済み）
-    factory.get_parser(Path("test.rs"))
-    assert factory._initialized == True
-
-
-def test_detect_language(factory):
-    """言語判定のテスト"""
-    assert factory._detect_language(Path("test.py")) == "python"
-    assert factory._detect_language(Path("test.rs")) == "rust"
-    assert factory._detect_language(Path("test.go")) == "go"
-    assert factory._detect_language(Path("test.java")) == "java"
-    assert factory._detect_language(Path("test.c")) == "c"
-    assert factory._detect_language(Path("test.h")) == "c"
-    assert factory._detect_language(Path("test.cpp")) == "cpp"
-    assert factory._detect_language(Path("test.cc")) == "cpp"
-    assert factory._detect_language(Path("test.cxx")) == "cpp"
-    assert factory._detect_language(Path("test.hpp")) == "cpp"
-    assert factory._detect_language(Path("test.hh")) == "cpp"
-    assert factory._detect_language(Path("test.hxx")) == "cpp"
+    fresh_factory.get_parser(Path("test.rs"))
+    assert fresh_factory.get_parser(Path("other.py")) is python_parser
+    assert sorted(fresh_factory._parsers) == ["python", "rust"]
+
+    # 未対応言語では初期化しない
+    fresh_factory.get_parser(Path("test.txt"))
+    assert len(fresh_factory._parsers) == 2
+
+
+def test_module_level_factory():
+    """モジュール関数はプロセス共有の1つのファクトリを使う"""
+    assert get_factory() is get_factory()
+    assert get_parser(Path("test.go")) is get_factory().get_parser(Path("main.go"))
+    assert get_parser(Path("test.txt")) is None
+
+
+def test_detect_unsupported_language(factory):
+    """未対応の拡張子の言語判定"""
     assert factory._detect_language(Path("test.txt")) is None
 
 
@@ -165,11 +116,79 @@ def test_get_all_supported_languages(factory):
     """全ての対応言語のパーサーを取得できる"""
     factory._initialize_parsers()
 
-    assert "python" in factory._parsers
-    assert "rust" in factory._parsers
-    assert "go" in factory._parsers
-    assert "java" in factory._parsers
-    assert "c" in factory._parsers
-    assert "cpp" in factory._parsers
+    assert {language: type(parser) for language, parser in factory._parsers.items()} == {
+        language: parser_cls for parser_cls, language, _ in _EXPECTED_PARSERS
+    }
+
+
+def test_parse_files_parallel(factory, fixtures_dir):
+    """複数言語のファイルをプロセスプールで並列解析"""
+    paths = [fixtures_dir / "simple.py", fixtures_dir / "sample.go", Path("README.txt"), fixtures_dir / "sample.c"]
+
+    results = factory.parse_files(paths, max_workers=2)
+
+    # 未対応言語は含まれず、入力順が保持される
+    assert list(results) == [paths[0], paths[1], paths[3]]
+    for path, functions in results.items():
+        assert functions == factory.get_parser(path).parse_file(path)
+
+    assert factory.parse_files([Path("README.txt")]) == {}
+
+
+def test_parse_file_uses_cache(tmp_path, monkeypatch):
+    """永続キャッシュ済みのファイルは別のファクトリからも再解析しない"""
+    py_file = tmp_path / "module.py"
+    py_file.write_text("def f(a):\n    return a\n")
+    cache = AstCache(str(tmp_path / "ast.sqlite3"))
+
+    first = ParserFactory(cache=cache).parse_file(py_file)
+    assert [f.name for f in first] == ["f"]
+
+    factory = ParserFactory(cache=cache)
+    monkeypatch.setattr(PythonParser, "parse_file", lambda self, path: pytest.fail("re-parsed"))
+    monkeypatch.setattr(PythonParser, "parse_bytes", lambda self, source, path: pytest.fail("re-parsed"))
+    assert factory.parse_file(py_file) == first
+    assert factory.parse_files([py_file]) == {py_file: first}
+    cache.close()
+
+
+def test_parse_file_reads_once_with_cache(tmp_path, monkeypatch):
+    """キャッシュ未登録のファイルはハッシュ計算で読み込んだ内容をそのまま解析する"""
+    py_file = tmp_path / "module.py"
+    py_file.write_text("def f(a):\n    return a\n")
+    cache = AstCache(str(tmp_path / "ast.sqlite3"))
+
+    monkeypatch.setattr(PythonParser, "parse_file", lambda self, path: pytest.fail("read again"))
+    functions = ParserFactory(cache=cache).parse_file(py_file)
+
+    assert [f.name for f in functions] == ["f"]
+    assert functions[0].file_path == str(py_file)
+    cache.close()
+
+
+def test_parse_file_memo_returns_copy(factory, tmp_path):
+    """メモリ上の結果を返す場合も、呼び出し元による変更が後の呼び出しに影響しない"""
+    py_file = tmp_path / "module.py"
+    py_file.write_text("def f():\n    pass\n")
+
+    first = factory.parse_file(py_file)
+    first.clear()
+    second = factory.parse_file(py_file)
+    assert [f.name for f in second] == ["f"]
+
+    second.clear()
+    assert [f.name for f in factory.parse_files([py_file])[py_file]] == ["f"]
+    assert [f.name for f in factory.parse_file(py_file)] == ["f"]
+
+
+def test_parse_file_memo_detects_change(factory, tmp_path):
+    """内容が変わったファイルはメモリ上の結果を使わずに再解析する"""
+    py_file = tmp_path / "module.py"
+    py_file.write_text("def f():\n    pass\n")
+    assert [f.name for f in factory.parse_file(py_file)] == ["f"]
+
+    py_file.write_text("def g():\n    pass\n\n\ndef h():\n    pass\n")
+    assert [f.name for f in factory.parse_file(py_file)] == ["g", "h"]
 
-    assert len(factory._parsers) == 6
+    with pytest.raises(FileNotFoundError):
+        factory.parse_file(tmp_path / "missing.py")
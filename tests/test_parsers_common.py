@@ -0,0 +1,142 @@
+"""
+言語パーサー共通の振る舞いのテスト
+"""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.parser.c_parser import CParser
+from src.parser.cpp_parser import CppParser
+from src.parser.go_parser import GoParser
+from src.parser.java_parser import JavaParser
+
+
+PARSERS = [
+    (CParser, "c", ".c"),
+    (CppParser, "cpp", ".cpp"),
+    (GoParser, "go", ".go"),
+    (JavaParser, "java", ".java"),
+]
+
+# 言語ごとの構文エラーを含むサンプルファイル
+SYNTAX_ERROR_CASES = [
+    ("python", "syntax_error.py"),
+    ("rust", "rust_syntax_error.rs"),
+    ("c", "c_syntax_error.c"),
+    ("cpp", "cpp_syntax_error.cpp"),
+    ("go", "go_syntax_error.go"),
+    ("java", "java_syntax_error.java"),
+]
+
+
+@pytest.mark.parametrize("parser_cls, language, extension", PARSERS)
+def test_get_language(parser_cls, language, extension):
+    """言語名の取得"""
+    assert parser_cls().get_language() == language
+
+
+@pytest.mark.parametrize("parser_cls, language, extension", PARSERS)
+def test_file_not_found(parser_cls, language, extension):
+    """存在しないファイル"""
+    with pytest.raises(FileNotFoundError):
+        parser_cls().parse_file(Path(f"nonexistent{extension}"))
+
+
+@pytest.mark.parametrize("language, filename", SYNTAX_ERROR_CASES)
+def test_syntax_error_handling(request, fixtures_dir, language, filename):
+    """構文エラーのハンドリング"""
+    parser = request.getfixturevalue(f"{language}_parser")
+    assert parser.parse_file(fixtures_dir / filename) == []
+
+
+@pytest.mark.parametrize("language", ["python", "rust", "c", "cpp", "go", "java"])
+def test_shared_instance_uses_parser_per_thread(request, language):
+    """1つのインスタンスを複数スレッドで使ってもスレッドごとに別のTree-sitterパーサーを使う"""
+    parser = request.getfixturevalue(f"{language}_parser")
+    other_thread = {}
+    thread = threading.Thread(target=lambda: other_thread.setdefault("parser", parser.parser))
+    thread.start()
+    thread.join()
+
+    assert other_thread["parser"] is not parser.parser
+    assert other_thread["parser"] is not None
+
+
+@pytest.mark.parametrize("language", ["c", "cpp", "go", "java"])
+def test_parse_bytes_matches_parse_file(request, language):
+    """読み込み済みバイト列からの解析結果がparse_fileと一致する"""
+    parser = request.getfixturevalue(f"{language}_parser")
+    sample_file = request.getfixturevalue(f"sample_{language}_file")
+    sample_bytes = request.getfixturevalue(f"sample_{language}_bytes")
+    expected = request.getfixturevalue(f"sample_{language}_functions")
+
+    assert parser.parse_bytes(sample_bytes, sample_file) == expected
+
+
+@pytest.mark.parametrize("language", ["c", "cpp", "go", "java"])
+def test_parse_string_matches_parse_file(request, language):
+    """文字列からの解析結果がparse_fileと一致する"""
+    parser = request.getfixturevalue(f"{language}_parser")
+    sample_file = request.getfixturevalue(f"sample_{language}_file")
+    sample_bytes = request.getfixturevalue(f"sample_{language}_bytes")
+    expected = request.getfixturevalue(f"sample_{language}_functions")
+
+    assert parser.parse_string(sample_bytes.decode("utf-8"), str(sample_file)) == expected
+
+
+# 空行とコード末尾のコメントを含む関数（言語, ソース, 期待する(実効行数, コメント行数, 複雑度)）
+_C_METRICS_SOURCE = (
+    "int total(int *items, int n) { // 合計\n"
+    "\n"
+    "    int result = 0; // 初期値\n"
+    "    for (int i = 0; i < n && items[i]; i++) {\n"
+    "\n"
+    "        result += items[i]; /* 加算 */\n"
+    "    }\n"
+    "    // 結果を返す\n"
+    "    return result;\n"
+    "}\n"
+)
+METRICS_CASES = [
+    ("c", _C_METRICS_SOURCE, (7, 1, 3)),
+    ("cpp", _C_METRICS_SOURCE, (7, 1, 3)),
+    ("go", (
+        "package main\n"
+        "\n"
+        "func total(items []int) int { // 合計\n"
+        "\n"
+        "\tresult := 0 // 初期値\n"
+        "\tfor _, item := range items {\n"
+        "\n"
+        "\t\tif item > 0 || item < -10 { result += item } // 加算\n"
+        "\t}\n"
+        "\t// 結果を返す\n"
+        "\treturn result\n"
+        "}\n"
+    ), (7, 1, 4)),
+    ("java", (
+        "class Sum {\n"
+        "    int total(int[] items) { // 合計\n"
+        "\n"
+        "        int result = 0; // 初期値\n"
+        "        for (int item : items) {\n"
+        "\n"
+        "            result += item > 0 ? item : 0; /* 加算 */\n"
+        "        }\n"
+        "        // 結果を返す\n"
+        "        return result;\n"
+        "    }\n"
+        "}\n"
+    ), (7, 1, 3)),
+]
+
+
+@pytest.mark.parametrize("language, source, expected", METRICS_CASES)
+def test_metrics_ignore_blank_lines_and_trailing_comments(request, language, source, expected):
+    """空行は数えず、コードの後ろのコメントはコメント行として数えない"""
+    parser = request.getfixturevalue(f"{language}_parser")
+    total = parser.parse_string(source)[0]
+
+    assert (total.loc, total.comment_lines, total.complexity) == expected
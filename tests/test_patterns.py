@@ -0,0 +1,33 @@
+"""
+共通正規表現パターンのテスト
+"""
+
+import re
+
+from src.utils import patterns
+from src.utils.patterns import ENV_VAR, DOC_LINE
+
+
+def test_patterns_are_precompiled():
+    """全パターンがコンパイル済みであることを確認"""
+    assert isinstance(ENV_VAR, re.Pattern)
+    assert isinstance(DOC_LINE, re.Pattern)
+
+
+def test_patterns_are_shared():
+    """利用側モジュールが同一のパターンオブジェクトを参照することを確認"""
+    from src.config import config_loader
+    from src.parser import c_parser
+
+    assert config_loader.ENV_VAR is patterns.ENV_VAR
+    assert c_parser.DOC_LINE is patterns.DOC_LINE
+
+
+def test_env_var_pattern():
+    """環境変数参照を抽出できることを確認"""
+    assert ENV_VAR.findall("${HOST}:${PORT}") == ["HOST", "PORT"]
+
+
+def test_doc_line_pattern():
+    """docコメント各行の先頭の * を除去できることを確認"""
+    assert DOC_LINE.sub('', "\n * first\n * second\n ").split() == ["first", "second"]
@@ -4,6 +4,7 @@ Pythonパーサーのテスト
 TDDステップ1: Red - 失敗するテストを作成
 """
 
+import threading
 from pathlib import Path
 
 import pytest
@@ -15,24 +16,14 @@ from src.parser.base_parser import FunctionInfo
 class TestPythonParser:
     """PythonParserクラスのテスト"""
 
-    @pytest.fixture
-    def parser(self):
-        """PythonParserインスタンスを返す"""
-        return PythonParser()
-
-    @pytest.fixture
-    def fixtures_dir(self):
-        """フィクスチャディレクトリを返す"""
-        return Path(__file__).parent / "fixtures" / "sample_code"
-
-    def test_get_language(self, parser):
+    def test_get_language(self, python_parser):
         """get_languageがpythonを返すことを確認"""
-        assert parser.get_language() == "python"
+        assert python_parser.get_language() == "python"
 
-    def test_parse_simple_function(self, parser, fixtures_dir):
+    def test_parse_simple_function(self, fixtures_dir, parsed_python):
         """シンプルな関数を解析できることを確認"""
         file_path = fixtures_dir / "simple.py"
-        functions = parser.parse_file(file_path)
+        functions = parsed_python["simple.py"]
 
         assert len(functions) == 1
 
@@ -45,58 +36,56 @@ class TestPythonParser:
         assert func.start_line > 0
         assert func.end_line >= func.start_line
 
-    def test_parse_function_with_arguments(self, parser, fixtures_dir):
+    def test_parse_function_with_arguments(self, parsed_python):
         """引数付き関数を解析できることを確認"""
-        file_path = fixtures_dir / "with_arguments.py"
-        functions = parser.parse_file(file_path)
+        functions = parsed_python["with_arguments.py"]
+        by_name = {f.name: f for f in functions}
 
         # 4つの関数が見つかる
         assert len(functions) == 4
 
         # 引数なし関数
-        no_args_func = next(f for f in functions if f.name == "no_args")
+        no_args_func = by_name["no_args"]
         assert no_args_func.arguments == []
 
         # 引数あり関数
-        with_args_func = next(f for f in functions if f.name == "with_args")
+        with_args_func = by_name["with_args"]
         assert len(with_args_func.arguments) == 3
         assert "a" in with_args_func.arguments
         assert "b" in with_args_func.arguments
         assert "c" in with_args_func.arguments
 
-    def test_parse_function_with_docstring(self, parser, fixtures_dir):
+    def test_parse_function_with_docstring(self, parsed_python):
         """docstring付き関数を解析できることを確認"""
-        file_path = fixtures_dir / "simple.py"
-        functions = parser.parse_file(file_path)
+        functions = parsed_python["simple.py"]
 
         func = functions[0]
         assert func.docstring is not None
         assert "Greet a person" in func.docstring
 
-    def test_parse_class_method(self, parser, fixtures_dir):
+    def test_parse_class_method(self, parsed_python):
         """クラスメソッドを解析できることを確認"""
-        file_path = fixtures_dir / "with_class.py"
-        functions = parser.parse_file(file_path)
+        functions = parsed_python["with_class.py"]
+        by_name = {f.name: f for f in functions}
 
         # __init__, add, multiply, standalone_function の4つ
         assert len(functions) >= 3
 
         # メソッドの確認
-        add_method = next((f for f in functions if f.name == "add"), None)
+        add_method = by_name.get("add")
         assert add_method is not None
         assert add_method.function_type == "method"
         assert add_method.scope == "class"
 
         # スタンドアローン関数の確認
-        standalone = next((f for f in functions if f.name == "standalone_function"), None)
+        standalone = by_name.get("standalone_function")
         assert standalone is not None
         assert standalone.function_type == "function"
         assert standalone.scope == "global"
 
-    def test_parse_multiple_functions(self, parser, fixtures_dir):
+    def test_parse_multiple_functions(self, parsed_python):
         """複数関数を解析できることを確認"""
-        file_path = fixtures_dir / "with_arguments.py"
-        functions = parser.parse_file(file_path)
+        functions = parsed_python["with_arguments.py"]
 
         assert len(functions) == 4
 
@@ -106,28 +95,20 @@ class TestPythonParser:
         assert "with_defaults" in function_names
         assert "with_type_hints" in function_names
 
-    def test_parse_function_with_comments(self, parser, fixtures_dir):
+    def test_parse_function_with_comments(self, parsed_python):
         """コメント付き関数を解析できることを確認"""
-        file_path = fixtures_dir / "with_class.py"
-        functions = parser.parse_file(file_path)
+        functions = parsed_python["with_class.py"]
+        by_name = {f.name: f for f in functions}
 
-        multiply_method = next((f for f in functions if f.name == "multiply"), None)
+        multiply_method = by_name.get("multiply")
         assert multiply_method is not None
         # コードにコメントが含まれていることを確認
         assert "#" in multiply_method.code or "Store the result" in multiply_method.code
 
-    def test_parse_syntax_error_returns_empty(self, parser, fixtures_dir):
-        """構文エラーで空リストを返すことを確認"""
-        file_path = fixtures_dir / "syntax_error.py"
-        functions = parser.parse_file(file_path)
-
-        # 構文エラーの場合は空リストまたは警告ログ
-        assert isinstance(functions, list)
-
-    def test_extract_function_metadata(self, parser, fixtures_dir):
+    def test_extract_function_metadata(self, fixtures_dir, parsed_python):
         """メタデータ抽出が正しいことを確認"""
         file_path = fixtures_dir / "simple.py"
-        functions = parser.parse_file(file_path)
+        functions = parsed_python["simple.py"]
 
         func = functions[0]
 
@@ -146,15 +127,126 @@ class TestPythonParser:
         assert "def greet" in func.code
         assert func.code.strip() != ""
 
-    def test_parse_returns_function_info_list(self, parser, fixtures_dir):
+    def test_parse_returns_function_info_list(self, parsed_python):
         """parse_fileがFunctionInfoのリストを返すことを確認"""
-        file_path = fixtures_dir / "simple.py"
-        functions = parser.parse_file(file_path)
+        functions = parsed_python["simple.py"]
 
         assert isinstance(functions, list)
         assert all(isinstance(f, FunctionInfo) for f in functions)
 
-    def test_parse_nonexistent_file_raises_error(self, parser):
+    def test_parse_nonexistent_file_raises_error(self, python_parser):
         """存在しないファイルでエラーが発生することを確認"""
         with pytest.raises(FileNotFoundError):
-            parser.parse_file(Path("/nonexistent/file.py"))
+            python_parser.parse_file(Path("/nonexistent/file.py"))
+
+    def test_nested_functions_in_source_order(self, python_parser):
+        """入れ子の関数・メソッドも出現順に抽出されることを確認"""
+        functions = python_parser.parse_string(
+            "def outer():\n"
+            "    def inner():\n"
+            "        return 1\n"
+            "    return inner\n"
+            "\n"
+            "class Service:\n"
+            "    def run(self):\n"
+            "        pass\n"
+            "\n"
+            "def tail():\n"
+            "    pass\n"
+        )
+
+        assert [f.name for f in functions] == ["outer", "inner", "run", "tail"]
+
+    def test_non_ascii_source(self, python_parser):
+        """非ASCII文字を含むファイルでもバイトオフセットで正しく抽出できることを確認"""
+        functions = python_parser.parse_string(
+            'MESSAGE = "こんにちは"\n'
+            "\n"
+            "def greet(name):\n"
+            '    """挨拶する"""\n'
+            "    return MESSAGE + name\n"
+        )
+
+        assert functions[0].name == "greet"
+        assert functions[0].arguments == ["name"]
+        assert functions[0].docstring == "挨拶する"
+        assert functions[0].code.startswith("def greet")
+
+    def test_encoding_error_returns_empty(self, python_parser):
+        """UTF-8として不正なバイト列を含むファイルは空リストを返すことを確認"""
+        assert python_parser.parse_bytes(b'def greet():\n    return "caf\xe9"\n', Path("latin1.py")) == []
+
+    def test_metrics_from_ast(self, python_parser):
+        """ASTから算出したメトリクス"""
+        functions = python_parser.parse_string(
+            "def classify(x, y):\n"
+            "    # 分岐の例\n"
+            "    if x > 0 and y > 0:\n"
+            "        return 1\n"
+            "    elif x == 0:\n"
+            "        return 0\n"
+            "    return -1 if x < 0 else 2\n"
+        )
+
+        classify = functions[0]
+        # if + and + elif + 条件式
+        assert classify.complexity == 5
+        assert classify.comment_lines == 1
+        assert classify.loc == 6
+
+    def test_metrics_ignore_blank_lines_and_trailing_comments(self, python_parser):
+        """空行は数えず、コードの後ろのコメントはコメント行として数えない"""
+        functions = python_parser.parse_string(
+            "def total(items):  # 合計\n"
+            "\n"
+            "    result = 0  # 初期値\n"
+            "    for item in items:\n"
+            "\n"
+            "        result += item  # 加算\n"
+            "    # 結果を返す\n"
+            "    return result\n"
+        )
+
+        total = functions[0]
+        assert total.loc == 5
+        assert total.comment_lines == 1
+
+    def test_parser_shared_within_thread(self):
+        """同一スレッド内のインスタンスは言語定義とTree-sitterパーサーを共有する"""
+        first = PythonParser()
+        second = PythonParser()
+        assert first.parser is second.parser
+        assert first.language is second.language
+
+        other_thread = {}
+        thread = threading.Thread(target=lambda: other_thread.setdefault('parser', PythonParser().parser))
+        thread.start()
+        thread.join()
+        assert other_thread['parser'] is not first.parser
+
+    def test_shared_instance_uses_parser_per_thread(self, python_parser):
+        """1つのインスタンスを複数スレッドで使ってもスレッドごとに別のTree-sitterパーサーを使うことを確認"""
+        other_thread = {}
+        thread = threading.Thread(target=lambda: other_thread.setdefault('parser', python_parser.parser))
+        thread.start()
+        thread.join()
+
+        assert other_thread['parser'] is not python_parser.parser
+        assert other_thread['parser'] is not None
+
+    def test_partial_syntax_error(self, python_parser):
+        """構文エラーを含む関数のみスキップされることを確認"""
+        functions = python_parser.parse_string(
+            "def good(a):\n"
+            "    return a\n"
+            "\n"
+            "\n"
+            "def bad(a):\n"
+            "    return a +\n"
+            "\n"
+            "\n"
+            "def also_good(b):\n"
+            "    return b\n"
+        )
+
+        assert [f.name for f in functions] == ["good", "also_good"]
@@ -4,6 +4,7 @@ Rustパーサーのテスト
 TDDステップ1: Red - 失敗するテストを作成
 """
 
+import threading
 from pathlib import Path
 
 import pytest
@@ -15,115 +16,98 @@ from src.parser.base_parser import FunctionInfo
 class TestRustParser:
     """RustParserクラスのテスト"""
 
-    @pytest.fixture
-    def parser(self):
-        """RustParserインスタンスを返す"""
-        return RustParser()
-
-    @pytest.fixture
-    def fixtures_dir(self):
-        """フィクスチャディレクトリを返す"""
-        return Path(__file__).parent / "fixtures" / "sample_code"
-
-    def test_get_language(self, parser):
+    def test_get_language(self, rust_parser):
         """get_languageがrustを返すことを確認"""
-        assert parser.get_language() == "rust"
+        assert rust_parser.get_language() == "rust"
 
-    def test_parse_simple_functions(self, parser, fixtures_dir):
+    def test_parse_simple_functions(self, fixtures_dir, parsed_rust):
         """シンプルな関数を解析できることを確認"""
         file_path = fixtures_dir / "sample.rs"
-        functions = parser.parse_file(file_path)
+        functions = parsed_rust["sample.rs"]
+        by_name = {f.name: f for f in functions}
 
         assert len(functions) >= 2
 
         # greet関数の確認
-        greet_func = next((f for f in functions if f.name == "greet"), None)
+        greet_func = by_name.get("greet")
         assert greet_func is not None
         assert greet_func.language == "rust"
         assert "name" in greet_func.code
         assert greet_func.file_path == str(file_path)
 
-    def test_parse_function_with_arguments(self, parser, fixtures_dir):
+    def test_parse_function_with_arguments(self, parsed_rust):
         """引数付き関数を解析できることを確認"""
-        file_path = fixtures_dir / "sample.rs"
-        functions = parser.parse_file(file_path)
+        functions = parsed_rust["sample.rs"]
+        by_name = {f.name: f for f in functions}
 
         # add関数の確認
-        add_func = next((f for f in functions if f.name == "add"), None)
+        add_func = by_name.get("add")
         assert add_func is not None
         assert len(add_func.arguments) == 2
         assert "a" in add_func.arguments
         assert "b" in add_func.arguments
 
         # no_args関数の確認
-        no_args_func = next((f for f in functions if f.name == "no_args"), None)
+        no_args_func = by_name.get("no_args")
         assert no_args_func is not None
         assert no_args_func.arguments == []
 
-    def test_parse_with_doc_comments(self, parser, fixtures_dir):
+    def test_parse_with_doc_comments(self, parsed_rust):
         """ドキュメントコメント付き関数を解析できることを確認"""
-        file_path = fixtures_dir / "sample.rs"
-        functions = parser.parse_file(file_path)
+        functions = parsed_rust["sample.rs"]
+        by_name = {f.name: f for f in functions}
 
-        greet_func = next((f for f in functions if f.name == "greet"), None)
+        greet_func = by_name.get("greet")
         assert greet_func is not None
         # Rustのdocコメントは /// で始まる
         assert greet_func.docstring is not None or "Greet a person" in greet_func.code
 
-    def test_parse_impl_methods(self, parser, fixtures_dir):
+    def test_parse_impl_methods(self, parsed_rust):
         """implブロック内のメソッドを解析できることを確認"""
-        file_path = fixtures_dir / "with_impl.rs"
-        functions = parser.parse_file(file_path)
+        functions = parsed_rust["with_impl.rs"]
+        by_name = {f.name: f for f in functions}
 
         # new, add, multiply, standalone_function の4つ以上
         assert len(functions) >= 4
 
         # メソッドの確認
-        add_method = next((f for f in functions if f.name == "add"), None)
+        add_method = by_name.get("add")
         assert add_method is not None
         assert add_method.function_type == "method"
         assert add_method.scope == "impl"
 
         # スタンドアローン関数の確認
-        standalone = next((f for f in functions if f.name == "standalone_function"), None)
+        standalone = by_name.get("standalone_function")
         assert standalone is not None
         assert standalone.function_type == "function"
         assert standalone.scope == "global"
 
-    def test_parse_public_functions(self, parser, fixtures_dir):
+    def test_parse_public_functions(self, parsed_rust):
         """pub修飾子を持つ関数を解析できることを確認"""
-        file_path = fixtures_dir / "sample.rs"
-        functions = parser.parse_file(file_path)
+        functions = parsed_rust["sample.rs"]
+        by_name = {f.name: f for f in functions}
 
-        add_func = next((f for f in functions if f.name == "add"), None)
+        add_func = by_name.get("add")
         assert add_func is not None
         # pub修飾子の確認
         assert "pub" in add_func.modifiers or "pub" in add_func.code
 
-    def test_parse_syntax_error_returns_empty(self, parser, fixtures_dir):
-        """構文エラーで空リストを返すことを確認"""
-        file_path = fixtures_dir / "rust_syntax_error.rs"
-        functions = parser.parse_file(file_path)
-
-        assert isinstance(functions, list)
-
-    def test_parse_returns_function_info_list(self, parser, fixtures_dir):
+    def test_parse_returns_function_info_list(self, parsed_rust):
         """parse_fileがFunctionInfoのリストを返すことを確認"""
-        file_path = fixtures_dir / "sample.rs"
-        functions = parser.parse_file(file_path)
+        functions = parsed_rust["sample.rs"]
 
         assert isinstance(functions, list)
         assert all(isinstance(f, FunctionInfo) for f in functions)
 
-    def test_parse_nonexistent_file_raises_error(self, parser):
+    def test_parse_nonexistent_file_raises_error(self, rust_parser):
         """存在しないファイルでエラーが発生することを確認"""
         with pytest.raises(FileNotFoundError):
-            parser.parse_file(Path("/nonexistent/file.rs"))
+            rust_parser.parse_file(Path("/nonexistent/file.rs"))
 
-    def test_extract_function_metadata(self, parser, fixtures_dir):
+    def test_extract_function_metadata(self, fixtures_dir, parsed_rust):
         """メタデータ抽出が正しいことを確認"""
         file_path = fixtures_dir / "sample.rs"
-        functions = parser.parse_file(file_path)
+        functions = parsed_rust["sample.rs"]
 
         func = functions[0]
 
@@ -141,3 +125,111 @@ class TestRustParser:
         # コード
         assert "fn" in func.code
         assert func.code.strip() != ""
+
+    def test_non_ascii_source(self, rust_parser):
+        """非ASCII文字を含むファイルでもバイトオフセットで正しく抽出できることを確認"""
+        functions = rust_parser.parse_string(
+            "const MESSAGE: &str = \"こんにちは\";\n"
+            "\n"
+            "/// 二つの数を加算する\n"
+            "fn add(a: i32, b: i32) -> i32 {\n"
+            "    a + b\n"
+            "}\n"
+        )
+
+        assert functions[0].name == "add"
+        assert functions[0].arguments == ["a", "b"]
+        assert functions[0].docstring == "二つの数を加算する"
+
+    def test_metrics_from_ast(self, rust_parser):
+        """ASTから算出したメトリクス"""
+        functions = rust_parser.parse_string(
+            "fn classify(x: i32, y: i32) -> i32 {\n"
+            "    // 分岐の例\n"
+            "    if x > 0 && y > 0 {\n"
+            "        return 1;\n"
+            "    }\n"
+            "    match x {\n"
+            "        0 => 0,\n"
+            "        _ => -1,\n"
+            "    }\n"
+            "}\n"
+        )
+
+        classify = functions[0]
+        # if + && + matchの各アーム
+        assert classify.complexity == 5
+        assert classify.comment_lines == 1
+        assert classify.loc == 9
+
+    def test_metrics_ignore_blank_lines_and_trailing_comments(self, rust_parser):
+        """空行は数えず、コードの後ろのコメントはコメント行として数えない"""
+        functions = rust_parser.parse_string(
+            "fn total(items: &[i32]) -> i32 { // 合計\n"
+            "\n"
+            "    let mut result = 0; // 初期値\n"
+            "    for item in items { result += item; } /* 加算 */\n"
+            "\n"
+            "    /* 結果を\n"
+            "       返す */\n"
+            "    result\n"
+            "}\n"
+        )
+
+        total = functions[0]
+        assert total.loc == 5
+        assert total.comment_lines == 2
+
+    def test_parser_shared_within_thread(self):
+        """同一スレッド内のインスタンスは言語定義とTree-sitterパーサーを共有する"""
+        first = RustParser()
+        second = RustParser()
+        assert first.parser is second.parser
+        assert first.language is second.language
+
+        other_thread = {}
+        thread = threading.Thread(target=lambda: other_thread.setdefault('parser', RustParser().parser))
+        thread.start()
+        thread.join()
+        assert other_thread['parser'] is not first.parser
+
+    def test_shared_instance_uses_parser_per_thread(self, rust_parser):
+        """1つのインスタンスを複数スレッドで使ってもスレッドごとに別のTree-sitterパーサーを使うことを確認"""
+        other_thread = {}
+        thread = threading.Thread(target=lambda: other_thread.setdefault('parser', rust_parser.parser))
+        thread.start()
+        thread.join()
+
+        assert other_thread['parser'] is not rust_parser.parser
+        assert other_thread['parser'] is not None
+
+    def test_doc_comment_from_previous_sibling(self, rust_parser):
+        """直前の兄弟ノードのdocコメントのみを抽出することを確認"""
+        functions = rust_parser.parse_string(
+            "fn first() {}\n"
+            "\n"
+            "struct Counter;\n"
+            "\n"
+            "impl Counter {\n"
+            "    fn undocumented(&self) {}\n"
+            "\n"
+            "    /// 値を1増やす\n"
+            "    fn increment(&self) {}\n"
+            "}\n"
+        )
+
+        assert [(f.name, f.docstring) for f in functions] == [
+            ("first", None),
+            ("undocumented", None),
+            ("increment", "値を1増やす"),
+        ]
+
+    def test_extract_modifiers(self, rust_parser):
+        """可視性と関数修飾子を出現順に抽出することを確認"""
+        functions = rust_parser.parse_string(
+            "pub async fn fetch() {}\n"
+            "unsafe fn raw() {}\n"
+            "fn plain() {}\n"
+        )
+
+        assert [f.modifiers for f in functions] == [["pub", "async"], ["unsafe"], []]
@@ -0,0 +1,49 @@
+"""
+Tree-sitterパーサー共通実装のテスト
+"""
+
+import pytest
+from tree_sitter import Query
+
+from src.parser.c_parser import CParser
+from src.parser.cpp_parser import CppParser
+from src.parser.go_parser import GoParser
+from src.parser.java_parser import JavaParser
+from src.parser.python_parser import PythonParser
+from src.parser.rust_parser import RustParser
+from src.parser.tree_sitter_parser import TreeSitterParser
+
+
+@pytest.mark.parametrize("parser_cls, language", [
+    (CParser, "c"),
+    (CppParser, "cpp"),
+    (GoParser, "go"),
+    (JavaParser, "java"),
+    (PythonParser, "python"),
+    (RustParser, "rust"),
+])
+def test_language_from_spec(parser_cls, language):
+    """言語名は言語定義から取得する"""
+    parser = parser_cls()
+    assert isinstance(parser, TreeSitterParser)
+    assert parser.get_language() == language
+    assert parser.language is parser_cls.spec.language
+
+
+def test_parser_per_language():
+    """Tree-sitterパーサーは言語ごとに別インスタンスとなる"""
+    assert CppParser().parser is not JavaParser().parser
+    assert CppParser().parser is CppParser().parser
+
+
+def test_base_is_abstract():
+    """共通実装の基底クラスは直接インスタンス化できない"""
+    with pytest.raises(TypeError):
+        TreeSitterParser()
+
+
+@pytest.mark.parametrize("parser_cls", [CParser, CppParser, GoParser, JavaParser, PythonParser, RustParser])
+def test_queries_compiled_once(parser_cls):
+    """クエリはモジュール読み込み時にコンパイル済みで、インスタンス間で共有される"""
+    assert isinstance(parser_cls.spec.function_query, Query)
+    assert parser_cls().spec.function_query is parser_cls().spec.function_query